@@ -0,0 +1,67 @@
+""" Benchmark for direct-to-bytes API request bodies
+
+Compares, per object, encoding the 'data' of get_api_config_add() with json.dumps() against get_api_data_bytes()
+with orjson (when installed) and with the built-in encoder, and the bulk FgRenderPool.render_bytes() against encoding
+each body on its own.  Checks that every body decodes to the same data as get_api_config_add().
+
+Usage (from the repository root):
+    python -m benchmarks.bench_api_bytes [--count 20000] [--classes FgFwPolicy,FgFwAddress,FgFwService]
+"""
+import argparse
+import json
+import time
+
+import fgobjlib.fg_object as fg_object
+from benchmarks.bench_render import build_objects
+from fgobjlib import FgRenderPool
+
+
+def _json_dumps(objs):
+    return [json.dumps(obj.get_api_config_add()['data']).encode() for obj in objs]
+
+
+def _data_bytes(objs):
+    return [obj.get_api_data_bytes() for obj in objs]
+
+
+def _data_bytes_builtin(objs):
+    orjson, fg_object.orjson = fg_object.orjson, None
+    try:
+        return _data_bytes(objs)
+    finally:
+        fg_object.orjson = orjson
+
+
+def _render_bytes(objs):
+    return FgRenderPool(workers=1).render_bytes(objs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=20000, help='objects to encode (default: 20000)')
+    parser.add_argument('--classes', default='FgFwPolicy,FgFwAddress,FgFwService', help='comma separated class names')
+    args = parser.parse_args()
+
+    objs = build_objects(args.classes.split(','), args.count)
+    expected = [obj.get_api_config_add()['data'] for obj in objs]
+    print(f"{len(objs)} objects, orjson {'installed' if fg_object.orjson is not None else 'not installed'}")
+    print(f"{'method':<22} {'s':>7} {'us/object':>10} {'equal':>6}")
+
+    benches = [('json.dumps', _json_dumps), ('data_bytes builtin', _data_bytes_builtin)]
+    if fg_object.orjson is not None:
+        benches.append(('data_bytes orjson', _data_bytes))
+    # render_bytes() returns bodies in partition order, compared below against the same order
+    benches.append(('render_bytes', _render_bytes))
+
+    partitioned = [config['data'] for config in FgRenderPool(workers=1).render(objs, 'get_api_config_add')]
+    for label, bench in benches:
+        start = time.perf_counter()
+        bodies = bench(objs)
+        elapsed = time.perf_counter() - start
+        order = partitioned if bench is _render_bytes else expected
+        equal = all(json.loads(bytes(body)) == data for body, data in zip(bodies, order))
+        print(f'{label:<22} {elapsed:>7.3f} {elapsed / len(objs) * 1e6:>10.2f} {str(equal):>6}')
+
+
+if __name__ == '__main__':
+    main()
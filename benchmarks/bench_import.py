@@ -0,0 +1,77 @@
+""" Import-time benchmark for fgobjlib
+
+Runs a fresh interpreter with '-X importtime' for each scenario and sums the self time of every module imported
+beyond what a bare interpreter already loads.  The 'all classes' scenario touches every exported class and so
+loads every module, 'eager (previous)' adds the ipaddress/re/typing imports the modules used to pull in at import
+time, and the remaining scenarios show what a short-lived script that only needs one object type pays.
+
+Usage:
+    python benchmarks/bench_import.py [--runs N]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+_ALL_CLASSES = 'import fgobjlib\nfor _name in fgobjlib.__all__: getattr(fgobjlib, _name)'
+
+SCENARIOS = {
+    'import fgobjlib': 'import fgobjlib',
+    'FgFwAddress only': 'from fgobjlib import FgFwAddress',
+    'FgFwPolicy only': 'from fgobjlib import FgFwPolicy',
+    'all classes': _ALL_CLASSES,
+    'eager (previous)': 'import ipaddress, re, typing\n' + _ALL_CLASSES,
+}
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _import_times(stmt):
+    """ Return dict of module name to self import time (us) for a fresh interpreter running stmt """
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', stmt], env=env, cwd=REPO_ROOT,
+                          stderr=subprocess.PIPE, stdout=subprocess.DEVNULL, universal_newlines=True, check=True)
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(self_us)
+    return times
+
+
+def measure(stmt, runs):
+    """ Return (median us, sorted module list) for the modules stmt imports beyond a bare interpreter """
+    totals = []
+    modules = set()
+    for _ in range(runs):
+        baseline = _import_times('pass')
+        times = _import_times(stmt)
+        extra = {name: us for name, us in times.items() if name not in baseline}
+        totals.append(sum(extra.values()))
+        modules = set(extra)
+    return statistics.median(totals), sorted(modules)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=15, help='interpreter launches per scenario (default: 15)')
+    args = parser.parse_args()
+
+    # Warm the bytecode cache so the first scenario is not charged for compiling the package
+    _import_times(_ALL_CLASSES)
+
+    results = {}
+    for label, stmt in SCENARIOS.items():
+        results[label] = measure(stmt, args.runs)
+
+    reference = results['eager (previous)'][0]
+    print(f"{'scenario':<20} {'median us':>10} {'vs eager':>8}  heavy deps loaded")
+    for label, (median_us, modules) in results.items():
+        heavy = [name for name in ('ipaddress', 're', 'typing') if name in modules]
+        print(f"{label:<20} {median_us:>10.0f} {median_us / reference:>7.0%}  {', '.join(heavy) or '-'}")
+
+
+if __name__ == '__main__':
+    main()
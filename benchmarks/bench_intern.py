@@ -0,0 +1,98 @@
+""" Memory benchmark for interned names and shared member tuples in FgFwPolicy member attributes
+
+Builds a rulebase of --count policies whose srcintf, dstintf, srcaddr, dstaddr, service, schedule and vdom values are
+drawn from a pool of names and decoded from JSON records, as when a rulebase is loaded from a file or an API, so every
+occurrence of a name starts as its own str.  The rulebase is built twice and the retained memory of each is measured
+with tracemalloc:
+    lists       - every member attribute holds its own list of {'name': <name>} dicts of its own decoded strs, as
+                  stored before member tuples
+    tuples      - the validating constructor, whose setters store interned names in member tuples shared by every
+                  policy with the same members
+
+Usage (from the repository root):
+    python -m benchmarks.bench_intern [--count 100000] [--names 2000]
+"""
+import argparse
+import gc
+import json
+import random
+import tracemalloc
+
+from fgobjlib import FgFwPolicy
+
+
+def build_records(count, names):
+    """ Return JSON text of count policy records referencing names from pools of interfaces, addresses and services """
+    rng = random.Random(0)
+    interfaces = [f'port{i}' for i in range(1, 49)]
+    addresses = [f'net-{i:05d}' for i in range(names)]
+    services = [f'svc-{i:04d}' for i in range(max(names // 10, 1))]
+    vdoms = [f'cust{i}' for i in range(20)]
+
+    records = []
+    for i in range(count):
+        records.append({'policyid': i + 1, 'srcintf': rng.sample(interfaces, 1), 'dstintf': rng.sample(interfaces, 2),
+                        'srcaddr': rng.sample(addresses, rng.randint(1, 4)),
+                        'dstaddr': rng.sample(addresses, rng.randint(1, 4)),
+                        'service': rng.sample(services, rng.randint(1, 3)), 'schedule': 'always',
+                        'action': 'accept', 'vdom': rng.choice(vdoms)})
+    return json.dumps(records)
+
+
+# Member list attributes of FgFwPolicy
+MEMBER_ATTRS = ('srcintf', 'dstintf', 'srcaddr', 'dstaddr', 'service')
+
+
+def build_tuples(records):
+    return [FgFwPolicy(**record) for record in records]
+
+
+def build_lists(records):
+    """ Build as build_tuples(), then store members and names as they were stored before member tuples """
+    objs = build_tuples(records)
+    for obj, record in zip(objs, records):
+        obj_dict = obj.__dict__
+        for attr in MEMBER_ATTRS:
+            obj_dict[f'_{attr}'] = [{'name': name} for name in record[attr]]
+        obj_dict['_schedule'] = record['schedule']
+        obj_dict['_vdom'] = record['vdom']
+    return objs
+
+
+def _get_names(value):
+    return [item['name'] for item in value] if isinstance(value, list) else value
+
+
+def measure(build, text):
+    """ Return (bytes retained, distinct member containers, distinct name strs) of build() over records in text """
+    # decoded inside the trace, so names kept from the records are counted
+    gc.collect()
+    tracemalloc.start()
+    records = json.loads(text)
+    objs = build(records)
+    del records
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    values = [getattr(obj, attr) for obj in objs for attr in MEMBER_ATTRS]
+    strs = {id(name) for value in values for name in _get_names(value)}
+    return retained, len({id(value) for value in values}), len(strs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=100000, help='policies in the rulebase (default: 100000)')
+    parser.add_argument('--names', type=int, default=2000, help='distinct address names (default: 2000)')
+    args = parser.parse_args()
+
+    text = build_records(args.count, args.names)
+    print(f'{args.count} policies, {args.names} address names')
+    print(f"{'build':<7} {'MiB':>8} {'bytes/policy':>13} {'members':>8} {'name strs':>10}")
+    for label, build in (('lists', build_lists), ('tuples', build_tuples)):
+        retained, containers, strs = measure(build, text)
+        print(f'{label:<7} {retained / 2 ** 20:>8.1f} {retained / args.count:>13.0f} {containers:>8} {strs:>10}')
+
+
+if __name__ == '__main__':
+    main()
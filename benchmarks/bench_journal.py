@@ -0,0 +1,115 @@
+""" Benchmark for resuming an interrupted API push with FgJournal against a local mock FortiGate REST API
+
+Starts an HTTP server on localhost that stores the body of every request with its vdom and URL path and fails one in
+--fail-every requests with HTTP 500 before storing it.  --count objects are pushed with FgJournal.apply(), and every
+time the push fails the journal is closed and reopened, as a restarted push would, and the push is run again until it
+completes.  Reports the number of pushes, the requests sent against the objects, and checks that the server ends up
+with every object exactly as rendered.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_journal [--count 20000] [--fail-every 5000] [--batch-size 1000]
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.bench_render import build_objects
+from fgobjlib import FgJournal
+
+
+class MockApiHandler(BaseHTTPRequestHandler):
+    """ POST /api/v2/<api>/<path>/<name>[?vdom=<vdom>] stores the JSON data, one in fail_every requests fails """
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        with server.lock:
+            server.requests += 1
+            fail = server.requests % server.fail_every == 0
+            if not fail:
+                url = urllib.parse.urlsplit(self.path)
+                vdom = urllib.parse.parse_qs(url.query).get('vdom', [None])[0]
+                server.objects.append((vdom, url.path, body))
+        self.send_response(500 if fail else 200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server(fail_every):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MockApiHandler)
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.fail_every = fail_every
+    server.objects = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def get_url_path(conf):
+    return f"/api/v2/{conf['api']}/{conf['path'].replace('.', '/')}/{conf['name']}"
+
+
+def get_sender(base_url):
+    """ Return send function posting an API config to the mock server, raising HTTPError on failure """
+    def send(conf):
+        url = base_url + get_url_path(conf)
+        if conf['parameters']:
+            url += '?' + urllib.parse.urlencode(conf['parameters'])
+        body = json.dumps(conf['data'], sort_keys=True).encode()
+        request = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request) as response:
+            response.read()
+    return send
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=20000, help='objects to push (default: 20000)')
+    parser.add_argument('--classes', default='FgFwPolicy,FgFwAddress,FgFwService', help='comma separated class names')
+    parser.add_argument('--fail-every', type=int, default=5000, help='requests per injected failure (default: 5000)')
+    parser.add_argument('--batch-size', type=int, default=1000, help='journal records per fsync (default: 1000)')
+    args = parser.parse_args()
+
+    objs = build_objects(args.classes.split(','), args.count)
+    server = start_server(args.fail_every)
+    send = get_sender(f'http://127.0.0.1:{server.server_address[1]}')
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'push.journal')
+        pushes = 0
+        start = time.perf_counter()
+        while True:
+            pushes += 1
+            with FgJournal(path, batch_size=args.batch_size) as journal:
+                try:
+                    journal.apply(objs, send)
+                except urllib.error.HTTPError:
+                    continue
+                break
+        elapsed = time.perf_counter() - start
+        recorded = len(journal)
+    server.shutdown()
+
+    expected = []
+    for obj in objs:
+        conf = obj.get_api_config_add()
+        expected.append((conf['parameters'].get('vdom'), get_url_path(conf),
+                         json.dumps(conf['data'], sort_keys=True).encode()))
+    print(f'{len(objs)} objects, failure every {args.fail_every} requests, journal batch {args.batch_size}')
+    print(f'pushes {pushes}, requests {server.requests} ({server.requests - len(objs)} failed or resent), '
+          f'journal records {recorded}, {elapsed:.2f}s')
+    print(f'server holds every object once, as rendered: {sorted(server.objects) == sorted(expected)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+""" Benchmark suite for object construction, setter validation and config rendering
+
+For every class in fgobjlib and every requested population size the suite measures:
+    construct   - building objects through the validating constructor
+    validate    - re-assigning every attribute through its property setter
+    cli_add / cli_del                   - get_cli_config_add() / get_cli_config_del()
+    api_add / api_update / api_del      - get_api_config_add() / get_api_config_update() / get_api_config_del()
+    memory      - bytes retained per constructed object (tracemalloc)
+
+Results are reported as nanoseconds per object.  All objects of a size stay alive while they are rendered so garbage
+collector pressure at large populations is part of the measurement.  Results can be saved as a named baseline under
+benchmarks/baselines/ and later runs compared against it; comparison exits non-zero when an operation regresses by
+more than the threshold.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_objects [--sizes 1,10000,1000000] [--classes FgFwPolicy,FgFwAddress]
+                                       [--save NAME] [--compare NAME] [--threshold 0.10]
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+from benchmarks import samples
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+# Distinct constructor argument sets generated per class; larger populations cycle through them
+KWARGS_POOL = 10000
+
+# Small populations are timed in ROUNDS rounds of repeated runs lasting at least MIN_ROUND_SECONDS
+ROUNDS = 5
+MIN_ROUND_SECONDS = 0.05
+
+# Memory is measured on at least this many objects so per-object figures are not dominated by allocator noise
+MEMORY_SAMPLE = 1000
+
+
+def _setter_attrs(cls, kwargs):
+    """ Return the keyword arguments of kwargs that are backed by a property setter on cls """
+    return [attr for attr in kwargs if isinstance(getattr(cls, attr, None), property)
+            and getattr(cls, attr).fset is not None]
+
+
+def _op_construct(cls, objs, kwargs_list):
+    for kwargs in kwargs_list:
+        cls(**kwargs)
+
+
+def _op_validate(cls, objs, kwargs_list):
+    attrs = _setter_attrs(cls, kwargs_list[0])
+    for obj, kwargs in zip(objs, kwargs_list):
+        for attr in attrs:
+            setattr(obj, attr, kwargs[attr])
+
+
+def _op_method(method):
+    def run(cls, objs, kwargs_list):
+        for obj in objs:
+            getattr(obj, method)()
+    return run
+
+
+OPERATIONS = {
+    'construct': _op_construct,
+    'validate': _op_validate,
+    'cli_add': _op_method('get_cli_config_add'),
+    'cli_del': _op_method('get_cli_config_del'),
+    'api_add': _op_method('get_api_config_add'),
+    'api_update': _op_method('get_api_config_update'),
+    'api_del': _op_method('get_api_config_del'),
+}
+
+
+def _timed(op, cls, objs, kwargs_list):
+    """ Return nanoseconds per object for op
+
+    Small populations are run in several rounds of at least MIN_ROUND_SECONDS each and the fastest round is kept, which
+    filters out scheduler noise.  Large populations are measured once.
+    """
+    if len(objs) >= KWARGS_POOL:
+        start = time.perf_counter()
+        op(cls, objs, kwargs_list)
+        return (time.perf_counter() - start) / len(objs) * 1e9
+
+    best = None
+    for _ in range(ROUNDS):
+        repeats = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < MIN_ROUND_SECONDS:
+            op(cls, objs, kwargs_list)
+            repeats += 1
+        per_object = (time.perf_counter() - start) / (repeats * len(objs)) * 1e9
+        best = per_object if best is None else min(best, per_object)
+    return best
+
+
+def _memory_per_object(cls, kwargs_list):
+    """ Return bytes retained per object when building len(kwargs_list) objects """
+    gc.collect()
+    tracemalloc.start()
+    objs = [cls(**kwargs) for kwargs in kwargs_list]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objs
+    return current / len(kwargs_list)
+
+
+def run_class(name, size):
+    """ Return dict of operation name to ns/object (and memory bytes/object) for class name at population size """
+    cls = samples.get_class(name)
+    factory = samples.SAMPLES[name]
+    pool = [factory(i) for i in range(min(size, KWARGS_POOL))]
+    kwargs_list = [pool[i % len(pool)] for i in range(size)]
+
+    objs = [cls(**kwargs) for kwargs in kwargs_list]
+    results = {}
+    for op_name, op in OPERATIONS.items():
+        results[op_name] = _timed(op, cls, objs, kwargs_list)
+    del objs
+
+    # Memory is measured on a bounded population, per-object cost is linear
+    sample = min(max(size, MEMORY_SAMPLE), KWARGS_POOL)
+    results['memory'] = _memory_per_object(cls, [factory(i) for i in range(sample)])
+    return results
+
+
+def run(sizes, classes):
+    """ Run the suite and return {'<class>@<size>': {op: value}} """
+    results = {}
+    for size in sizes:
+        for name in classes:
+            results[f'{name}@{size}'] = run_class(name, size)
+            gc.collect()
+    return results
+
+
+def print_results(results, baseline=None, threshold=0.10):
+    """ Print results table, with ratio against baseline if given.  Return list of regressions. """
+    regressions = []
+    columns = list(OPERATIONS) + ['memory']
+    width = 14 if baseline else 12
+    print(f"{'class@size':<28}" + ''.join(f'{col:>{width}}' for col in columns))
+    for key, ops in results.items():
+        row = f'{key:<28}'
+        for col in columns:
+            value = ops[col]
+            cell = f'{value:.0f}'
+            if baseline and key in baseline and col in baseline[key]:
+                ratio = value / baseline[key][col]
+                cell += f' {ratio:4.2f}x'
+                if ratio > 1 + threshold:
+                    regressions.append((key, col, ratio))
+            row += f'{cell:>{width}}'
+        print(row)
+    print('(ns per object; memory in bytes per object)')
+    return regressions
+
+
+def _baseline_path(name):
+    return os.path.join(BASELINE_DIR, f'{name}.json')
+
+
+def save_baseline(name, results, sizes):
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    doc = {'python': platform.python_version(), 'machine': platform.machine(), 'platform': platform.platform(),
+           'sizes': sizes, 'results': results}
+    with open(_baseline_path(name), 'w') as fp:
+        json.dump(doc, fp, indent=1, sort_keys=True)
+
+
+def load_baseline(name):
+    with open(_baseline_path(name)) as fp:
+        return json.load(fp)['results']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='1,10000,1000000', help='comma separated object counts')
+    parser.add_argument('--classes', default=','.join(samples.SAMPLES), help='comma separated class names')
+    parser.add_argument('--save', metavar='NAME', help='store results as baseline NAME')
+    parser.add_argument('--compare', metavar='NAME', help='compare results against baseline NAME')
+    parser.add_argument('--threshold', type=float, default=0.10, help='allowed slowdown ratio (default: 0.10)')
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    classes = args.classes.split(',')
+    for name in classes:
+        if name not in samples.SAMPLES:
+            parser.error(f"unknown class '{name}'")
+
+    baseline = load_baseline(args.compare) if args.compare else None
+    results = run(sizes, classes)
+    regressions = print_results(results, baseline, args.threshold)
+
+    if args.save:
+        save_baseline(args.save, results, sizes)
+
+    if regressions:
+        for key, col, ratio in regressions:
+            print(f'REGRESSION {key} {col}: {ratio:.2f}x baseline')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
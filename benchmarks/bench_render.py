@@ -0,0 +1,72 @@
+""" Scaling benchmark for parallel config rendering with FgRenderPool
+
+Renders the same object collection with get_cli_config_add() using 1, 2, 4, ... worker processes up to the CPU count
+and reports throughput and speedup over rendering in a single process.  Each run's output is checked against the
+serial output so the merge order is verified as well.  Worker start-up is part of each timing, as it is part of
+every render() call.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_render [--count 200000] [--classes FgFwPolicy,FgFwAddress] [--workers 1,2,4,8]
+"""
+import argparse
+import os
+import time
+
+from benchmarks import samples
+from fgobjlib import FgRenderPool
+
+VDOMS = 8
+
+
+def build_objects(classes, count):
+    """ Return count objects spread across classes and VDOMS vdoms """
+    objs = []
+    per_class = count // len(classes)
+    for name in classes:
+        cls = samples.get_class(name)
+        factory = samples.SAMPLES[name]
+        for i in range(per_class):
+            kwargs = factory(i)
+            if 'vdom' in kwargs:
+                kwargs['vdom'] = f'vd{i % VDOMS}'
+            objs.append(cls(**kwargs))
+    return objs
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    default_workers = [1]
+    while default_workers[-1] * 2 <= cpus:
+        default_workers.append(default_workers[-1] * 2)
+    if default_workers[-1] != cpus:
+        default_workers.append(cpus)
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=200000, help='objects to render (default: 200000)')
+    parser.add_argument('--classes', default='FgFwPolicy,FgFwAddress,FgFwService', help='comma separated class names')
+    parser.add_argument('--workers', default=','.join(str(w) for w in default_workers),
+                        help='comma separated worker counts (default: powers of two up to the CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=2000, help='objects per worker task (default: 2000)')
+    args = parser.parse_args()
+
+    objs = build_objects(args.classes.split(','), args.count)
+    start = time.perf_counter()
+    expected = FgRenderPool(workers=1).render_text(objs)
+    serial = time.perf_counter() - start
+
+    print(f'{len(objs)} objects, {cpus} CPU(s)')
+    print(f"{'workers':>8} {'seconds':>9} {'objects/s':>11} {'speedup':>8} {'efficiency':>10}")
+    for workers in [int(w) for w in args.workers.split(',')]:
+        pool = FgRenderPool(workers=workers, chunk_size=args.chunk_size)
+        start = time.perf_counter()
+        output = pool.render_text(objs)
+        elapsed = time.perf_counter() - start
+
+        if output != expected:
+            raise SystemExit(f'output with {workers} workers differs from serial output')
+        speedup = serial / elapsed
+        print(f'{workers:>8} {elapsed:>9.2f} {len(objs) / elapsed:>11.0f} {speedup:>7.2f}x {speedup / workers:>10.0%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+""" Benchmark for incremental re-rendering with FgRenderCache
+
+Simulates a pipeline that regenerates the full config on a schedule while only a few objects change between runs:
+the collection is rendered once to fill the cache, then for each run --changed objects are modified through their
+setters and everything is rendered again.  Reports the time of an uncached render against the cached re-render and
+checks that the cached output equals the uncached output of the changed collection.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_render_cache [--count 200000] [--changed 50] [--runs 5] [--method get_cli_config_add]
+"""
+import argparse
+import random
+import time
+
+from benchmarks.bench_render import build_objects
+from fgobjlib import FgRenderCache, FgRenderPool
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=200000, help='objects to render (default: 200000)')
+    parser.add_argument('--classes', default='FgFwPolicy,FgFwAddress,FgFwService', help='comma separated class names')
+    parser.add_argument('--changed', type=int, default=50, help='objects changed between runs (default: 50)')
+    parser.add_argument('--runs', type=int, default=5, help='re-render runs (default: 5)')
+    parser.add_argument('--method', default='get_cli_config_add', help='config method (default: get_cli_config_add)')
+    args = parser.parse_args()
+
+    objs = build_objects(args.classes.split(','), args.count)
+    rng = random.Random(0)
+    cache = FgRenderCache()
+    cached_pool = FgRenderPool(workers=1, cache=cache)
+    plain_pool = FgRenderPool(workers=1)
+
+    start = time.perf_counter()
+    cached_pool.render(objs, args.method)
+    print(f'{len(objs)} objects, first (filling) render {time.perf_counter() - start:.2f}s')
+    print(f"{'run':>4} {'uncached s':>11} {'cached s':>9} {'speedup':>8} {'hit rate':>9}")
+
+    for run in range(1, args.runs + 1):
+        for obj in rng.sample(objs, args.changed):
+            obj.comment = f'changed in run {run}'
+
+        start = time.perf_counter()
+        expected = plain_pool.render(objs, args.method)
+        uncached = time.perf_counter() - start
+
+        cache.reset_stats()
+        start = time.perf_counter()
+        output = cached_pool.render(objs, args.method)
+        cached = time.perf_counter() - start
+
+        if output != expected:
+            raise SystemExit(f'cached output of run {run} differs from uncached output')
+        print(f'{run:>4} {uncached:>11.2f} {cached:>9.2f} {uncached / cached:>7.2f}x {cache.hit_rate:>9.2%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+""" Snapshot benchmark: FgSnapshot against pickle for saving and loading object collections
+
+Builds a mixed collection of every fgobjlib class and reports, for pickle and FgSnapshot, the serialized size and the
+time to save and to load the full collection.  For FgSnapshot the time to open a memory mapped file and fetch a single
+object, and to select one class in one vdom, is reported as well; pickle has to load everything for either.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_snapshot [--count 200000]
+"""
+import argparse
+import gc
+import os
+import pickle
+import tempfile
+import time
+
+from benchmarks import samples
+from fgobjlib.fg_snapshot import FgSnapshot
+
+
+def _timed(func, *args):
+    gc.collect()
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=200000, help='objects in the collection (default: 200000)')
+    args = parser.parse_args()
+
+    per_class = max(args.count // len(samples.SAMPLES), 1)
+    objs = []
+    for name in samples.SAMPLES:
+        objs += samples.build(name, per_class)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pickle_path = os.path.join(tmp, 'objs.pickle')
+        snap_path = os.path.join(tmp, 'objs.snap')
+
+        def pickle_save():
+            with open(pickle_path, 'wb') as fp:
+                pickle.dump(objs, fp, protocol=pickle.HIGHEST_PROTOCOL)
+
+        def pickle_load():
+            with open(pickle_path, 'rb') as fp:
+                return pickle.load(fp)
+
+        def snap_load():
+            with FgSnapshot(snap_path) as snap:
+                return snap.load()
+
+        def snap_find():
+            with FgSnapshot(snap_path) as snap:
+                return snap.find(per_class // 2, class_name='FgFwPolicy')
+
+        def snap_select():
+            with FgSnapshot(snap_path) as snap:
+                return list(snap.iter_objects(class_name='FgFwAddress', vdom='root'))
+
+        _, pickle_save_s = _timed(pickle_save)
+        _, pickle_load_s = _timed(pickle_load)
+        _, snap_save_s = _timed(FgSnapshot.save, snap_path, objs)
+        loaded, snap_load_s = _timed(snap_load)
+        found, snap_find_s = _timed(snap_find)
+        selected, snap_select_s = _timed(snap_select)
+
+        def state(obj):
+            return {key: value for key, value in vars(obj).items() if key != '_obj_to_str'}
+
+        if [state(obj) for obj in loaded] != [state(obj) for obj in objs]:
+            raise SystemExit('snapshot round trip differs from the original objects')
+
+        print(f'{len(objs)} objects')
+        print(f"{'format':<10} {'MB':>8} {'save s':>8} {'load s':>8}")
+        print(f"{'pickle':<10} {os.path.getsize(pickle_path) / 1e6:>8.1f} {pickle_save_s:>8.2f} {pickle_load_s:>8.2f}")
+        print(f"{'snapshot':<10} {os.path.getsize(snap_path) / 1e6:>8.1f} {snap_save_s:>8.2f} {snap_load_s:>8.2f}")
+        print(f'snapshot open + find one policy:        {snap_find_s * 1e3:8.1f} ms  ({found.policyid})')
+        print(f'snapshot open + select {len(selected)} addresses: {snap_select_s * 1e3:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
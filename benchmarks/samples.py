@@ -0,0 +1,95 @@
+""" Sample constructor arguments for every fgobjlib class, shared by the benchmark scripts
+
+Each factory takes an integer index and returns the keyword arguments for one valid, realistic object.  Values are
+varied by index so that large runs do not collapse to a handful of identical objects.
+"""
+import fgobjlib
+
+
+def _octets(i):
+    return (i >> 16) & 255, (i >> 8) & 255, i & 255
+
+
+def address(i):
+    a, b, c = _octets(i)
+    return dict(name=f'addr{i}', type='ipmask', subnet=f'10.{b}.{c}.0/24', associated_interface='port1',
+                visibility='enable', comment='benchmark address', vdom='root')
+
+
+def addrgrp(i):
+    return dict(name=f'grp{i}', member=[f'addr{i}', f'addr{i + 1}', f'addr{i + 2}'], exclude_member=None,
+                visibility='enable', allow_routing='disable', comment='benchmark group', vdom='root')
+
+
+def policy(i):
+    return dict(policyid=i + 1, srcintf='port1', dstintf=['port2', 'port3'], srcaddr=f'addr{i}', dstaddr='all',
+                service=['HTTP', 'HTTPS'], schedule='always', action='accept', logtraffic='all', nat='enable',
+                name=f'pol{i}', comment='benchmark policy', vdom='root')
+
+
+def service(i):
+    return dict(name=f'svc{i}', protocol='tcp/udp/sctp', tcp_portrange=[str(1024 + i % 60000), '8000-8080'],
+                udp_portrange='53', comment='benchmark service', visibility='enable', session_ttl=3600,
+                category='General', vdom='root')
+
+
+def route(i):
+    a, b, c = _octets(i)
+    return dict(routeid=i + 1, dst=f'10.{b}.{c}.0/24', device='port1', gateway='192.0.2.1', distance=10,
+                priority=0, weight=1, comment='benchmark route', vrf=0, vdom='root')
+
+
+def interface(i):
+    a, b, c = _octets(i)
+    return dict(name=f'vlan{i}', ip=f'10.{b}.{c}.1/24', mode='static', intf_type='vlan', vlanid=i % 4094 + 1,
+                phys_intf='port1', allowaccess='ping https ssh', role='lan', device_ident='enable',
+                alias=f'vlan {i}', description='benchmark interface', vdom='root')
+
+
+def ipsec_p1(i):
+    a, b, c = _octets(i)
+    return dict(name=f'vpn{i}', p1_type='static', interface='port1', proposal=['aes128-sha256', 'aes256-sha256'],
+                ike_version=2, local_gw='198.51.100.1', psksecret='benchmark-psk', remote_gw=f'100.{a}.{b}.{c}',
+                add_route='enable', keepalive=10, net_device='disable', dpd='on-idle', dhgrp=[14, 19],
+                nattraversal='enable', comment='benchmark phase1', vdom='root')
+
+
+def ipsec_p2(i):
+    a, b, c = _octets(i)
+    return dict(name=f'vpn{i}', phase1name=f'vpn{i}', proposal=['aes128-sha256', 'aes256-sha256'], pfs='enable',
+                dhgrp=[14], keepalive='enable', replay='enable', auto_negotiate='enable',
+                src_subnet='192.168.0.0/16', dst_subnet=f'10.{b}.{c}.0/24', comment='benchmark phase2', vdom='root')
+
+
+def vdom(i):
+    return dict(name=f'vd{i}')
+
+
+def vdomlink(i):
+    return dict(name=f'vl{i % 100000000}', vlink_type='ppp', vdom_enabled=True)
+
+
+SAMPLES = {
+    'FgFwAddress': address,
+    'FgFwAddressGroup': addrgrp,
+    'FgFwPolicy': policy,
+    'FgFwService': service,
+    'FgRouteIPv4': route,
+    'FgInterfaceIpv4': interface,
+    'FgIpsecP1Interface': ipsec_p1,
+    'FgIpsecP2Interface': ipsec_p2,
+    'FgVdom': vdom,
+    'FgVdomLink': vdomlink,
+}
+
+
+def get_class(name):
+    """ Return the fgobjlib class named 'name' """
+    return getattr(fgobjlib, name)
+
+
+def build(name, count, start=0):
+    """ Return a list of 'count' validated objects of class 'name' """
+    cls = get_class(name)
+    factory = SAMPLES[name]
+    return [cls(**factory(i)) for i in range(start, start + count)]
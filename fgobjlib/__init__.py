@@ -1,11 +1,55 @@
-from .fg_object import FgObject
-from .fg_sys_router_static import FgRouteIPv4
-from .fg_sys_interface import FgInterfaceIpv4
-from .fg_fw_policy import FgFwPolicy
-from .fg_fw_address import FgFwAddress
-from .fg_fw_addrgrp import FgFwAddressGroup
-from .fg_fw_service import FgFwService
-from .fg_vpn_ipsec_p1_interface import FgIpsecP1Interface
-from .fg_vpn_ipsec_p2_interface import FgIpsecP2Interface
-from .fg_sys_vdomlink import FgVdomLink
-from .fg_sys_vdom import FgVdom
\ No newline at end of file
+# Classes are loaded on first attribute access (PEP 562) so that a script which only needs one object type does not
+# pay the import cost of every module in the package.
+_class_modules = {
+    'FgObject': 'fg_object',
+    'FgRouteIPv4': 'fg_sys_router_static',
+    'FgInterfaceIpv4': 'fg_sys_interface',
+    'FgFwPolicy': 'fg_fw_policy',
+    'FgFwAddress': 'fg_fw_address',
+    'FgFwAddressGroup': 'fg_fw_addrgrp',
+    'FgFwService': 'fg_fw_service',
+    'FgIpsecP1Interface': 'fg_vpn_ipsec_p1_interface',
+    'FgIpsecP2Interface': 'fg_vpn_ipsec_p2_interface',
+    'FgVdomLink': 'fg_sys_vdomlink',
+    'FgVdom': 'fg_sys_vdom',
+    'FgMetrics': 'fg_metrics',
+    'FgValidationReport': 'fg_validate',
+    'FgRenderPool': 'fg_render',
+    'FgSnapshot': 'fg_snapshot',
+    'FgStore': 'fg_store',
+    'FgRefIndex': 'fg_refindex',
+    'FgRenderCache': 'fg_render_cache',
+    'FgIpsecMesh': 'fg_gen_ipsec_mesh',
+    'FgVlanPlan': 'fg_gen_vlans',
+    'FgRangeSet': 'fg_ranges',
+    'FgIpPool': 'fg_ip_pool',
+    'FgTenantPlan': 'fg_gen_tenants',
+    'FgPolicyOrder': 'fg_fw_policy_order',
+    'FgIdPool': 'fg_id_pool',
+    'FgNdjson': 'fg_ndjson',
+    'FgJournal': 'fg_journal',
+}
+
+__all__ = list(_class_modules)
+
+
+def __getattr__(name):
+    """ Import the submodule defining 'name' on first access and cache the attribute on the package
+
+    Args:
+        name (str): Attribute name requested from the package
+
+    Returns:
+        The requested class
+    """
+    if name in _class_modules:
+        module = __import__(f'{__name__}.{_class_modules[name]}', fromlist=[name])
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
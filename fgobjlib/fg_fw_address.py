@@ -1,4 +1,4 @@
-import ipaddress
+import sys
 
 from fgobjlib import FgObject
 
@@ -21,6 +21,10 @@ class FgFwAddress(FgObject):
         comment (str): Object comment
     """
 
+    # Attributes referencing other FG objects, and the kinds of object this class is referenced as
+    _ref_attrs = {'associated_interface': 'interface'}
+    _ref_kinds = ('address',)
+
     def __init__(self, name: str = None, type: str = None, subnet: str = None, fqdn: str = None,
                  start_ip: str = None, end_ip: str = None, visibility: str = None, associated_interface: str = None,
                  vdom: str = None, comment: str = None):
@@ -141,6 +145,7 @@ class FgFwAddress(FgObject):
             self._subnet = None
         else:
             if isinstance(subnet, str):
+                import ipaddress
                 try:
                     self._subnet = str(ipaddress.ip_network(subnet))
                 except ValueError:
@@ -222,7 +227,7 @@ class FgFwAddress(FgObject):
                 raise ValueError("'associated_interface', when set, cannot be an empty string")
             if isinstance(intf, str):
                 if 1 <= len(intf) <= 35:
-                    self._associated_interface = intf
+                    self._associated_interface = sys.intern(intf)
                 else:
                     raise ValueError("'associated_interface', when set, must be type str() between 1 and 35 chars")
             else:
@@ -274,6 +279,7 @@ class FgFwAddress(FgObject):
             self._start_ip = None
         else:
             if isinstance(start_ip, str):
+                import ipaddress
                 try:
                     self._start_ip = str(ipaddress.ip_address(start_ip))
                 except ValueError:
@@ -299,6 +305,7 @@ class FgFwAddress(FgObject):
             self._end_ip = None
         else:
             if isinstance(end_ip, str):
+                import ipaddress
                 try:
                     self._end_ip = str(ipaddress.ip_address(end_ip))
                 except ValueError:
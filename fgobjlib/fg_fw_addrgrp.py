@@ -1,6 +1,7 @@
-from typing import Union
+from __future__ import annotations
 
 from fgobjlib import FgObject
+from fgobjlib.fg_object import get_member_tuple
 
 
 class FgFwAddressGroup(FgObject):
@@ -11,16 +12,20 @@ class FgFwAddressGroup(FgObject):
 
     Attributes:
         name (str): Name of addrgrp to be created
-        member (list): List of member fw addresses to include in group
+        member (tuple): Names of member fw addresses to include in group
         exclude (str): Set exclude addresses from addrgrp 'enable' or 'disable'
-        exclude_member (list): The members to exclude from addrgrp
+        exclude_member (tuple): The members to exclude from addrgrp
         comment (str):  Comment for addrgrp
         visibility (str): Set gui visibility 'enable' or 'disable'
         allow_routing (str): Set allow addrgrp use in static routing configuration 'enable' or 'disable'
     """
 
-    def __init__(self, name: str = None, member: Union[str, list] = None, exclude: str = None,
-                 exclude_member: Union[str, list] = None, comment: str = None, visibility: str = None,
+    # Attributes referencing other FG objects, and the kinds of object this class is referenced as
+    _ref_attrs = {'member': 'address', 'exclude_member': 'address'}
+    _ref_kinds = ('address',)
+
+    def __init__(self, name: str = None, member: str | list = None, exclude: str = None,
+                 exclude_member: str | list = None, comment: str = None, visibility: str = None,
                  allow_routing: str = None, vdom: str = None):
         """
         Args:
@@ -63,48 +68,48 @@ class FgFwAddressGroup(FgObject):
     # Static Methods
     @staticmethod
     def _validate_and_get_members(members):
-        """ Check the validity of policy objects and returns objects as list if valid
+        """ Check the validity of members and returns their names as a shared member tuple if valid
 
-        Can be used to validate srcintf, dstintf, srcaddr, dstaddr and service objects
+        Groups with the same members share one tuple (see get_member_tuple()), which config methods expand to
+        [{'name': <name>}, ...] for the API.
 
         Args:
-            members (list): string or list of strings containing fw address objs as members
+            members (list): string, or list or tuple of strings (or {'name': str} dicts) containing fw address objs as
+                members
 
         Returns:
-            List
+            Tuple
         """
 
         if members is None:
             return None
         else:
-            # IF a single object was passed as a string, append it to member_list else iterate the list and pull
-            # out the strings of members and append each to member_list
-            member_list = []
-
+            # IF a single object was passed as a string, use it as the only member else iterate the list and pull
+            # out the names of members
             if isinstance(members, str):
-                member_list.append({'name': members})
+                names = [members]
 
-            elif isinstance(members, list):
-                for item in members:
-                    member_list.append({'name': item})
+            elif isinstance(members, (list, tuple)):
+                # accept items already in FortiGate API format, {'name': <name>}
+                names = [item.get('name') if isinstance(item, dict) else item for item in members]
 
             else:
                 raise Exception("'members', must be provided as string or list of strings")
 
             # Make sure each interface passed in is not all whitespace and it is less than 80 chars
-            for item in member_list:
-                if isinstance(item['name'], str):
-                    if item['name'].isspace():
+            for name in names:
+                if isinstance(name, str):
+                    if name.isspace():
                         raise Exception("members cannot be an contain values that are an empty string")
 
-                    if not len(item['name']) < 80:
+                    if not len(name) < 80:
                         raise Exception("'policy_object(s)', must be 79 chars or less")
 
                 else:
                     raise Exception("'policy_objects(s)' must be string or list of strings")
 
-            # set self.<obj_type> attribute with the verified and formatted obj_list
-            return member_list
+            # set self.<obj_type> attribute with the verified names, interned and shared between groups
+            return get_member_tuple(names)
 
     # Instance Properties and Setters
     @property
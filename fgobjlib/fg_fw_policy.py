@@ -1,6 +1,9 @@
-from typing import Union
+from __future__ import annotations
+
+import sys
 
 from fgobjlib import FgObject
+from fgobjlib.fg_object import get_member_tuple
 
 
 class FgFwPolicy(FgObject):
@@ -10,10 +13,10 @@ class FgFwPolicy(FgObject):
 
     Attributes:
         policyid (int): Object ID
-        srcintf (list):  Policy source interface(s), may be string or list of strings
-        dstintf (list): Policy destination interface(s), may be string or list of strings
-        srcaddr (list): Policy source address(es), may be string or list of strings
-        dstaddr (list): Policy destination address(es), may be string or list of strings
+        srcintf (tuple):  Policy source interface(s), may be set as string or list of strings
+        dstintf (tuple): Policy destination interface(s), may be set as string or list of strings
+        srcaddr (tuple): Policy source address(es), may be set as string or list of strings
+        dstaddr (tuple): Policy destination address(es), may be set as string or list of strings
         schedule (str): Policy schedule
         action (str):  Policy action, may be 'accept' or 'deny'
         logtraffic (str): Policy log action, may be 'utm', 'all' or 'disabled'
@@ -25,8 +28,15 @@ class FgFwPolicy(FgObject):
         service (str): Negate the service in policy.  ('enable', 'disable', or None=inherit)
     """
 
-    def __init__(self, policyid: int = None, srcintf: Union[str, list] = None, dstintf: Union[str, list] = None,
-                 srcaddr: Union[str, list] = None, dstaddr: Union[str, list] = None, service: Union[str, list] = None,
+    # Attribute that provides obj_id
+    _obj_id_attr = 'policyid'
+
+    # Attributes referencing other FG objects
+    _ref_attrs = {'srcintf': 'interface', 'dstintf': 'interface', 'srcaddr': 'address', 'dstaddr': 'address',
+                  'service': 'service'}
+
+    def __init__(self, policyid: int = None, srcintf: str | list = None, dstintf: str | list = None,
+                 srcaddr: str | list = None, dstaddr: str | list = None, service: str | list = None,
                  schedule: str = None, action: str = None, logtraffic: str = None, nat: str = None, vdom: str = None,
                  srcaddr_negate: str = None, dstaddr_negate: str = None, name: str = None, comment: str = None,
                  service_negate: str = None):
@@ -90,49 +100,48 @@ class FgFwPolicy(FgObject):
     # Static Methods
     @staticmethod
     def _validate_and_get_policy_obj(policy_object):
-        """ Check the validity of policy objects and returns objects as list if valid
+        """ Check the validity of policy objects and returns their names as a shared member tuple if valid
 
-        Can be used to validate srcintf, dstintf, srcaddr, dstaddr and service objects
+        Can be used to validate srcintf, dstintf, srcaddr, dstaddr and service objects.  Policies with the same members
+        share one tuple (see get_member_tuple()), which config methods expand to [{'name': <name>}, ...] for the API.
 
         Args:
-            policy_object (list): string or list of strings containing srcintf(s)
+            policy_object (list): string, or list or tuple of strings (or {'name': str} dicts) containing srcintf(s)
 
         Returns:
-            List
+            Tuple
         """
 
         if policy_object is None:
             return policy_object
 
         else:
-            # IF a single object was passed as a string, append it to intf_list else iterate the list and pull
-            # out the strings of interfaces and append each to intf_list
-            obj_list = []
-
+            # IF a single object was passed as a string, use it as the only name else iterate the list and pull
+            # out the names
             if isinstance(policy_object, str):
-                obj_list.append({'name': policy_object})
+                names = [policy_object]
 
-            elif isinstance(policy_object, list):
-                for item in policy_object:
-                    obj_list.append({'name': item})
+            elif isinstance(policy_object, (list, tuple)):
+                # accept items already in FortiGate API format, {'name': <name>}
+                names = [item.get('name') if isinstance(item, dict) else item for item in policy_object]
 
             else:
                 raise Exception("'policy_object(s)', must be provided as string or list of strings")
 
             # Make sure each interface passed in is not all whitespace and it is less than 80 chars
-            for item in obj_list:
-                if isinstance(item['name'], str):
-                    if item['name'].isspace():
-                        raise Exception(f"{item} cannot be an empty string")
+            for name in names:
+                if isinstance(name, str):
+                    if name.isspace():
+                        raise Exception(f"'{name}' cannot be an empty string")
 
-                    if not len(item['name']) < 80:
+                    if not len(name) < 80:
                         raise Exception("'policy_object(s)', must be 79 chars or less")
 
                 else:
                     raise Exception("'policy_objects(s)' must be string or list of strings")
 
-            # set self.<obj_type> attribute with the verified and formatted obj_list
-            return obj_list
+            # set self.<obj_type> attribute with the verified names, interned and shared between policies
+            return get_member_tuple(names)
 
     # Instance Properties and Setters
     @property
@@ -275,7 +284,7 @@ class FgFwPolicy(FgObject):
             else:
                 raise ValueError("'schedule', when set, must be type str() 35 chars or less")
 
-            self._schedule = schedule
+            self._schedule = sys.intern(schedule)
 
     @property
     def action(self):
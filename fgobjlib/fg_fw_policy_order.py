@@ -0,0 +1,135 @@
+from bisect import bisect_left
+
+from fgobjlib.fg_fw_policy import FgFwPolicy
+
+
+def _get_policyids(policies, name):
+    """ Return list of the policyids of policies, given as policyids or FgFwPolicy objects """
+    policyids = [policy.policyid if isinstance(policy, FgFwPolicy) else policy for policy in policies]
+    if len(set(policyids)) != len(policyids):
+        raise ValueError(f"'{name}' must not contain a policyid more than once")
+    return policyids
+
+
+def _get_kept(sequence):
+    """ Return set of the values of a longest increasing subsequence of sequence, in O(n log n) """
+    # tails[k] is the position in sequence of the smallest value ending an increasing subsequence of length k + 1
+    tails = []
+    tail_values = []
+    previous = [None] * len(sequence)
+    for pos, value in enumerate(sequence):
+        k = bisect_left(tail_values, value)
+        previous[pos] = tails[k - 1] if k else None
+        if k == len(tails):
+            tails.append(pos)
+            tail_values.append(value)
+        else:
+            tails[k] = pos
+            tail_values[k] = value
+
+    kept = set()
+    pos = tails[-1] if tails else None
+    while pos is not None:
+        kept.add(sequence[pos])
+        pos = previous[pos]
+    return kept
+
+
+class FgPolicyOrder:
+    """ FgPolicyOrder plans the fewest policy moves that turn the current policy sequence of a vdom into the desired one
+
+    FortiOS evaluates policies in sequence order, not policyid order, and reorders them with 'move <id> before|after
+    <id>'.  The policies that keep their place are a longest subsequence of the current sequence that is already in
+    desired order, so only the others are moved and the number of moves is the minimum possible.  Each moved policy is
+    placed after the policy preceding it in desired order, or before the first kept policy if it comes first.  Moves
+    are planned in O(n log n) and applied in the order given.
+
+    Policies in current but not in desired are not moved, so desired may list just the policies whose order matters.
+
+        order = FgPolicyOrder(current=[1, 2, 3, 4, 5], desired=[1, 4, 2, 3, 5], vdom='cust1')
+        order.moves                     # [(4, 'after', 1)]
+        print(order.get_cli_config_move())
+
+    Attributes:
+        moves (list): (policyid, 'before' or 'after', reference policyid) tuples, in the order they are applied
+        vdom (str): vdom of the policies
+    """
+
+    def __init__(self, current, desired, vdom: str = None):
+        """
+        Args:
+            current: iterable of policyids or FgFwPolicy objects, in the sequence currently configured
+            desired: iterable of policyids or FgFwPolicy objects, in the desired sequence
+            vdom (str): vdom of the policies (default: None)
+        """
+        self.vdom = vdom
+        current = _get_policyids(current, 'current')
+        desired = _get_policyids(desired, 'desired')
+
+        # position of each policy in desired order, listed in current order
+        desired_pos = {policyid: pos for pos, policyid in enumerate(desired)}
+        missing = desired_pos.keys() - set(current)
+        if missing:
+            raise ValueError(f"policyid(s) {', '.join(map(str, sorted(missing, key=str)))} of 'desired' are not "
+                             f"in 'current'")
+        kept = _get_kept([desired_pos[policyid] for policyid in current if policyid in desired_pos])
+
+        self.moves = []
+        first_kept = desired[min(kept)] if kept else None
+        for pos, policyid in enumerate(desired):
+            if pos in kept:
+                continue
+            if pos:
+                self.moves.append((policyid, 'after', desired[pos - 1]))
+            else:
+                self.moves.append((policyid, 'before', first_kept))
+
+    def __len__(self):
+        return len(self.moves)
+
+    def __iter__(self):
+        return iter(self.moves)
+
+    def get_cli_config_move(self):
+        """ Get FortiGate CLI configuration applying the moves, an empty str if there are none
+
+        Returns:
+            String
+        """
+        if not self.moves:
+            return ''
+
+        conf = ''
+        if self.vdom:
+            conf += "config vdom\n"
+            conf += f" edit {self.vdom} \n"
+
+        conf += "config firewall policy\n"
+        for policyid, where, ref in self.moves:
+            conf += f"  move {policyid} {where} {ref}\n"
+        conf += "end\n"
+
+        if self.vdom:
+            conf += "end\n"
+        return conf
+
+    def get_api_config_move(self):
+        """ Get FortiGate API configurations applying the moves, one per move, for ftntlib REST API put calls
+
+        Returns:
+            List of dictionaries, example:
+                [{'api': 'cmdb',
+                  'path': 'firewall',
+                  'name': 'policy',
+                  'mkey': 4,
+                  'action': 'move',
+                  'data': {},
+                  'parameters': {'vdom': 'cust1', 'after': 1}}]
+        """
+        confs = []
+        for policyid, where, ref in self.moves:
+            params = {'vdom': self.vdom} if self.vdom else {}
+            params[where] = ref
+            confs.append({'api': 'cmdb', 'path': 'firewall', 'name': 'policy', 'mkey': policyid, 'action': 'move',
+                          'data': {}, 'parameters': params})
+        return confs
@@ -1,5 +1,4 @@
-import re
-from typing import Union
+from __future__ import annotations
 
 from fgobjlib import FgObject
 
@@ -31,8 +30,11 @@ class FgFwService(FgObject):
             icmpcode (int): Value of icmp type.  Used when self's protocol is 'icmp'
     """
 
-    def __init__(self, name: str = None, vdom: str = None, protocol: str = None, tcp_portrange: Union[str, list] = None,
-                 udp_portrange: Union[str, list] = None, sctp_portrange: Union[str, list] = None,
+    # Kinds of object this class is referenced as
+    _ref_kinds = ('service',)
+
+    def __init__(self, name: str = None, vdom: str = None, protocol: str = None, tcp_portrange: str | list = None,
+                 udp_portrange: str | list = None, sctp_portrange: str | list = None,
                  protocol_number: int = None, comment: str = None, visibility: str = None, session_ttl: int = None,
                  udp_idle_timer: int = None, category: str = None, icmptype: int = None, icmpcode: int = None):
         """
@@ -100,6 +102,12 @@ class FgFwService(FgObject):
         if prange is None:
             return None
         else:
+            import re
+
+            # A str holding several space separated ranges, as returned for a list, is handled as a list
+            if isinstance(prange, str) and len(prange.split()) > 1:
+                prange = prange.split()
+
             # If range is provided as a single range in str format
             if isinstance(prange, str):
                 # check that string is only numbers or number dash number
@@ -183,7 +191,7 @@ class FgFwService(FgObject):
 
     @property
     def tcp_portrange(self):
-        return self.tcp_portrange
+        return self._tcp_portrange
 
     @tcp_portrange.setter
     def tcp_portrange(self, prange):
@@ -259,7 +267,7 @@ class FgFwService(FgObject):
 
     @property
     def visibility(self):
-        return self.visibility
+        return self._visibility
 
     @visibility.setter
     def visibility(self, visibility):
@@ -391,7 +399,7 @@ class FgFwService(FgObject):
 
     @property
     def icmptype(self):
-        return self.icmptype
+        return self._icmptype
 
     @icmptype.setter
     def icmptype(self, icmptype):
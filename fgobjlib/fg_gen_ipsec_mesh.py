@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from fgobjlib.fg_fw_policy import FgFwPolicy
+from fgobjlib.fg_sys_router_static import FgRouteIPv4
+from fgobjlib.fg_vpn_ipsec_p1_interface import FgIpsecP1Interface
+from fgobjlib.fg_vpn_ipsec_p2_interface import FgIpsecP2Interface
+
+
+class FgIpsecMesh:
+    """ FgIpsecMesh generates the objects of a hub-and-spoke route based IPsec VPN for both the hub and every spoke
+
+    For each spoke the hub gets a phase1-interface and phase2-interface named after the spoke, a static route to the
+    spoke subnet over that tunnel and a policy in each direction between the tunnel and the hub LAN interface.  The
+    spoke gets a phase1-interface and phase2-interface named hub_name towards hub_gw, a static route to each hub
+    subnet over that tunnel and a policy in each direction between the tunnel and the spoke LAN interface.
+
+    Settings shared by all tunnels, such as proposal and dhgrp, are validated once when the mesh is created: each
+    object is cloned from a prototype and only its per spoke attributes are run through their setters.  Objects are
+    generated one spoke at a time, so meshes with thousands of spokes can be written out without being held in memory.
+
+        mesh = FgIpsecMesh(hub_gw='198.51.100.1', hub_subnets=['10.0.0.0/16'], proposal='aes256-sha256', dhgrp=14,
+                           psksecret='sharedsecret')
+        spokes = [{'name': 'store0001', 'gw': '203.0.113.10', 'subnet': '10.1.1.0/24'}, ...]
+        for device, obj in mesh.iter_objects(spokes):
+            configs.setdefault(device, []).append(obj.get_cli_config_add())
+
+    Attributes:
+        hub_name (str): Device name of the hub, also the name of the tunnel on every spoke
+        hub_gw (str): Public IPv4 address of the hub
+        hub_subnets (list): Subnets behind the hub, routed from every spoke
+        first_routeid (int): Route ID of the first hub route, hub routes are numbered from here
+        first_policyid (int): Policy ID of the first hub policy, hub policies are numbered from here
+    """
+
+    def __init__(self, hub_gw: str, hub_subnets: list, proposal: str | list, dhgrp: int | list,
+                 psksecret: str = None, hub_name: str = 'hub', hub_interface: str = 'wan1',
+                 hub_lan_interface: str = 'internal', spoke_interface: str = 'wan1',
+                 spoke_lan_interface: str = 'internal', p2_proposal: str | list = None, p2_dhgrp: int | list = None,
+                 ike_version: int = 2, hub_vdom: str = None, spoke_vdom: str = None, first_routeid: int = 1,
+                 first_policyid: int = 1):
+        """
+        Args:
+            hub_gw (str): Public IPv4 address of the hub, the remote gateway of every spoke
+            hub_subnets (list): str or list of IPv4 network/mask behind the hub
+            proposal (list): Phase1 proposal(s) of every tunnel
+            dhgrp (list): Phase1 dhgrp(s) of every tunnel
+            psksecret (str): Pre-shared key of every tunnel, unless a spoke sets its own (default: None)
+            hub_name (str): Device name of the hub and the tunnel name on the spokes (default: 'hub')
+            hub_interface (str): Hub interface the tunnels terminate on (default: 'wan1')
+            hub_lan_interface (str): Hub interface allowed to and from the spokes (default: 'internal')
+            spoke_interface (str): Spoke interface the tunnel terminates on (default: 'wan1')
+            spoke_lan_interface (str): Spoke interface allowed to and from the hub (default: 'internal')
+            p2_proposal (list): Phase2 proposal(s) (default: None = proposal)
+            p2_dhgrp (list): Phase2 dhgrp(s) (default: None = dhgrp)
+            ike_version (int): IKE version of every tunnel (default: 2)
+            hub_vdom (str): vdom of the hub objects (default: None)
+            spoke_vdom (str): vdom of the spoke objects (default: None)
+            first_routeid (int): Route ID of the first hub route (default: 1)
+            first_policyid (int): Policy ID of the first hub policy (default: 1)
+        """
+        self.hub_name = hub_name
+        self.hub_gw = hub_gw
+        self.hub_subnets = [hub_subnets] if isinstance(hub_subnets, str) else list(hub_subnets)
+        self.first_routeid = first_routeid
+        self.first_policyid = first_policyid
+
+        p2_proposal = proposal if p2_proposal is None else p2_proposal
+        p2_dhgrp = dhgrp if p2_dhgrp is None else p2_dhgrp
+
+        # Prototypes holding the validated shared settings, cloned for every tunnel, route and policy
+        self._hub_p1 = FgIpsecP1Interface(name=hub_name, p1_type='static', interface=hub_interface, proposal=proposal,
+                                          ike_version=ike_version, psksecret=psksecret, remote_gw=hub_gw,
+                                          add_route='disable', net_device='disable', dhgrp=dhgrp, vdom=hub_vdom)
+        self._hub_p2 = FgIpsecP2Interface(name=hub_name, phase1name=hub_name, proposal=p2_proposal, dhgrp=p2_dhgrp,
+                                          pfs='enable', auto_negotiate='enable', vdom=hub_vdom)
+        self._hub_route = FgRouteIPv4(routeid=first_routeid, device=hub_name, vdom=hub_vdom)
+        self._hub_policy = FgFwPolicy(policyid=first_policyid, srcintf=hub_lan_interface, dstintf=hub_name,
+                                      srcaddr='all', dstaddr='all', service='ALL', schedule='always',
+                                      action='accept', vdom=hub_vdom)
+
+        self._spoke_p1 = self._hub_p1.clone(interface=spoke_interface, vdom=spoke_vdom)
+        self._spoke_p2 = self._hub_p2.clone(vdom=spoke_vdom)
+        self._spoke_routes = [FgRouteIPv4(routeid=routeid, dst=subnet, device=hub_name, vdom=spoke_vdom)
+                              for routeid, subnet in enumerate(self.hub_subnets, 1)]
+        self._spoke_policies = [
+            self._hub_policy.clone(policyid=1, srcintf=spoke_lan_interface, dstintf=hub_name, name=f'{hub_name}-out',
+                                   vdom=spoke_vdom),
+            self._hub_policy.clone(policyid=2, srcintf=hub_name, dstintf=spoke_lan_interface, name=f'{hub_name}-in',
+                                   vdom=spoke_vdom),
+        ]
+        self._hub_lan_interface = hub_lan_interface
+
+    def iter_objects(self, spokes):
+        """ Yield (device, object) for every object of the hub and each spoke, one spoke at a time
+
+        For each spoke the hub objects (device hub_name) are followed by the spoke's own objects (device set to the
+        spoke name).  Hub routes and policies are numbered consecutively from first_routeid and first_policyid,
+        spoke routes and policies from 1 on every spoke.
+
+        Args:
+            spokes: iterable of dictionaries with keys 'name' (spoke device and hub tunnel name), 'gw' (public IPv4
+                address of the spoke), 'subnet' (IPv4 network/mask behind the spoke) and optionally 'psksecret'
+
+        Returns:
+            Generator of (str, FgObject) tuples
+        """
+        hub_name = self.hub_name
+        lan = self._hub_lan_interface
+        routeid = self.first_routeid
+        policyid = self.first_policyid
+
+        for spoke in spokes:
+            name = spoke['name']
+            psk = {'psksecret': spoke['psksecret']} if spoke.get('psksecret') is not None else {}
+
+            yield hub_name, self._hub_p1.clone(name=name, remote_gw=spoke['gw'], **psk)
+            yield hub_name, self._hub_p2.clone(name=name, phase1name=name)
+            yield hub_name, self._hub_route.clone(routeid=routeid, dst=spoke['subnet'], device=name)
+            yield hub_name, self._hub_policy.clone(policyid=policyid, dstintf=name, name=f'{name}-out')
+            yield hub_name, self._hub_policy.clone(policyid=policyid + 1, srcintf=name, dstintf=lan,
+                                                   name=f'{name}-in')
+            routeid += 1
+            policyid += 2
+
+            yield name, self._spoke_p1.clone(**psk)
+            yield name, self._spoke_p2.clone()
+            for route in self._spoke_routes:
+                yield name, route.clone()
+            for policy in self._spoke_policies:
+                yield name, policy.clone()
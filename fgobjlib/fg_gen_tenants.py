@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from fgobjlib.fg_fw_policy import FgFwPolicy
+from fgobjlib.fg_ip_pool import FgIpPool
+from fgobjlib.fg_sys_interface import FgInterfaceIpv4
+from fgobjlib.fg_sys_router_static import FgRouteIPv4
+from fgobjlib.fg_sys_vdom import FgVdom
+from fgobjlib.fg_sys_vdomlink import FgVdomLink
+
+
+class FgTenantPlan:
+    """ FgTenantPlan generates the objects onboarding tenant vdoms behind a shared transit vdom
+
+    For each tenant it generates, from global context:
+        - the FgVdom of the tenant
+        - an FgVdomLink named after the tenant, whose two interfaces ('<link>0' in the transit vdom and '<link>1' in the
+          tenant vdom) get the two addresses of a link subnet allocated from link_pool
+    and within the vdoms:
+        - a default route in the tenant vdom via the transit end of the link
+        - a route in the transit vdom to each tenant subnet via the tenant end of the link
+        - a policy in the tenant vdom from its LAN interface to the link, if the tenant has a LAN interface
+        - a policy in the transit vdom from the link to uplink_interface, if uplink_interface is set
+
+    Global objects have is_global set and are all returned before any vdom object, so every vdom and link interface
+    exists before the routes and policies that use it.  The vdom-link and link interfaces also have vdom_enabled set,
+    unless vdom_enabled is False, so their CLI config is rendered within 'config global'; the vdoms are rendered as
+    top level 'config vdom' edits.  Vdom objects are grouped by vdom, the transit vdom first.  Shared settings are
+    validated once in prototypes, each object is cloned from its prototype with only the per tenant attributes run
+    through their setters.
+
+        pool = FgIpPool('169.254.0.0/16')
+        plan = FgTenantPlan(pool, uplink_interface='port1')
+        objs = plan.get_objects([{'name': 'cust1', 'lan_interface': 'port10', 'subnets': ['10.1.0.0/16']}, ...])
+
+    Attributes:
+        transit_vdom (str): vdom the tenants are linked to
+        link_prefixlen (int): Prefix length of the link subnets, 31 or 30
+        link_format (str): Format of vdom-link names, with field name (the tenant name)
+        first_routeid (int): Route ID of the first transit vdom route, transit routes are numbered from here
+        first_policyid (int): Policy ID of the first transit vdom policy, transit policies are numbered from here
+    """
+
+    def __init__(self, link_pool: FgIpPool, transit_vdom: str = 'root', uplink_interface: str = None,
+                 link_prefixlen: int = 31, link_format: str = '{name}', vlink_type: str = None,
+                 vdom_enabled: bool = True, allowaccess: str = None, nat: str = 'enable', first_routeid: int = 1,
+                 first_policyid: int = 1):
+        """
+        Args:
+            link_pool (FgIpPool): Pool the link subnets are allocated from
+            transit_vdom (str): vdom the tenants are linked to (default: 'root')
+            uplink_interface (str): Transit vdom interface tenant traffic is allowed to, or None for no transit policy
+                (default: None)
+            link_prefixlen (int): Prefix length of the link subnets, 31 or 30 (default: 31)
+            link_format (str): Format of vdom-link names, at most 11 chars (default: '{name}')
+            vlink_type (str): vdom-link type, 'ppp' or 'ethernet' (default: None)
+            vdom_enabled (bool): VDOMs enabled on the target FortiGate (default: True)
+            allowaccess (str): allowaccess of the link interfaces (default: None)
+            nat (str): nat of the transit policies (default: 'enable')
+            first_routeid (int): Route ID of the first transit vdom route (default: 1)
+            first_policyid (int): Policy ID of the first transit vdom policy (default: 1)
+        """
+        if link_prefixlen not in (30, 31):
+            raise ValueError("'link_prefixlen' must be 30 or 31")
+
+        self.transit_vdom = transit_vdom
+        self.link_prefixlen = link_prefixlen
+        self.link_format = link_format
+        self.first_routeid = first_routeid
+        self.first_policyid = first_policyid
+        self._link_pool = link_pool
+        self._uplink_interface = uplink_interface
+
+        # Prototypes holding the validated shared settings, cloned for every tenant.  FgVdom is configured from the top
+        # level 'config vdom' even with vdoms enabled, so only the link and its interfaces get vdom_enabled.
+        self._vdom_proto = FgVdom(name='proto')
+        self._link_proto = FgVdomLink(name='proto', vlink_type=vlink_type, vdom_enabled=vdom_enabled)
+        self._link_proto.is_global = True
+        self._intf_proto = FgInterfaceIpv4(name='proto', vdom=transit_vdom, allowaccess=allowaccess, is_global=True)
+        self._intf_proto.vdom_enabled = True if vdom_enabled else None
+
+        self._default_route = FgRouteIPv4(routeid=1, dst='0.0.0.0/0')
+        self._transit_route = FgRouteIPv4(routeid=first_routeid, vdom=transit_vdom)
+        self._tenant_policy = FgFwPolicy(policyid=1, srcaddr='all', dstaddr='all', service='ALL', schedule='always',
+                                         action='accept')
+        self._transit_policy = self._tenant_policy.clone(policyid=first_policyid, dstintf=uplink_interface, nat=nat,
+                                                         vdom=transit_vdom)
+
+    def _iter_tenant(self, tenant, subnets, routeid, policyid):
+        """ Yield (global, object) for every object of one tenant, True for objects configured from global context """
+        name = tenant['name']
+        link = self.link_format.format(name=name)
+        transit_ip, tenant_ip = self._link_pool.allocate_link(self.link_prefixlen)
+        transit_intf, tenant_intf = f'{link}0', f'{link}1'
+
+        yield True, self._vdom_proto.clone(name=name)
+        yield True, self._link_proto.clone(name=link)
+        yield True, self._intf_proto.clone(name=transit_intf, ip=transit_ip)
+        yield True, self._intf_proto.clone(name=tenant_intf, ip=tenant_ip, vdom=name)
+
+        yield False, self._default_route.clone(device=tenant_intf, gateway=transit_ip.partition('/')[0], vdom=name)
+        if tenant.get('lan_interface'):
+            yield False, self._tenant_policy.clone(srcintf=tenant['lan_interface'], dstintf=tenant_intf,
+                                                   name=f'{name}-out', vdom=name)
+
+        gateway = tenant_ip.partition('/')[0]
+        for routeid, subnet in enumerate(subnets, routeid):
+            yield False, self._transit_route.clone(routeid=routeid, dst=subnet, device=transit_intf, gateway=gateway)
+        if self._uplink_interface:
+            yield False, self._transit_policy.clone(policyid=policyid, srcintf=transit_intf, name=f'{name}-out')
+
+    def get_objects(self, tenants):
+        """ Return list of the objects of every tenant, global objects first then vdom objects grouped by vdom
+
+        Transit vdom routes are numbered consecutively from first_routeid and transit policies from first_policyid,
+        tenant vdom routes and policies from 1 in every tenant vdom.  If a tenant fails validation no objects are
+        returned, but link subnets allocated for the tenants before it stay allocated in link_pool.
+
+        Args:
+            tenants: iterable of dictionaries with keys 'name' (tenant vdom name), and optionally 'lan_interface'
+                (tenant vdom interface allowed to the link) and 'subnets' (str or list of IPv4 network/mask routed from
+                the transit vdom to the tenant)
+
+        Returns:
+            List of FgObject instances
+        """
+        global_objs = []
+        vdom_objs = {self.transit_vdom: []}
+        routeid = self.first_routeid
+        policyid = self.first_policyid
+
+        for tenant in tenants:
+            subnets = tenant.get('subnets') or []
+            subnets = [subnets] if isinstance(subnets, str) else list(subnets)
+
+            for is_global, obj in self._iter_tenant(tenant, subnets, routeid, policyid):
+                if is_global:
+                    global_objs.append(obj)
+                else:
+                    vdom_objs.setdefault(obj.vdom, []).append(obj)
+            routeid += len(subnets)
+            policyid += 1 if self._uplink_interface else 0
+
+        return global_objs + [obj for objs in vdom_objs.values() for obj in objs]
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import ipaddress
+
+from fgobjlib.fg_fw_address import FgFwAddress
+from fgobjlib.fg_ip_pool import int_to_ipv4
+from fgobjlib.fg_sys_interface import FgInterfaceIpv4
+
+
+def parse_vlanids(vlanids):
+    """ Return list of vlanids from a range spec such as '100-199,300' or an iterable of int such as range(100, 200)
+
+    Args:
+        vlanids: str of comma or space separated vlanids and first-last ranges, or iterable of int
+
+    Returns:
+        List
+    """
+    if not isinstance(vlanids, str):
+        return list(vlanids)
+
+    parsed = []
+    for item in vlanids.replace(',', ' ').split():
+        first, _, last = item.partition('-')
+        if not first.isdigit() or (last and not last.isdigit()):
+            raise ValueError(f"'vlanids' item '{item}' must be a vlanid or a range of vlanids such as 100-199")
+        parsed.extend(range(int(first), int(last or first) + 1))
+    return parsed
+
+
+class FgVlanPlan:
+    """ FgVlanPlan generates VLAN interfaces, and optionally an FgFwAddress per VLAN subnet, for a set of parent
+    interfaces, vlanid ranges and an IP plan
+
+    Every vlanid of vlanids is created on every parent interface of phys_intfs.  The IP plan is either a supernet
+    carved into consecutive subnets of prefixlen, one per VLAN in generation order, or a function returning the
+    interface IP/mask of each VLAN.  The interface takes host number host of its subnet.
+
+    Interfaces are cloned from one vlan_intf() prototype per parent interface, so the shared settings (allowaccess,
+    role, vdom, ...) are validated once.  (parent interface, vlanid) pairs and interface names are checked for
+    uniqueness against a set index, seeded with any existing interfaces passed in, and a duplicate raises ValueError.
+
+        plan = FgVlanPlan(['port1', 'port2'], '100-1099', '10.0.0.0/12', prefixlen=24, allowaccess='ping',
+                          addresses=True)
+        for obj in plan.iter_objects():
+            print(obj.get_cli_config_add())
+
+    Attributes:
+        phys_intfs (list): Parent interfaces
+        vlanids (list): vlanids created on each parent interface
+        name_format (str): Format of interface names, with fields phys_intf and vlanid
+        address_format (str): Format of address object names, with fields name (the interface name), phys_intf and
+            vlanid
+    """
+
+    def __init__(self, phys_intfs: str | list, vlanids: str | list, ip_plan=None, prefixlen: int = 24,
+                 host: int = 1, name_format: str = '{phys_intf}-{vlanid}', addresses: bool = False,
+                 address_format: str = 'net-{name}', existing: list = None, vdom: str = None, vrf: int = None,
+                 allowaccess: str = None, role: str = None, device_ident: str = None, mode: str = 'static'):
+        """
+        Args:
+            phys_intfs (list): str or list of str, parent interface(s) of the VLANs
+            vlanids (list): vlanid range spec such as '100-199,300', or iterable of int
+            ip_plan: supernet as str IPv4 network/mask, or function(phys_intf, vlanid) returning the interface
+                IP/mask as str, or None for interfaces without IP (default: None)
+            prefixlen (int): Prefix length of each VLAN subnet carved from a supernet ip_plan (default: 24)
+            host (int): Host number of the interface IP within its subnet, for a supernet ip_plan (default: 1)
+            name_format (str): Format of interface names (default: '{phys_intf}-{vlanid}')
+            addresses (bool): Also generate an FgFwAddress for each VLAN subnet (default: False)
+            address_format (str): Format of address object names (default: 'net-{name}')
+            existing (list): FgInterfaceIpv4 objects already configured, whose names and vlanids must not be reused
+            vdom (str): vdom of the interfaces and addresses (default: None)
+            vrf (int): VRF of the interfaces (default: None)
+            allowaccess (str): allowaccess of the interfaces (default: None)
+            role (str): role of the interfaces (default: None)
+            device_ident (str): device-identification of the interfaces (default: None)
+            mode (str): mode of the interfaces (default: 'static')
+        """
+        self.phys_intfs = [phys_intfs] if isinstance(phys_intfs, str) else list(phys_intfs)
+        self.vlanids = parse_vlanids(vlanids)
+        self.name_format = name_format
+        self.address_format = address_format
+        self._addresses = addresses
+        self._ip_plan = ip_plan
+
+        if isinstance(ip_plan, str):
+            supernet = ipaddress.ip_network(ip_plan)
+            if supernet.version != 4:
+                raise ValueError(f"ip_plan {ip_plan} is not an IPv4 supernet")
+            if not supernet.prefixlen <= prefixlen <= 30:
+                raise ValueError(f"'prefixlen' must be between {supernet.prefixlen} and 30 for ip_plan {ip_plan}")
+            if not 1 <= host < 2 ** (32 - prefixlen) - 1:
+                raise ValueError(f"'host' must be a host number within a /{prefixlen}")
+
+            needed = len(self.phys_intfs) * len(self.vlanids)
+            if needed > 2 ** (prefixlen - supernet.prefixlen):
+                raise ValueError(f"ip_plan {ip_plan} holds {2 ** (prefixlen - supernet.prefixlen)} /{prefixlen} "
+                                 f"subnets, {needed} are needed")
+            self._supernet = (int(supernet.network_address), prefixlen, host)
+        elif ip_plan is not None and not callable(ip_plan):
+            raise ValueError("'ip_plan', when set, must be a str IPv4 supernet or a function")
+
+        # Prototypes holding the validated shared settings, one interface per parent interface
+        self._intf_protos = {}
+        for phys_intf in self.phys_intfs:
+            self._intf_protos[phys_intf] = FgInterfaceIpv4.vlan_intf(name=None, vlanid=1, phys_intf=phys_intf,
+                                                                     mode=mode, vdom=vdom, vrf=vrf,
+                                                                     allowaccess=allowaccess, role=role,
+                                                                     device_ident=device_ident)
+        self._address_proto = FgFwAddress(name='proto', type='ipmask', vdom=vdom) if addresses else None
+
+        # Index of interface names and (parent interface, vlanid) pairs in use
+        self._names = set()
+        self._vlans = set()
+        for intf in existing or ():
+            self._names.add(intf.name)
+            if intf.vlanid is not None:
+                self._vlans.add((intf.phys_intf, intf.vlanid))
+
+    def _reserve_vlans(self):
+        """ Check every (parent interface, vlanid) and interface name of the plan against the index and add them to it
+
+        Returns the interface names in generation order.  Nothing is added to the index if any is already used.
+        """
+        vlans = []
+        names = []
+        for phys_intf in self.phys_intfs:
+            for vlanid in self.vlanids:
+                vlans.append((phys_intf, vlanid))
+                names.append(self.name_format.format(phys_intf=phys_intf, vlanid=vlanid))
+
+        seen_vlans = set(self._vlans)
+        for phys_intf, vlanid in vlans:
+            if (phys_intf, vlanid) in seen_vlans:
+                raise ValueError(f"vlanid {vlanid} is already used on interface '{phys_intf}'")
+            seen_vlans.add((phys_intf, vlanid))
+        seen_names = set(self._names)
+        for name in names:
+            if name in seen_names:
+                raise ValueError(f"interface name '{name}' is already used")
+            seen_names.add(name)
+
+        self._vlans = seen_vlans
+        self._names = seen_names
+        return names
+
+    def _get_addresses(self, phys_intf, vlanid, position):
+        """ Return (interface IP/mask, subnet, generated) of the VLAN at position in generation order
+
+        generated is True if both were carved from the supernet and so are already normalized.
+        """
+        if self._ip_plan is None:
+            return None, None, False
+        if callable(self._ip_plan):
+            ip = self._ip_plan(phys_intf, vlanid)
+            return ip, str(ipaddress.ip_interface(ip).network), False
+
+        network, prefixlen, host = self._supernet
+        network += position << (32 - prefixlen)
+        return f'{int_to_ipv4(network + host)}/{prefixlen}', f'{int_to_ipv4(network)}/{prefixlen}', True
+
+    def iter_objects(self):
+        """ Yield every VLAN interface, each followed by the FgFwAddress of its subnet if addresses is set
+
+        Interfaces without an IP have no address object.  VLANs are generated parent interface by parent interface, in
+        vlanids order.  Every (parent interface, vlanid) and interface name of the plan is checked against the plan's
+        index, and added to it, before the first object is yielded, so a duplicate raises ValueError before any object
+        is generated, and generating twice raises ValueError.
+
+        Returns:
+            Generator of FgInterfaceIpv4 and FgFwAddress objects
+        """
+        names = self._reserve_vlans()
+
+        position = 0
+        for phys_intf in self.phys_intfs:
+            proto = self._intf_protos[phys_intf]
+            for vlanid in self.vlanids:
+                name = names[position]
+                ip, subnet, generated = self._get_addresses(phys_intf, vlanid, position)
+                position += 1
+                if generated:
+                    # The ip setter only stores str(ipaddress.ip_interface(ip)).  ip is carved from the supernet
+                    # validated in __init__ and already in that form, so storing it directly skips only the parsing.
+                    intf = proto.clone(name=name, vlanid=vlanid)
+                    intf.__dict__['_ip'] = ip
+                else:
+                    intf = proto.clone(name=name, vlanid=vlanid, ip=ip)
+                yield intf
+
+                if self._address_proto is not None and ip is not None:
+                    address_name = self.address_format.format(name=name, phys_intf=phys_intf, vlanid=vlanid)
+                    if generated:
+                        # as for ip, subnet is already the str(ipaddress.ip_network(subnet)) the setter stores
+                        address = self._address_proto.clone(name=address_name, associated_interface=name)
+                        address.__dict__['_subnet'] = subnet
+                    else:
+                        address = self._address_proto.clone(name=address_name, subnet=subnet,
+                                                            associated_interface=name)
+                    yield address
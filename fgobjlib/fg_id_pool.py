@@ -0,0 +1,143 @@
+from fgobjlib.fg_ranges import FgRangeSet
+from fgobjlib.fg_render import get_partition_key
+
+# Range of ids allocated for each id attribute; 0 is left to FortiOS, which picks the next free id itself
+ID_RANGES = {'policyid': (1, 4294967294), 'routeid': (1, 4294967295)}
+
+
+class FgIdPool:
+    """ FgIdPool hands out free policyid and routeid values per vdom and table
+
+    Each (vdom, CLI_PATH) table, such as the policies of one vdom, has its own FgRangeSet of free ids, created on first
+    use.  Ids of existing objects are taken out with reserve_objects(), so new objects never collide with them.  Ids
+    are handed out lowest first and freed ids are merged back into their free range, so ids stay dense and the same
+    input allocates the same ids on every run.  Objects of classes whose id attribute is not in ID_RANGES, such as
+    named objects, are ignored.
+
+        ids = FgIdPool()
+        ids.reserve_objects(existing_policies + existing_routes)
+        ids.assign(new_policies)        # sets policyid of each policy that has none
+    """
+
+    def __init__(self, objs=None):
+        """
+        Args:
+            objs: iterable of FgObject instances whose ids are reserved (default: None)
+        """
+        # (vdom, CLI_PATH) -> FgRangeSet of free ids
+        self._tables = {}
+
+        if objs is not None:
+            self.reserve_objects(objs)
+
+    def _get_free(self, obj):
+        """ Return the FgRangeSet of free ids of the table of obj, None if obj has no allocated id attribute """
+        id_range = ID_RANGES.get(obj._obj_id_attr)
+        if id_range is None:
+            return None
+
+        key = get_partition_key(obj)
+        try:
+            return self._tables[key]
+        except KeyError:
+            free = self._tables[key] = FgRangeSet(*id_range)
+            return free
+
+    def get_free_count(self, obj):
+        """ Return number of free ids in the table of obj
+
+        Args:
+            obj: FgObject instance, such as FgFwPolicy or FgRouteIPv4
+
+        Returns:
+            Integer
+        """
+        free = self._get_free(obj)
+        if free is None:
+            raise ValueError(f"{obj.__class__.__name__} ids are not allocated by FgIdPool")
+        return free.get_free_count()
+
+    # Reservation Methods
+    def reserve_objects(self, objs):
+        """ Take the id of every object in objs that has one out of its table
+
+        Args:
+            objs: iterable of FgObject instances
+
+        Returns:
+            None
+        """
+        for obj in objs:
+            free = self._get_free(obj)
+            if free is not None:
+                obj_id = getattr(obj, obj._obj_id_attr)
+                if obj_id:
+                    free.remove(obj_id)
+
+    def free_objects(self, objs):
+        """ Return the id of every object in objs that has one to its table, such as objects being deleted
+
+        Args:
+            objs: iterable of FgObject instances
+
+        Returns:
+            None
+        """
+        for obj in objs:
+            free = self._get_free(obj)
+            if free is not None:
+                obj_id = getattr(obj, obj._obj_id_attr)
+                if obj_id:
+                    free.add(obj_id)
+
+    # Allocation Methods
+    def allocate(self, obj, count: int = 1):
+        """ Allocate count free ids, lowest first, from the table of obj without setting them on obj
+
+        Args:
+            obj: FgObject instance whose class and vdom select the table, such as a prototype of new objects
+            count (int): Number of ids (default: 1)
+
+        Returns:
+            List of int
+        """
+        free = self._get_free(obj)
+        if free is None:
+            raise ValueError(f"{obj.__class__.__name__} ids are not allocated by FgIdPool")
+        try:
+            return free.allocate_many(count)
+        except ValueError:
+            raise ValueError(f"table {get_partition_key(obj)} has fewer than {count} free ids")
+
+    def assign(self, objs):
+        """ Set the id of every object in objs that has none (0) to a free id of its table, lowest first
+
+        Objects that already have an id keep it and it is reserved, so re-running assign() over a mix of existing and
+        new objects only numbers the new ones.  Ids are allocated in bulk per table.
+
+        Args:
+            objs: iterable of FgObject instances
+
+        Returns:
+            Int: number of objects assigned an id
+        """
+        # objects without id, per table
+        pending = {}
+        for obj in objs:
+            free = self._get_free(obj)
+            if free is None:
+                continue
+            obj_id = getattr(obj, obj._obj_id_attr)
+            if obj_id:
+                free.remove(obj_id)
+            else:
+                pending.setdefault(id(free), (obj, []))[1].append(obj)
+
+        assigned = 0
+        for first_obj, table_objs in pending.values():
+            for obj, obj_id in zip(table_objs, self.allocate(first_obj, len(table_objs))):
+                setattr(obj, obj._obj_id_attr, obj_id)
+                obj.obj_id = obj_id
+                obj._obj_to_str = None
+            assigned += len(table_objs)
+        return assigned
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import ipaddress
+
+from fgobjlib.fg_ranges import FgRangeSet
+
+
+def int_to_ipv4(address):
+    """ Return dotted quad str of an int IPv4 address, faster than str(ipaddress.IPv4Address(address))
+
+    Args:
+        address (int): IPv4 address, 0 to 2 ** 32 - 1
+
+    Returns:
+        String
+    """
+    return f'{address >> 24}.{(address >> 16) & 255}.{(address >> 8) & 255}.{address & 255}'
+
+
+def _get_range(value):
+    """ Return (first, last) int addresses of an IPv4 address, network/mask or interface IP/mask str """
+    network = ipaddress.ip_interface(value).network
+    if network.version != 4:
+        raise ValueError(f"'{value}' is not an IPv4 address or network")
+    first = int(network.network_address)
+    return first, first + network.num_addresses - 1
+
+
+class FgIpPool:
+    """ FgIpPool hands out non-overlapping IPv4 subnets, point-to-point links and host addresses from supernets
+
+    Free space is held as ranges of int addresses in an FgRangeSet, so memory depends on fragmentation rather than on
+    the number of allocations, and allocating in a pool of millions of subnets stays a few bisections.  Subnets are
+    always aligned to their size.  Addresses in use elsewhere are taken out of the pool with reserve(), or with
+    reserve_objects() from the ip of FgInterfaceIpv4 and the dst of FgRouteIPv4 objects.
+
+    Values are returned as the str the property setters store: a subnet as 'network/prefixlen' (FgRouteIPv4.dst,
+    FgFwAddress.subnet), an interface address as 'ip/prefixlen' (FgInterfaceIpv4.ip) and a host as 'ip'.  The network
+    and broadcast addresses of each supernet are never handed out as hosts.  Hosts and subnets may be allocated from
+    the same pool, but separate pools keep subnets from being fragmented by hosts.
+
+        pool = FgIpPool(['10.255.0.0/16'])
+        pool.reserve_objects(existing_interfaces)
+        local_ip, peer_ip = pool.allocate_link(31)    # '10.255.0.0/31', '10.255.0.1/31'
+
+    Attributes:
+        supernets (list): Supernets of the pool, as 'network/prefixlen' str
+    """
+
+    def __init__(self, supernets: str | list):
+        """
+        Args:
+            supernets (list): str or list of str IPv4 network/mask to allocate from
+        """
+        supernets = [supernets] if isinstance(supernets, str) else list(supernets)
+        self.supernets = [str(ipaddress.ip_network(supernet)) for supernet in supernets]
+
+        # Free addresses, and all addresses of the pool
+        self._free = FgRangeSet()
+        self._pool = FgRangeSet()
+        self._edges = set()
+        for supernet in self.supernets:
+            first, last = _get_range(supernet)
+            self._free.add(first, last)
+            self._pool.add(first, last)
+            if last - first > 1:
+                self._edges.update((first, last))
+
+    def get_free_count(self):
+        """ Return number of free addresses
+
+        Returns:
+            Integer
+        """
+        return self._free.get_free_count()
+
+    def is_free(self, value: str):
+        """ Return True if every address of value is in the pool and free
+
+        Args:
+            value (str): IPv4 address, network/mask or interface IP/mask
+
+        Returns:
+            Bool
+        """
+        return self._free.is_free(*_get_range(value))
+
+    # Reservation Methods
+    def reserve(self, value: str):
+        """ Take every address of value out of the pool; addresses outside the pool or not free are ignored
+
+        Args:
+            value (str): IPv4 address, network/mask or interface IP/mask.  An interface IP/mask reserves its subnet.
+
+        Returns:
+            None
+        """
+        self._free.remove(*_get_range(value))
+
+    def reserve_objects(self, objs):
+        """ Reserve the subnet of the ip of every FgInterfaceIpv4 and the dst of every FgRouteIPv4 in objs
+
+        Default routes (dst 0.0.0.0/0) and IPv6 values are skipped, as are objects of other classes and objects
+        without a value, so a mixed IPv4 and IPv6 inventory may be passed as is.
+
+        Args:
+            objs: iterable of FgObject instances
+
+        Returns:
+            None
+        """
+        for obj in objs:
+            value = getattr(obj, 'ip', None) or getattr(obj, 'dst', None)
+            # values are stored normalized by the setters, so only IPv6 values contain ':'
+            if value and not value.endswith('/0') and ':' not in value:
+                self.reserve(value)
+
+    def free(self, value: str):
+        """ Return every address of value to the pool
+
+        Args:
+            value (str): IPv4 address, network/mask or interface IP/mask as allocated.  An interface IP/mask frees its
+                subnet.
+
+        Returns:
+            None
+        """
+        first, last = _get_range(value)
+        if not self._pool.is_free(first, last):
+            raise ValueError(f"'{value}' is not within the pool supernets {', '.join(self.supernets)}")
+        self._free.add(first, last)
+
+    # Allocation Methods
+    def allocate_subnet(self, prefixlen: int):
+        """ Allocate the lowest free subnet of prefixlen
+
+        Args:
+            prefixlen (int): Prefix length of the subnet, 0 to 32
+
+        Returns:
+            String, 'network/prefixlen'
+        """
+        return self.allocate_subnets(1, prefixlen)[0]
+
+    def allocate_subnets(self, count: int, prefixlen: int):
+        """ Allocate count subnets of prefixlen, lowest first; if fewer are free none are allocated
+
+        Args:
+            count (int): Number of subnets
+            prefixlen (int): Prefix length of the subnets, 0 to 32
+
+        Returns:
+            List of str, 'network/prefixlen'
+        """
+        if not isinstance(prefixlen, int) or not 0 <= prefixlen <= 32:
+            raise ValueError("'prefixlen' must be type int() between 0 and 32")
+
+        return [f'{int_to_ipv4(start)}/{prefixlen}' for start in self._allocate_starts(count, prefixlen)]
+
+    def _allocate_starts(self, count, prefixlen):
+        """ Allocate count subnets of prefixlen and return list of their int network addresses """
+        size = 1 << (32 - prefixlen)
+        try:
+            return self._free.allocate_many(count, size, size)
+        except ValueError:
+            raise ValueError(f'pool {", ".join(self.supernets)} has fewer than {count} free /{prefixlen} subnets')
+
+    def allocate_link(self, prefixlen: int = 31):
+        """ Allocate a point-to-point subnet and return the interface addresses of its two ends
+
+        Args:
+            prefixlen (int): 31 for the two addresses of a /31, or 30 for the two hosts of a /30 (default: 31)
+
+        Returns:
+            Tuple of two str, 'ip/prefixlen'
+        """
+        return self.allocate_links(1, prefixlen)[0]
+
+    def allocate_links(self, count: int, prefixlen: int = 31):
+        """ Allocate count point-to-point subnets as allocate_link() does
+
+        Args:
+            count (int): Number of links
+            prefixlen (int): 31 or 30 (default: 31)
+
+        Returns:
+            List of tuples of two str, 'ip/prefixlen'
+        """
+        if prefixlen not in (30, 31):
+            raise ValueError("'prefixlen' of a link must be 30 or 31")
+
+        first_host = 1 if prefixlen == 30 else 0
+        return [(f'{int_to_ipv4(start + first_host)}/{prefixlen}', f'{int_to_ipv4(start + first_host + 1)}/{prefixlen}')
+                for start in self._allocate_starts(count, prefixlen)]
+
+    def allocate_host(self):
+        """ Allocate the lowest free host address, never the network or broadcast address of a supernet
+
+        Returns:
+            String, 'ip'
+        """
+        while True:
+            try:
+                address = self._free.allocate()
+            except ValueError:
+                raise ValueError(f'pool {", ".join(self.supernets)} has no free host address')
+
+            # supernet edges stay allocated, so they are only skipped once
+            if address not in self._edges:
+                return int_to_ipv4(address)
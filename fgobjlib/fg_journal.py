@@ -0,0 +1,213 @@
+import hashlib
+import json
+import os
+
+from fgobjlib.fg_render import RENDER_METHODS
+
+
+def _get_digest(output):
+    """ Return sha256 hex digest of the output of a config method: str, bytes or API config dictionary """
+    if isinstance(output, str):
+        output = output.encode()
+    elif not isinstance(output, (bytes, bytearray, memoryview)):
+        output = json.dumps(output, sort_keys=True, separators=(',', ':')).encode()
+    return hashlib.sha256(output).hexdigest()
+
+
+class FgJournal:
+    """ FgJournal records the config operations applied to a FortiGate so an interrupted push resumes where it stopped
+
+    The journal is an append-only file of one JSON line per completed operation:
+        {"class":"FgFwPolicy","vdom":"root","obj_id":150,"method":"get_api_config_add","hash":"<sha256>"}
+
+    apply() renders each object with a config method and hands the output to a send function, such as one making the
+    ftntlib REST API call.  Once send() returns, the operation is recorded.  Records are written and fsync'd in batches
+    of batch_size, and the pending batch is also written when send() raises, so a failed push leaves every completed
+    operation in the journal.  Operations already in the journal when apply() is called again are skipped, so
+    re-running the same push with the same journal resumes after the last recorded operation.
+
+    The hash is of the rendered output, so an object changed since it was applied is applied again.  After a crash
+    that prevents the pending batch from being written, at most batch_size completed operations are sent again.
+
+        with FgJournal('push.journal') as journal:
+            journal.apply(objs, send=lambda conf: api.post(**conf))
+
+    Attributes:
+        path (str): Journal file path
+        batch_size (int): Operations recorded per write and fsync
+        applied (int): Operations sent by apply() through this instance
+        skipped (int): Operations skipped by apply() because the journal already held them
+    """
+
+    def __init__(self, path, batch_size: int = 1000):
+        """
+        Args:
+            path: Journal file path, created if it does not exist
+            batch_size (int): Operations recorded per write and fsync (default: 1000)
+        """
+        if not isinstance(batch_size, int) or batch_size < 1:
+            raise ValueError("'batch_size' must be type int() >= 1")
+
+        self.path = path
+        self.batch_size = batch_size
+        self.applied = 0
+        self.skipped = 0
+        # (class name, vdom, obj_id, method, hash) of every recorded operation
+        self._done = set()
+        self._pending = []
+
+        self._read()
+        # unbuffered, so a failed write leaves nothing behind in a buffer to be written later
+        self._fp = open(path, 'ab', buffering=0)
+        # size of the file up to the end of the last batch written completely
+        self._size = os.fstat(self._fp.fileno()).st_size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+            return
+
+        # an error raised within the block is the one reported, not a failure to write the pending records
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def __len__(self):
+        return len(self._done)
+
+    def _read(self):
+        """ Load the operations recorded in the journal file, if it exists """
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, 'rb') as fp:
+            data = fp.read()
+
+        # a last line without newline is a record cut short by a crash; drop it so new records start on a fresh line
+        end = data.rfind(b'\n') + 1
+        if end < len(data):
+            with open(self.path, 'r+b') as fp:
+                fp.truncate(end)
+
+        for line_number, line in enumerate(data[:end].splitlines(), 1):
+            try:
+                record = json.loads(line)
+                self._done.add((record['class'], record['vdom'], record['obj_id'], record['method'], record['hash']))
+            except (ValueError, KeyError, TypeError):
+                raise ValueError(f"{self.path} line {line_number} is not a journal record")
+
+    @staticmethod
+    def _get_key(obj, method, output):
+        return obj.__class__.__name__, obj.vdom, obj.obj_id, method, _get_digest(output)
+
+    def is_applied(self, obj, method: str = 'get_api_config_add'):
+        """ Return True if the journal holds the operation of method on obj, as obj renders now
+
+        Args:
+            obj: FgObject instance
+            method (str): Config method (default: 'get_api_config_add')
+
+        Returns:
+            Boolean
+        """
+        if method not in RENDER_METHODS:
+            raise ValueError(f"'method' must be one of {', '.join(RENDER_METHODS)}")
+        return self._get_key(obj, method, getattr(obj, method)()) in self._done
+
+    def apply(self, objs, send, method: str = 'get_api_config_add'):
+        """ Render every object with method, send each output not yet in the journal and record it once sent
+
+        Objects are applied in the order given.  An exception raised by send() stops apply() after the operations
+        completed before it are written to the journal, and is raised to the caller even if that write fails.
+
+        Args:
+            objs: iterable of FgObject instances
+            send: function called with the output of method for each object to apply, raising if the operation failed
+            method (str): Config method to call on each object (default: 'get_api_config_add')
+
+        Returns:
+            Int: number of operations sent
+        """
+        if method not in RENDER_METHODS:
+            raise ValueError(f"'method' must be one of {', '.join(RENDER_METHODS)}")
+        self._check_open()
+
+        sent = 0
+        try:
+            for obj in objs:
+                output = getattr(obj, method)()
+                key = self._get_key(obj, method, output)
+                if key in self._done:
+                    self.skipped += 1
+                    continue
+
+                send(output)
+                sent += 1
+                self._done.add(key)
+                self._pending.append(key)
+                if len(self._pending) >= self.batch_size:
+                    self.flush()
+        except BaseException:
+            self.applied += sent
+            try:
+                self.flush()
+            except Exception:
+                # the error that stopped the push is the one raised; records that could not be written stay pending
+                # for the next flush() or close()
+                pass
+            raise
+
+        self.applied += sent
+        self.flush()
+        return sent
+
+    def flush(self):
+        """ Write the pending records to the journal and fsync it
+
+        If the write fails the records stay pending, and the next flush() first removes any part of them that reached
+        the file, so the journal only ever holds complete records.
+
+        Returns:
+            None
+        """
+        self._check_open()
+        if not self._pending:
+            return
+
+        lines = [json.dumps({'class': cls_name, 'vdom': vdom, 'obj_id': obj_id, 'method': method, 'hash': digest},
+                            separators=(',', ':'))
+                 for cls_name, vdom, obj_id, method, digest in self._pending]
+        data = ('\n'.join(lines) + '\n').encode()
+        fd = self._fp.fileno()
+
+        # a failed earlier flush may have written part of the batch; drop it, the batch is written again here
+        if os.fstat(fd).st_size != self._size:
+            os.ftruncate(fd, self._size)
+
+        view = memoryview(data)
+        while view:
+            view = view[self._fp.write(view):]
+        os.fsync(fd)
+        self._size += len(data)
+        self._pending = []
+
+    def _check_open(self):
+        if self._fp is None:
+            raise ValueError("journal is closed")
+
+    def close(self):
+        """ Write the pending records and close the journal file.  The file is closed even if the write fails.
+
+        Returns:
+            None
+        """
+        if self._fp is not None:
+            try:
+                self.flush()
+            finally:
+                self._fp.close()
+                self._fp = None
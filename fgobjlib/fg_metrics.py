@@ -0,0 +1,251 @@
+import functools
+import time
+from collections import Counter, defaultdict
+
+from fgobjlib import FgObject
+
+
+class FgMetrics:
+    """ FgMetrics collects optional runtime metrics for FgObject and all of its child classes
+
+    Instrumentation is off by default and costs nothing while disabled: enable() wraps the constructors, property
+    setters and config rendering methods of every FgObject class with counting versions, and disable() puts the
+    original functions back.  Only one FgMetrics instance may be enabled at a time.
+
+    Metrics collected while enabled:
+        objects_constructed: completed constructions per class, through the constructor or from_trusted()
+        construct_seconds: cumulative construction time per class
+        validation_failures: exceptions raised by property setters per class and attribute
+        render_calls: calls per class and config method (get_api_config_* and get_cli_config_*)
+        render_seconds: cumulative time per class and config method
+
+    Config methods that call other config methods (such as get_api_config_update() calling get_api_config_add()) are
+    counted for each method, so their times overlap.
+
+    Attributes:
+        enabled (bool): True while this instance has instrumentation installed
+    """
+
+    RENDER_METHODS = ('get_api_config_add', 'get_api_config_update', 'get_api_config_del', 'get_api_config_get',
+                      'get_cli_config_add', 'get_cli_config_update', 'get_cli_config_del')
+
+    # The instance currently installed, if any
+    _active = None
+
+    def __init__(self):
+        self.enabled = False
+
+        # Original class attributes replaced by enable(), as (class, attribute name, original value)
+        self._originals = []
+
+        self._constructed = Counter()
+        self._construct_seconds = defaultdict(float)
+        self._validation_failures = Counter()
+        self._render_calls = Counter()
+        self._render_seconds = defaultdict(float)
+
+    def reset(self):
+        """ Clear all collected metrics
+
+        Counters are cleared in place, as the installed wrappers hold references to them.
+
+        Returns:
+            None
+        """
+        self._constructed.clear()
+        self._construct_seconds.clear()
+        self._validation_failures.clear()
+        self._render_calls.clear()
+        self._render_seconds.clear()
+
+    # Enable/Disable
+    def enable(self):
+        """ Install instrumentation on FgObject and every class derived from it
+
+        All classes exported by fgobjlib are imported so they are instrumented even if not yet used.  Classes defined
+        after enable() is called are not instrumented until disable() and enable() are called again.
+
+        Returns:
+            None
+        """
+        if self.enabled:
+            return
+        if FgMetrics._active is not None:
+            raise Exception("another FgMetrics instance is already enabled, disable it first")
+
+        import fgobjlib
+        for name in fgobjlib.__all__:
+            getattr(fgobjlib, name)
+
+        for cls in self._get_classes():
+            for attr, value in list(vars(cls).items()):
+                if attr == '__init__':
+                    wrapped = self._wrap_init(cls, value)
+                elif attr == 'from_trusted':
+                    wrapped = self._wrap_from_trusted(value)
+                elif attr in self.RENDER_METHODS:
+                    wrapped = self._wrap_render(attr, value)
+                elif isinstance(value, property) and value.fset is not None:
+                    wrapped = property(value.fget, self._wrap_setter(attr, value.fset), value.fdel, value.__doc__)
+                else:
+                    continue
+                self._originals.append((cls, attr, value))
+                setattr(cls, attr, wrapped)
+
+        FgMetrics._active = self
+        self.enabled = True
+
+    def disable(self):
+        """ Remove instrumentation, restoring the original class attributes.  Collected metrics are kept.
+
+        Returns:
+            None
+        """
+        if not self.enabled:
+            return
+
+        for cls, attr, value in reversed(self._originals):
+            setattr(cls, attr, value)
+        self._originals = []
+
+        FgMetrics._active = None
+        self.enabled = False
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.disable()
+
+    @staticmethod
+    def _get_classes():
+        """ Return FgObject and all of its subclasses """
+        classes = [FgObject]
+        for cls in classes:
+            for subclass in cls.__subclasses__():
+                if subclass not in classes:
+                    classes.append(subclass)
+        return classes
+
+    # Wrappers
+    def _wrap_init(self, cls, init):
+        constructed = self._constructed
+        construct_seconds = self._construct_seconds
+
+        @functools.wraps(init)
+        def __init__(obj, *args, **kwargs):
+            start = time.perf_counter()
+            init(obj, *args, **kwargs)
+
+            # Parent constructors run through here as well, only count the object's own class
+            if type(obj) is cls:
+                name = cls.__name__
+                constructed[name] += 1
+                construct_seconds[name] += time.perf_counter() - start
+
+        return __init__
+
+    def _wrap_from_trusted(self, method):
+        constructed = self._constructed
+        construct_seconds = self._construct_seconds
+        func = method.__func__
+
+        @functools.wraps(func)
+        def from_trusted(cls, **attrs):
+            start = time.perf_counter()
+            obj = func(cls, **attrs)
+            constructed[cls.__name__] += 1
+            construct_seconds[cls.__name__] += time.perf_counter() - start
+            return obj
+
+        return classmethod(from_trusted)
+
+    def _wrap_render(self, method_name, method):
+        render_calls = self._render_calls
+        render_seconds = self._render_seconds
+
+        @functools.wraps(method)
+        def render(obj, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(obj, *args, **kwargs)
+            finally:
+                key = (type(obj).__name__, method_name)
+                render_calls[key] += 1
+                render_seconds[key] += time.perf_counter() - start
+
+        return render
+
+    def _wrap_setter(self, attr, fset):
+        validation_failures = self._validation_failures
+
+        @functools.wraps(fset)
+        def setter(obj, value):
+            try:
+                fset(obj, value)
+            except Exception:
+                validation_failures[(type(obj).__name__, attr)] += 1
+                raise
+
+        return setter
+
+    # Export methods
+    def snapshot(self):
+        """ Return a copy of the collected metrics as nested dictionaries
+
+        Returns:
+            Dictionary of metric name to per-class values.
+
+            example:
+                {'objects_constructed': {'FgFwPolicy': 2},
+                 'construct_seconds': {'FgFwPolicy': 4.1e-05},
+                 'validation_failures': {'FgFwPolicy': {'action': 1}},
+                 'render_calls': {'FgFwPolicy': {'get_cli_config_add': 2}},
+                 'render_seconds': {'FgFwPolicy': {'get_cli_config_add': 1.9e-05}}}
+        """
+        def nest(counter):
+            nested = {}
+            for (cls_name, key), value in counter.items():
+                nested.setdefault(cls_name, {})[key] = value
+            return nested
+
+        return {'objects_constructed': dict(self._constructed),
+                'construct_seconds': dict(self._construct_seconds),
+                'validation_failures': nest(self._validation_failures),
+                'render_calls': nest(self._render_calls),
+                'render_seconds': nest(self._render_seconds)}
+
+    def get_prometheus_text(self, prefix: str = 'fgobjlib'):
+        """ Return the collected metrics in Prometheus text exposition format
+
+        Args:
+            prefix (str): Metric name prefix (default: 'fgobjlib')
+
+        Returns:
+            String
+        """
+        lines = []
+
+        def family(name, help_text, samples):
+            lines.append(f'# HELP {prefix}_{name} {help_text}')
+            lines.append(f'# TYPE {prefix}_{name} counter')
+            for labels, value in sorted(samples):
+                label_str = ','.join(f'{key}="{val}"' for key, val in labels)
+                lines.append(f'{prefix}_{name}{{{label_str}}} {value}')
+
+        family('objects_constructed_total', 'Objects constructed per class',
+               [((('class', cls_name),), value) for cls_name, value in self._constructed.items()])
+        family('construct_seconds_total', 'Cumulative constructor time per class',
+               [((('class', cls_name),), value) for cls_name, value in self._construct_seconds.items()])
+        family('validation_failures_total', 'Property setter validation failures per class and attribute',
+               [((('class', cls_name), ('attribute', attr)), value)
+                for (cls_name, attr), value in self._validation_failures.items()])
+        family('render_calls_total', 'Config method calls per class and method',
+               [((('class', cls_name), ('method', method)), value)
+                for (cls_name, method), value in self._render_calls.items()])
+        family('render_seconds_total', 'Cumulative config method time per class and method',
+               [((('class', cls_name), ('method', method)), value)
+                for (cls_name, method), value in self._render_seconds.items()])
+
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,131 @@
+import json
+import os
+
+# HTTP method of the request built by each API config method
+HTTP_METHODS = {'get_api_config_add': 'post', 'get_api_config_update': 'put', 'get_api_config_del': 'delete',
+                'get_api_config_get': 'get'}
+
+# Lines are written in batches of this many, so dump() on a generator keeps memory flat
+_BATCH_SIZE = 10000
+
+
+class FgNdjson:
+    """ FgNdjson streams the API requests of FgObject collections to and from NDJSON files, one request per line
+
+    Each line holds one JSON object: the dictionary an API config method returns ('api', 'path', 'name', 'mkey',
+    'action', 'data' and 'parameters', as passed to ftntlib) with the HTTP method of the request added as 'method':
+        {"method":"post","api":"cmdb","path":"firewall","name":"policy","mkey":null,"action":null,
+         "data":{"policyid":1,...},"parameters":{"vdom":"root"}}
+
+    Write a file with FgNdjson.save(path, objs) or FgNdjson.dump(objs, fp), which render and write the objects one
+    batch at a time, so objs may be a generator.  Read one with FgNdjson(path), which reads and decodes one line at a
+    time as it is iterated, so neither side ever holds more than a batch of requests.
+
+        FgNdjson.save('push.ndjson', policies)
+        with FgNdjson('push.ndjson') as requests:
+            for request in requests:
+                push(request)
+
+    Attributes:
+        path (str): File path read, or None when reading from a file object
+    """
+
+    def __init__(self, source):
+        """
+        Args:
+            source: Path of an NDJSON file, or file object (text or binary) to read lines from
+        """
+        if isinstance(source, (str, os.PathLike)):
+            self.path = source
+            self._fp = open(source, 'rb')
+            self._owns_fp = True
+        else:
+            self.path = None
+            self._fp = source
+            self._owns_fp = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __iter__(self):
+        for line_number, line in enumerate(self._fp, 1):
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError:
+                raise ValueError(f"line {line_number} is not valid JSON")
+            if not isinstance(request, dict) or 'method' not in request:
+                raise ValueError(f"line {line_number} is not an API request")
+            yield request
+
+    def close(self):
+        """ Close the file, if it was opened from a path
+
+        Returns:
+            None
+        """
+        if self._owns_fp:
+            self._fp.close()
+
+    # Writer Methods
+    @classmethod
+    def dump(cls, objs, fp, method: str = 'get_api_config_add'):
+        """ Write the API request of every object in objs to text file object fp, one line each
+
+        Args:
+            objs: iterable of FgObject instances
+            fp: Text file object to write
+            method (str): API config method to call on each object (default: 'get_api_config_add')
+
+        Returns:
+            Int: number of requests written
+        """
+        http_method = HTTP_METHODS.get(method)
+        if http_method is None:
+            raise ValueError(f"'method' must be one of {', '.join(HTTP_METHODS)}")
+
+        dumps = json.JSONEncoder(separators=(',', ':')).encode
+        count = 0
+        lines = []
+        for obj in objs:
+            request = {'method': http_method}
+            request.update(getattr(obj, method)())
+            lines.append(dumps(request))
+            if len(lines) >= _BATCH_SIZE:
+                count += len(lines)
+                fp.write('\n'.join(lines) + '\n')
+                lines = []
+
+        if lines:
+            count += len(lines)
+            fp.write('\n'.join(lines) + '\n')
+        return count
+
+    @classmethod
+    def save(cls, path, objs, method: str = 'get_api_config_add'):
+        """ Write the API request of every object in objs to NDJSON file path, one line each
+
+        The file is written under a temporary name and renamed when complete, so readers never see a partial file.
+
+        Args:
+            path: File path to write
+            objs: iterable of FgObject instances
+            method (str): API config method to call on each object (default: 'get_api_config_add')
+
+        Returns:
+            Int: number of requests written
+        """
+        tmp_path = f'{path}.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8', newline='\n') as fp:
+                count = cls.dump(objs, fp, method)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return count
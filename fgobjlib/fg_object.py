@@ -1,4 +1,68 @@
+import json
+import sys
 from abc import ABC
+from json.encoder import encode_basestring_ascii
+
+# orjson, when installed, encodes API request bodies faster than the built-in encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Per-class cache used by from_trusted(): class -> (template instance __dict__, {attribute: storage key})
+_trusted_templates = {}
+
+# Hash-consed member tuples: every distinct tuple of member names is stored once and shared by all objects holding it.
+# Emptied when full, which only stops later tuples from being shared with earlier ones.
+_member_tuples = {}
+_MEMBER_TUPLES_SIZE = 65536
+
+
+def get_member_tuple(names):
+    """ Return the shared tuple of the interned names, as stored by member list attributes such as FgFwPolicy srcaddr
+
+    Args:
+        names: iterable of str
+
+    Returns:
+        Tuple
+    """
+    members = tuple([sys.intern(name) for name in names])
+    try:
+        return _member_tuples[members]
+    except KeyError:
+        if len(_member_tuples) >= _MEMBER_TUPLES_SIZE:
+            _member_tuples.clear()
+        _member_tuples[members] = members
+        return members
+
+
+# Per-class cache used by get_api_data_bytes(): class -> [(attribute, API key, '"<API key>":' JSON fragment)].  Every
+# class sets the same _data_attrs for all of its instances.
+_api_data_fragments = {}
+
+# JSON text of member tuples, see _encode_json()
+_member_json = {}
+
+
+def _encode_json(value):
+    """ Return JSON text of an attribute value, member tuples as the API's list of {'name': <name>} objects """
+    value_type = type(value)
+    if value_type is str:
+        return encode_basestring_ascii(value)
+    if value_type is int:
+        return int.__repr__(value)
+    if value_type is tuple:
+        try:
+            return _member_json[value]
+        except KeyError:
+            if len(_member_json) >= _MEMBER_TUPLES_SIZE:
+                _member_json.clear()
+            text = _member_json[value] = '[' + ','.join(['{"name":' + encode_basestring_ascii(name) + '}'
+                                                         for name in value]) + ']'
+            return text
+    return json.dumps(value, separators=(',', ':'))
+
 
 class FgObject(ABC):
     """FgObject class represents basic methods and attributes used commonly across most, if not all, child class objects
@@ -23,6 +87,15 @@ class FgObject(ABC):
         is_global (bool): Set if the object should be configured from global context only
 """
 
+    # Name of the child class attribute that provides obj_id
+    _obj_id_attr = 'name'
+
+    # Child class attributes that reference other FG objects by name, mapped to the kind of object referenced
+    _ref_attrs = {}
+
+    # Kinds of object a child class can be referenced as, by its obj_id
+    _ref_kinds = ()
+
     def __init__(self, api: str = None, api_path: str = None, api_name: str = None,  cli_path = None,
                  obj_id = None, vdom: str = None):
         """
@@ -65,10 +138,190 @@ class FgObject(ABC):
 
     # Instance to string dunder methods
     def __str__(self):
+        # Objects created by from_trusted() build their string representation on first use
+        if self._obj_to_str is None:
+            self._obj_to_str = f'obj_id={self.obj_id}, vdom={self.vdom}'
+            for attr in self._get_trusted_fields():
+                if attr != 'vdom':
+                    self._obj_to_str += f', {attr}={getattr(self, attr)}'
+
         return self._obj_to_str
 
     def __repr__(self):
-        return self._obj_to_str
+        return self.__str__()
+
+    # Class Methods
+    @classmethod
+    def from_trusted(cls, **attrs):
+        """ Create an instance from already validated, normalized attribute values without running property setters
+
+        Use for data from a trusted source, such as a FortiGate's own configuration or a previously validated store,
+        where per-field validation is pure overhead.  Values are assigned as given, so they must already be in the
+        normalized form the property getters return (for example FgFwPolicy srcaddr as a get_member_tuple() tuple
+        ('addr1',) or FgIpsecP1Interface proposal as a space separated str).  Attributes not provided keep the defaults a
+        constructor call without arguments would set.  Call validate() to check the object later.
+
+        Args:
+            **attrs: constructor argument names mapped to their normalized values
+
+        Returns:
+            Class Instance
+        """
+        template, fields = cls._get_trusted_template()
+
+        obj = cls.__new__(cls)
+        obj_dict = obj.__dict__
+        obj_dict.update(template)
+
+        for attr, value in attrs.items():
+            try:
+                obj_dict[fields[attr]] = value
+            except KeyError:
+                raise ValueError(f"'{attr}' is not a settable attribute of {cls.__name__}")
+
+        if cls._obj_id_attr in attrs:
+            obj_dict['obj_id'] = attrs[cls._obj_id_attr]
+
+        return obj
+
+    def clone(self, **attrs):
+        """ Return a copy of this object with the given attributes set through their property setters
+
+        Only the attributes passed are validated; every other attribute keeps the already validated value of this
+        object.  Use when building many objects that differ in a few attributes from a prototype constructed once, such
+        as tunnels sharing proposal and dhgrp.  List values not passed in attrs are shared with this object, so replace
+        them rather than modifying them in place.
+
+        Args:
+            **attrs: constructor argument names mapped to new values
+
+        Returns:
+            Class Instance
+        """
+        cls = type(self)
+        fields = cls._get_trusted_template()[1]
+
+        obj = cls.__new__(cls)
+        obj_dict = obj.__dict__
+        obj_dict.update(self.__dict__)
+
+        for attr, value in attrs.items():
+            if attr not in fields:
+                raise ValueError(f"'{attr}' is not a settable attribute of {cls.__name__}")
+            setattr(obj, attr, value)
+
+        if cls._obj_id_attr in attrs:
+            obj_dict['obj_id'] = getattr(obj, cls._obj_id_attr)
+        obj_dict['_obj_to_str'] = None
+
+        return obj
+
+    @classmethod
+    def _get_trusted_template(cls):
+        """ Return cached (template __dict__, field map) used by from_trusted()
+
+        The template is the __dict__ of an instance constructed without arguments.  The field map links every attribute
+        that can be passed to from_trusted() to the key it is stored under in the instance __dict__; attributes with a
+        property setter are stored under '_<name>', plain public attributes (such as is_global) under their own name.
+
+        Returns:
+            Tuple
+        """
+        try:
+            return _trusted_templates[cls]
+        except KeyError:
+            pass
+
+        template = dict(vars(cls()))
+        template['_obj_to_str'] = None
+
+        fields = {}
+        for klass in reversed(cls.__mro__):
+            for attr, value in vars(klass).items():
+                if isinstance(value, property) and value.fset is not None:
+                    fields[attr] = f'_{attr}'
+        for attr in template:
+            if attr.islower() and not attr.startswith('_') and attr != 'obj_id':
+                fields[attr] = attr
+
+        _trusted_templates[cls] = (template, fields)
+        return _trusted_templates[cls]
+
+    @classmethod
+    def _get_trusted_fields(cls):
+        """ Return tuple of attribute names accepted by from_trusted()
+
+        Returns:
+            Tuple
+        """
+        return tuple(cls._get_trusted_template()[1])
+
+    @classmethod
+    def validate_records(cls, records, first_row: int = 0, workers: int = None, chunk_size: int = 10000):
+        """ Validate many records for this class in one pass, collecting every error instead of raising
+
+        See fgobjlib.fg_validate.validate_records()
+
+        Args:
+            records: iterable of dictionaries mapping constructor argument names to values (ex. decoded JSON records)
+            first_row (int): Row number reported for the first record (default: 0)
+            workers (int): Validate chunks in this many worker processes (default: None = in this process)
+            chunk_size (int): Records per chunk (default: 10000)
+
+        Returns:
+            FgValidationReport
+        """
+        from fgobjlib.fg_validate import validate_records
+
+        return validate_records(cls, records, first_row=first_row, workers=workers, chunk_size=chunk_size)
+
+    # Reference Methods
+    def get_refs(self):
+        """ Return list of references this object makes to other FG objects by name
+
+        References are taken from the attributes listed in the class' _ref_attrs, for example the srcaddr and dstaddr
+        members of an FgFwPolicy or the device of an FgRouteIPv4.
+
+        Args:
+            self: the current instance object
+
+        Returns:
+            List of (attribute, kind, name) tuples.
+
+            example:
+                [('srcintf', 'interface', 'port1'), ('srcaddr', 'address', 'addr1'), ('service', 'service', 'HTTP')]
+        """
+        refs = []
+        for attr, kind in self._ref_attrs.items():
+            value = getattr(self, attr)
+            if value is None:
+                continue
+
+            if isinstance(value, str):
+                refs.append((attr, kind, value))
+            else:
+                for item in value:
+                    refs.append((attr, kind, item['name'] if isinstance(item, dict) else item))
+        return refs
+
+    # Validation Methods
+    def validate(self):
+        """ Validate the current attribute values by running each through its property setter
+
+        Intended for objects created with from_trusted(), but may be run on any instance.  Setters re-normalize the
+        values they accept, so the object is left in the same state the constructor would have produced.  Instances
+        are picklable, so validation of large sets can be spread across a worker pool.
+
+        Args:
+            self: the current instance object
+
+        Returns:
+            None
+        """
+        cls = type(self)
+        for attr, storage in cls._get_trusted_template()[1].items():
+            if storage != attr:
+                setattr(self, attr, getattr(self, attr))
 
     # Property Methods
     @property
@@ -100,7 +353,7 @@ class FgObject(ABC):
 
                 # Check vdom name string length meets FG requirements
                 if 1 <= len(vdom) <= 31:
-                    self._vdom = vdom
+                    self._vdom = sys.intern(vdom)
                 else:
                     raise ValueError("'vdom', when set, must be a str between 1 and 31 chars")
             else:
@@ -145,7 +398,12 @@ class FgObject(ABC):
                 params.update({'vdom': self.vdom})
 
         for inst_attr, fg_attr in self._data_attrs.items():
-            if getattr(self, inst_attr): data.update({fg_attr: getattr(self, inst_attr)})
+            value = getattr(self, inst_attr)
+            if value:
+                # member tuples are expanded to the API's list of {'name': <name>} dicts
+                if isinstance(value, tuple):
+                    value = [{'name': name} for name in value]
+                data.update({fg_attr: value})
 
         # Add data and parameter dictionaries to conf dictionary
         conf.update({'data': data})
@@ -153,6 +411,48 @@ class FgObject(ABC):
 
         return conf
 
+    def get_api_data_bytes(self):
+        """ Get the data of get_api_config_add() as a UTF-8 JSON request body, without building the config dictionary
+
+        The body is the same bytes as json.dumps(self.get_api_config_add()['data'], separators=(',', ':')).encode(),
+        non-ASCII characters escaped as \\uXXXX, whether or not orjson is installed, so hashes of bodies agree between
+        hosts.  The '"<API key>":' fragments are built once per class, member tuples are encoded once each, and orjson
+        is used for encoding when it is installed.
+
+        Args:
+            self: the current instance object
+
+        Returns:
+            Bytes
+
+            example:
+                b'{"policyid":1,"srcintf":[{"name":"port1"}],"srcaddr":[{"name":"all"}],"action":"accept"}'
+        """
+        cls = type(self)
+        try:
+            fragments = _api_data_fragments[cls]
+        except KeyError:
+            fragments = _api_data_fragments[cls] = [(attr, fg_attr, encode_basestring_ascii(fg_attr) + ':')
+                                                    for attr, fg_attr in self._data_attrs.items()]
+
+        if orjson is not None:
+            data = {}
+            for attr, fg_attr, _ in fragments:
+                value = getattr(self, attr)
+                if value:
+                    data[fg_attr] = [{'name': name} for name in value] if type(value) is tuple else value
+            body = orjson.dumps(data)
+            # orjson writes non-ASCII as raw UTF-8; such bodies are encoded below to escape it as json.dumps() does
+            if body.isascii():
+                return body
+
+        parts = []
+        for attr, _, fragment in fragments:
+            value = getattr(self, attr)
+            if value:
+                parts.append(fragment + _encode_json(value))
+        return ('{' + ','.join(parts) + '}').encode()
+
     def get_api_config_update(self):
         """ Get FortiGate API configuration for updating(put) self to FortiGate via API using Fortinet's ftntlib library
 
@@ -271,13 +571,13 @@ class FgObject(ABC):
 
         conf = ''
 
-        # start vdom or global config
-        if self.vdom:
-            if self.vdom == 'global' and self.vdom_enabled:
+        # start vdom or global config; global objects need no context when vdoms are not enabled
+        if self.is_global or self.vdom == 'global':
+            if self.vdom_enabled:
                 conf += "config global\n"
-            else:
-                conf += "config vdom\n"
-                conf += f" edit {self.vdom} \n"
+        elif self.vdom:
+            conf += "config vdom\n"
+            conf += f" edit {self.vdom} \n"
 
         # Config object's cli path
         conf += f"{self.CLI_PATH}\n"
@@ -295,8 +595,12 @@ class FgObject(ABC):
             # get the value of an attribute based on the text name of the attribute in data_attrs dictionary
             config_attr = getattr(self, inst_attr)
 
+            # member tuples are output as space separated names
+            if isinstance(config_attr, tuple):
+                conf += f"    set {fg_attr} {' '.join(config_attr)}\n"
+
             # need to convert lists which are used for api, to strings for cli output
-            if isinstance(config_attr, list):
+            elif isinstance(config_attr, list):
                 str_items = ''
 
                 # if the config item is a list, then get the dictionaries from that list, pull the value and assign
@@ -316,13 +620,11 @@ class FgObject(ABC):
         conf += "  end\n"
 
         # End vdom or global config
-        if self.vdom:
-            if self.vdom == 'global' and self.vdom_enabled:
-                conf += "end\n"
-            elif self.vdom == 'global':
-                pass
-            else:
+        if self.is_global or self.vdom == 'global':
+            if self.vdom_enabled:
                 conf += "end\n"
+        elif self.vdom:
+            conf += "end\n"
 
         return conf
 
@@ -356,26 +658,24 @@ class FgObject(ABC):
         conf = ''
         if self.obj_id:
 
-            # start vdom or global config
-            if self.vdom:
-                if self.vdom == 'global' and self.vdom_enabled:
+            # start vdom or global config; global objects need no context when vdoms are not enabled
+            if self.is_global or self.vdom == 'global':
+                if self.vdom_enabled:
                     conf += "config global\n"
-                else:
-                    conf += "config vdom\n"
-                    conf += f" edit {self.vdom} \n"
+            elif self.vdom:
+                conf += "config vdom\n"
+                conf += f" edit {self.vdom} \n"
 
             conf += f"{self.CLI_PATH}\n"
             conf += f"  delete {self.obj_id}\n"
             conf += "end\n"
 
             # End vdom or global config
-            if self.vdom:
-                if self.vdom == 'global' and self.vdom_enabled:
-                    conf += "end\n"
-                elif self.vdom == 'global':
-                    pass
-                else:
+            if self.is_global or self.vdom == 'global':
+                if self.vdom_enabled:
                     conf += "end\n"
+            elif self.vdom:
+                conf += "end\n"
 
             return conf
         else:
@@ -0,0 +1,186 @@
+from bisect import bisect_left, bisect_right
+
+
+class FgRangeSet:
+    """ FgRangeSet holds a set of free integers as sorted, non-overlapping, non-adjacent inclusive ranges
+
+    Memory is proportional to the number of ranges, not to the number of integers, so a pool of millions of ids or
+    addresses allocated in order stays a handful of ranges.  Ranges are kept in two parallel sorted lists of first and
+    last values and located by bisection.
+
+    allocate() hands out the lowest free block of the requested size and alignment.  The start of the search is
+    remembered per (size, align), as blocks below the last one handed out cannot fit until a range is added back
+    below it, so repeated allocation of the same block size does not rescan fragments left by other sizes.
+
+        free = FgRangeSet(1, 4294967295)
+        free.remove(1, 100)         # reserve ids in use
+        policyid = free.allocate()  # 101
+        free.add(policyid)          # release it again
+    """
+
+    def __init__(self, first: int = None, last: int = None):
+        """
+        Args:
+            first (int): first value of an initial free range (default: None = empty set)
+            last (int): last value of the initial free range (default: first)
+        """
+        self._firsts = []
+        self._lasts = []
+        # (size, align) -> lowest value a block of that size may be found from
+        self._hints = {}
+
+        if first is not None:
+            self.add(first, last)
+
+    def __len__(self):
+        return len(self._firsts)
+
+    def __iter__(self):
+        return iter(list(zip(self._firsts, self._lasts)))
+
+    def __contains__(self, value):
+        return self.is_free(value)
+
+    def __repr__(self):
+        return f'FgRangeSet({list(self)})'
+
+    def get_free_count(self):
+        """ Return number of free integers
+
+        Returns:
+            Integer
+        """
+        return sum(self._lasts) - sum(self._firsts) + len(self._firsts)
+
+    def is_free(self, first: int, last: int = None):
+        """ Return True if every integer from first to last is free
+
+        Args:
+            first (int): first value
+            last (int): last value (default: first)
+
+        Returns:
+            Bool
+        """
+        last = first if last is None else last
+        index = bisect_right(self._firsts, first) - 1
+        return index >= 0 and self._lasts[index] >= last
+
+    def add(self, first: int, last: int = None):
+        """ Mark every integer from first to last as free, merging with neighbouring free ranges
+
+        Args:
+            first (int): first value
+            last (int): last value (default: first)
+
+        Returns:
+            None
+        """
+        last = first if last is None else last
+        if last < first:
+            raise ValueError(f"'last' ({last}) must not be less than 'first' ({first})")
+
+        firsts, lasts = self._firsts, self._lasts
+        start = bisect_left(lasts, first - 1)
+        stop = bisect_right(firsts, last + 1)
+        if start < stop:
+            first = min(first, firsts[start])
+            last = max(last, lasts[stop - 1])
+        firsts[start:stop] = [first]
+        lasts[start:stop] = [last]
+
+        for key, hint in self._hints.items():
+            if hint > first:
+                self._hints[key] = first
+
+    def remove(self, first: int, last: int = None):
+        """ Mark every integer from first to last as in use; integers that are not free are ignored
+
+        Args:
+            first (int): first value
+            last (int): last value (default: first)
+
+        Returns:
+            None
+        """
+        last = first if last is None else last
+        firsts, lasts = self._firsts, self._lasts
+        start = bisect_left(lasts, first)
+        stop = bisect_right(firsts, last)
+        if start >= stop:
+            return
+
+        keep_firsts, keep_lasts = [], []
+        if firsts[start] < first:
+            keep_firsts.append(firsts[start])
+            keep_lasts.append(first - 1)
+        if lasts[stop - 1] > last:
+            keep_firsts.append(last + 1)
+            keep_lasts.append(lasts[stop - 1])
+        firsts[start:stop] = keep_firsts
+        lasts[start:stop] = keep_lasts
+
+    def allocate(self, size: int = 1, align: int = 1):
+        """ Remove and return the first value of the lowest free block of size integers starting at a multiple of align
+
+        Args:
+            size (int): number of consecutive integers (default: 1)
+            align (int): the block starts at a multiple of align (default: 1)
+
+        Returns:
+            Integer
+        """
+        key = (size, align)
+        firsts, lasts = self._firsts, self._lasts
+        index = bisect_left(lasts, self._hints.get(key, 0))
+
+        for index in range(index, len(firsts)):
+            start = firsts[index]
+            if align > 1:
+                start = -(-start // align) * align
+            if start + size - 1 <= lasts[index]:
+                self.remove(start, start + size - 1)
+                self._hints[key] = start
+                return start
+
+        self._hints[key] = lasts[-1] + 1 if lasts else 0
+        raise ValueError(f'no free block of {size} aligned to {align}')
+
+    def allocate_many(self, count: int, size: int = 1, align: int = 1):
+        """ Allocate count blocks as allocate() does and return list of their first values
+
+        Where size is a multiple of align, consecutive blocks of a free range are taken in one step.  If fewer than
+        count blocks are free, none are taken and ValueError is raised.
+
+        Args:
+            count (int): number of blocks
+            size (int): number of consecutive integers per block (default: 1)
+            align (int): each block starts at a multiple of align (default: 1)
+
+        Returns:
+            List
+        """
+        starts = []
+        try:
+            while len(starts) < count:
+                start = self.allocate(size, align)
+                starts.append(start)
+                if size % align == 0:
+                    self._allocate_following(starts, count, size, align)
+        except ValueError:
+            # not enough free blocks: release the ones taken so the set is unchanged
+            for start in starts:
+                self.add(start, start + size - 1)
+            raise ValueError(f'fewer than {count} free blocks of {size} aligned to {align}')
+        return starts
+
+    def _allocate_following(self, starts, count, size, align):
+        """ Append to starts the blocks following starts[-1] in the same free range, up to count blocks in total """
+        first = starts[-1] + size
+        index = bisect_left(self._firsts, first)
+        if index < len(self._firsts) and self._firsts[index] == first:
+            blocks = min(count - len(starts), (self._lasts[index] - first + 1) // size)
+            if blocks:
+                self.remove(first, first + blocks * size - 1)
+                starts.extend(range(first, first + blocks * size, size))
+                self._hints[(size, align)] = starts[-1]
@@ -0,0 +1,271 @@
+from collections import deque
+
+
+class FgRefIndex:
+    """ FgRefIndex maintains an inverted index of which objects reference which, across all FgObject classes
+
+    Objects are indexed by what they can be referenced as (their class' _ref_kinds, by obj_id) and by the references
+    they make (FgObject.get_refs()), so "who uses address X" or "what does this policy use" are dictionary lookups
+    instead of scans.  References resolve within a vdom: a policy in vdom 'root' referencing 'addr1' uses the
+    'address' kind object 'addr1' in vdom 'root'.
+
+    The index is updated incrementally.  Objects are identified by (class, vdom, obj_id); adding an object with the
+    same identity as an indexed one replaces it.  After changing attributes of an indexed object call update(obj) so
+    its references are re-read.
+
+        index = FgRefIndex(addresses + groups + policies + routes + interfaces)
+        users = index.get_users(address)
+        for obj in index.get_delete_order([address], cascade=True):
+            print(obj.get_cli_config_del())
+    """
+
+    def __init__(self, objs=None):
+        """
+        Args:
+            objs: optional iterable of FgObject instances to index
+        """
+        # (class, vdom, obj_id) -> object
+        self._objects = {}
+        # (class, vdom, obj_id) -> tuple of (attr, kind, name) references as last indexed
+        self._refs = {}
+        # (kind, vdom, name) -> {(class, vdom, obj_id) of objects referencing it: None}
+        self._users = {}
+        # (kind, vdom, name) -> {(class, vdom, obj_id) of objects it names: None}
+        self._providers = {}
+
+        if objs is not None:
+            self.add_many(objs)
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __contains__(self, obj):
+        return self._get_key(obj) in self._objects
+
+    def __iter__(self):
+        return iter(list(self._objects.values()))
+
+    @staticmethod
+    def _get_key(obj):
+        return type(obj), obj.vdom, obj.obj_id
+
+    # Update Methods
+    def add(self, obj):
+        """ Index obj, replacing an indexed object of the same class, vdom and obj_id
+
+        Args:
+            obj: FgObject instance
+
+        Returns:
+            None
+        """
+        key = self._get_key(obj)
+        if key in self._objects:
+            self._unlink(key)
+
+        self._objects[key] = obj
+        for kind in obj._ref_kinds:
+            self._providers.setdefault((kind, obj.vdom, obj.obj_id), {})[key] = None
+        self._link(key, obj)
+
+    def add_many(self, objs):
+        """ Index every object of objs
+
+        Args:
+            objs: iterable of FgObject instances
+
+        Returns:
+            None
+        """
+        for obj in objs:
+            self.add(obj)
+
+    def update(self, obj):
+        """ Re-read the references of an indexed object after its attributes were changed
+
+        Args:
+            obj: indexed FgObject instance
+
+        Returns:
+            None
+        """
+        key = self._get_key(obj)
+        if key not in self._objects:
+            raise ValueError(f"{obj.__class__.__name__} '{obj.obj_id}' is not indexed, use add()")
+
+        refs = tuple(obj.get_refs())
+        if refs != self._refs[key]:
+            self._unlink_refs(key)
+            self._link(key, obj, refs)
+
+    def remove(self, obj):
+        """ Remove obj from the index
+
+        Args:
+            obj: indexed FgObject instance
+
+        Returns:
+            None
+        """
+        key = self._get_key(obj)
+        if key not in self._objects:
+            raise ValueError(f"{obj.__class__.__name__} '{obj.obj_id}' is not indexed")
+        self._unlink(key)
+
+    def _link(self, key, obj, refs=None):
+        refs = tuple(obj.get_refs()) if refs is None else refs
+        self._refs[key] = refs
+        vdom = key[1]
+        for _, kind, name in refs:
+            self._users.setdefault((kind, vdom, name), {})[key] = None
+
+    def _unlink_refs(self, key):
+        vdom = key[1]
+        for _, kind, name in self._refs.pop(key):
+            users = self._users.get((kind, vdom, name))
+            if users is not None:
+                users.pop(key, None)
+                if not users:
+                    del self._users[(kind, vdom, name)]
+
+    def _unlink(self, key):
+        obj = self._objects.pop(key)
+        for kind in obj._ref_kinds:
+            target = (kind, key[1], key[2])
+            providers = self._providers.get(target)
+            if providers is not None:
+                providers.pop(key, None)
+                if not providers:
+                    del self._providers[target]
+        self._unlink_refs(key)
+
+    # Query Methods
+    def get_users_of(self, kind: str, name: str, vdom: str = None):
+        """ Return list of indexed objects that reference the object of kind 'kind' called name in vdom
+
+        Args:
+            kind (str): Kind of reference, such as 'address', 'interface', 'service' or 'phase1'
+            name (str): Name of the referenced object
+            vdom (str): vdom of the referencing objects (default: None)
+
+        Returns:
+            List
+        """
+        return [self._objects[key] for key in self._users.get((kind, vdom, name), ())]
+
+    def get_users(self, obj):
+        """ Return list of indexed objects that reference obj, under any of the kinds obj is referenced as
+
+        Args:
+            obj: FgObject instance, need not be indexed itself
+
+        Returns:
+            List
+        """
+        keys = {}
+        for kind in obj._ref_kinds:
+            keys.update(self._users.get((kind, obj.vdom, obj.obj_id), {}))
+        return [self._objects[key] for key in keys]
+
+    def is_used(self, obj):
+        """ Return True if any indexed object references obj
+
+        Args:
+            obj: FgObject instance
+
+        Returns:
+            Bool
+        """
+        return any((kind, obj.vdom, obj.obj_id) in self._users for kind in obj._ref_kinds)
+
+    def get_dependencies(self, obj):
+        """ Return list of indexed objects that obj references
+
+        Args:
+            obj: FgObject instance, need not be indexed itself
+
+        Returns:
+            List
+        """
+        key = self._get_key(obj)
+        refs = self._refs[key] if key in self._refs else obj.get_refs()
+
+        keys = {}
+        for _, kind, name in refs:
+            keys.update(self._providers.get((kind, obj.vdom, name), {}))
+        keys.pop(key, None)
+        return [self._objects[provider] for provider in keys]
+
+    def get_missing(self):
+        """ Return list of references to names no indexed object provides
+
+        Built-in objects such as address 'all', interface 'any' or service 'ALL' are reported as well unless objects for
+        them were indexed.
+
+        Returns:
+            List of (referencing object, attribute, kind, name) tuples
+        """
+        missing = []
+        for key, refs in self._refs.items():
+            for attr, kind, name in refs:
+                if (kind, key[1], name) not in self._providers:
+                    missing.append((self._objects[key], attr, kind, name))
+        return missing
+
+    def get_delete_order(self, objs, cascade: bool = False):
+        """ Return objs ordered so that every object is deleted after all indexed objects that reference it
+
+        Args:
+            objs: iterable of FgObject instances to delete
+            cascade (bool): Also delete, first, every indexed object that references an object being deleted, directly
+                or indirectly.  If False, such references raise ValueError.  (default: False)
+
+        Returns:
+            List of objects in safe delete order
+        """
+        pending = {}
+        for obj in objs:
+            pending[self._get_key(obj)] = obj
+
+        # Collect users of each object being deleted, adding them to the deletion if cascading
+        users_of = {}
+        queue = list(pending)
+        while queue:
+            key = queue.pop()
+            obj = pending[key]
+            users = {}
+            for kind in obj._ref_kinds:
+                users.update(self._users.get((kind, key[1], key[2]), {}))
+            users.pop(key, None)
+
+            for user in users:
+                if user not in pending:
+                    if not cascade:
+                        user_obj = self._objects[user]
+                        raise ValueError(f"{obj.__class__.__name__} '{obj.obj_id}' is referenced by "
+                                         f"{user_obj.__class__.__name__} '{user_obj.obj_id}', which is not deleted")
+                    pending[user] = self._objects[user]
+                    queue.append(user)
+            users_of[key] = users
+
+        # Kahn's algorithm: an object can go once all of its users have gone
+        remaining = {key: len(users) for key, users in users_of.items()}
+        used_by = {}
+        for key, users in users_of.items():
+            for user in users:
+                used_by.setdefault(user, []).append(key)
+
+        ready = deque(key for key in pending if remaining[key] == 0)
+        order = []
+        while ready:
+            key = ready.popleft()
+            order.append(pending[key])
+            for used in used_by.get(key, ()):
+                remaining[used] -= 1
+                if remaining[used] == 0:
+                    ready.append(used)
+
+        if len(order) != len(pending):
+            cycle = [pending[key].obj_id for key, count in remaining.items() if count]
+            raise ValueError(f"reference cycle between objects {cycle}")
+        return order
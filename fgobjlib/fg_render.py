@@ -0,0 +1,443 @@
+import hashlib
+import json
+import os
+
+# Config methods that may be rendered in bulk
+RENDER_METHODS = ('get_api_config_add', 'get_api_config_update', 'get_api_config_del', 'get_api_config_get',
+                  'get_api_data_bytes', 'get_cli_config_add', 'get_cli_config_update', 'get_cli_config_del')
+
+
+def get_partition_key(obj):
+    """ Return the (vdom, CLI_PATH) partition an object is rendered in
+
+    Args:
+        obj: FgObject instance
+
+    Returns:
+        Tuple
+    """
+    return obj.vdom, obj.CLI_PATH
+
+
+def partition(objs):
+    """ Group objects by (vdom, CLI_PATH)
+
+    Partitions are ordered by the first object seen for each, and objects keep their relative order within a partition,
+    so the same input always gives the same output order.
+
+    Args:
+        objs: iterable of FgObject instances
+
+    Returns:
+        Dictionary of (vdom, CLI_PATH) to list of objects
+    """
+    partitions = {}
+    for obj in objs:
+        key = get_partition_key(obj)
+        try:
+            partitions[key].append(obj)
+        except KeyError:
+            partitions[key] = [obj]
+    return partitions
+
+
+# Shard of objects configured from global context
+GLOBAL_SHARD = 'global'
+
+
+def get_shard_key(obj):
+    """ Return the shard an object is rendered in: its vdom, or GLOBAL_SHARD for is_global objects and objects in the
+    global vdom or without vdom
+
+    Args:
+        obj: FgObject instance
+
+    Returns:
+        String
+    """
+    if obj.is_global or not obj.vdom:
+        return GLOBAL_SHARD
+    return obj.vdom
+
+
+def shard(objs):
+    """ Group objects by shard, the global shard first then vdoms in order of first appearance
+
+    Within a shard objects are in partition() order, so a shard holds the same text render_text() would give for it.
+
+    Args:
+        objs: iterable of FgObject instances
+
+    Returns:
+        Dictionary of shard name to list of objects
+    """
+    shards = {GLOBAL_SHARD: []}
+    for objs_part in partition(objs).values():
+        for obj in objs_part:
+            key = get_shard_key(obj)
+            try:
+                shards[key].append(obj)
+            except KeyError:
+                shards[key] = [obj]
+
+    if not shards[GLOBAL_SHARD]:
+        del shards[GLOBAL_SHARD]
+    return shards
+
+
+def _write_text(path, text):
+    """ Write text to path through a temporary file and return (size in bytes, sha256 hex digest) """
+    data = text.encode()
+    with open(f'{path}.tmp', 'wb') as fp:
+        fp.write(data)
+    os.replace(f'{path}.tmp', path)
+    return len(data), hashlib.sha256(data).hexdigest()
+
+
+def _to_compact(obj):
+    """ Return picklable (class, obj_id, API_MKEY, field values) for obj
+
+    Only the values of the attributes accepted by from_trusted() are sent, in the class' field order, instead of the
+    full instance __dict__ with its per-instance _data_attrs and _cli_ignore_attrs dictionaries.
+    """
+    cls = type(obj)
+    obj_dict = obj.__dict__
+    values = tuple([obj_dict[storage] for storage in cls._get_trusted_template()[1].values()])
+    return cls, obj.obj_id, obj.API_MKEY, values
+
+
+def _from_compact(row):
+    """ Rebuild an object from the output of _to_compact() """
+    cls, obj_id, api_mkey, values = row
+    template, fields = cls._get_trusted_template()
+
+    obj = cls.__new__(cls)
+    obj_dict = obj.__dict__
+    obj_dict.update(template)
+    obj_dict.update(zip(fields.values(), values))
+    obj_dict['obj_id'] = obj_id
+    obj_dict['API_MKEY'] = api_mkey
+    return obj
+
+
+# Objects shared with worker processes started by fork, set by _set_shared_objs() in each worker
+_shared_objs = None
+
+
+def _set_shared_objs(objs):
+    global _shared_objs
+    _shared_objs = objs
+
+
+def _render_range(method, start, stop, join):
+    """ Render _shared_objs[start:stop] in a forked worker process and return list of outputs or the joined text """
+    outputs = [getattr(obj, method)() for obj in _shared_objs[start:stop]]
+    return ''.join(outputs) if join else outputs
+
+
+def _render_chunk(method, rows, join):
+    """ Render a chunk of compact objects in a worker process and return list of outputs or the joined text """
+    outputs = [getattr(_from_compact(row), method)() for row in rows]
+    return ''.join(outputs) if join else outputs
+
+
+def _write_range(method, start, stop, path):
+    """ Render _shared_objs[start:stop] in a forked worker process, write the text to path and return (size, sha256) """
+    return _write_text(path, ''.join([getattr(obj, method)() for obj in _shared_objs[start:stop]]))
+
+
+def _write_chunk(method, rows, path):
+    """ Render compact objects in a worker process, write the text to path and return (size, sha256) """
+    return _write_text(path, ''.join([getattr(_from_compact(row), method)() for row in rows]))
+
+
+def _get_fork_context():
+    """ Return the multiprocessing 'fork' context where fork is available and safe, else None """
+    import multiprocessing
+    import sys
+
+    # macOS system frameworks are not fork safe, Windows has no fork
+    if sys.platform == 'darwin' or 'fork' not in multiprocessing.get_all_start_methods():
+        return None
+    return multiprocessing.get_context('fork')
+
+
+class FgRenderPool:
+    """ FgRenderPool renders config for large object collections across a pool of worker processes
+
+    Objects are partitioned by (vdom, CLI_PATH), split into chunks of chunk_size and rendered by worker processes.
+    Results are merged back in partition order, so output is deterministic and identical to rendering the partitions
+    one after the other in the current process.
+
+    Where the operating system supports fork (Linux, BSD) the workers are forked per render() call and inherit the
+    objects, so only chunk boundaries and rendered output cross process boundaries.  Elsewhere each chunk is sent to the
+    workers in a compact picklable form holding just the from_trusted() field values of each object.  Either way
+    worker processes render copies, so side effects of a config method (get_api_config_update() setting API_MKEY) are
+    not seen on the original objects.
+
+    Collections no larger than chunk_size, or a pool with workers=1, are rendered in the current process.  These render
+    the original objects, so side effects of the config method are seen on them, as when calling it on each object.
+    With a cache set, lookups apply the side effects of get_api_config_update() to the originals as well.
+
+    With an FgRenderCache set, objects unchanged since they were last rendered are answered from the cache and only the
+    remaining objects are rendered, then stored in the cache for the next call.
+
+    Attributes:
+        workers (int): Number of worker processes, 1 renders in the current process
+        chunk_size (int): Objects rendered per worker task
+        cache (FgRenderCache): Cache of rendered output reused across calls, or None
+    """
+
+    def __init__(self, workers: int = None, chunk_size: int = 2000, cache=None):
+        """
+        Args:
+            workers (int): Number of worker processes (default: None = os.cpu_count())
+            chunk_size (int): Objects rendered per worker task (default: 2000)
+            cache (FgRenderCache): Reuse and store rendered output in this cache (default: None)
+        """
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.cache = cache
+
+    # Property Methods
+    @property
+    def workers(self):
+        return self._workers
+
+    @workers.setter
+    def workers(self, workers):
+        """ Set self.workers to workers, or to the number of CPUs if workers is None
+
+        Args:
+            workers (int): Number of worker processes
+
+        Returns:
+            None
+        """
+        if workers is None:
+            self._workers = os.cpu_count() or 1
+        elif isinstance(workers, int) and workers >= 1:
+            self._workers = workers
+        else:
+            raise ValueError("'workers', when set, must be type int() >= 1")
+
+    @property
+    def chunk_size(self):
+        return self._chunk_size
+
+    @chunk_size.setter
+    def chunk_size(self, chunk_size):
+        """ Set self.chunk_size to chunk_size
+
+        Args:
+            chunk_size (int): Objects rendered per worker task
+
+        Returns:
+            None
+        """
+        if isinstance(chunk_size, int) and chunk_size >= 1:
+            self._chunk_size = chunk_size
+        else:
+            raise ValueError("'chunk_size' must be type int() >= 1")
+
+    # Render Methods
+    def render(self, objs, method: str = 'get_cli_config_add'):
+        """ Render every object with config method 'method' and return the outputs in partition order
+
+        Args:
+            objs: iterable of FgObject instances
+            method (str): Config method to call on each object (default: 'get_cli_config_add')
+
+        Returns:
+            List of method outputs, objects grouped by (vdom, CLI_PATH) in order of first appearance
+        """
+        if method not in RENDER_METHODS:
+            raise ValueError(f"'method' must be one of {', '.join(RENDER_METHODS)}")
+
+        outputs = []
+        for chunk_output in self._render_chunks(objs, method, join=False):
+            outputs.extend(chunk_output)
+        return outputs
+
+    def render_text(self, objs, method: str = 'get_cli_config_add'):
+        """ Render every object with a CLI config method and return the config text in partition order
+
+        Args:
+            objs: iterable of FgObject instances
+            method (str): CLI config method to call on each object (default: 'get_cli_config_add')
+
+        Returns:
+            String
+        """
+        if method not in RENDER_METHODS or not method.startswith('get_cli_'):
+            raise ValueError("'method' must be a get_cli_config_* method")
+
+        # workers join their chunk so a single string per chunk is sent back
+        return ''.join(self._render_chunks(objs, method, join=True))
+
+    def render_bytes(self, objs, method: str = 'get_api_data_bytes'):
+        """ Render every object with a bytes config method and return views of the outputs in partition order
+
+        Outputs are joined into one bytes buffer and a memoryview of each object's slice of the buffer is returned, so
+        bodies can be sent without a copy per object.  The buffer is kept alive by its views; bytes(view) copies a body
+        out.
+
+        Args:
+            objs: iterable of FgObject instances
+            method (str): Bytes config method to call on each object (default: 'get_api_data_bytes')
+
+        Returns:
+            List of memoryview
+        """
+        if method != 'get_api_data_bytes':
+            raise ValueError("'method' must be 'get_api_data_bytes'")
+
+        outputs = []
+        for chunk_output in self._render_chunks(objs, method, join=False):
+            outputs.extend(chunk_output)
+
+        buffer = memoryview(b''.join(outputs))
+        views = []
+        start = 0
+        for output in outputs:
+            stop = start + len(output)
+            views.append(buffer[start:stop])
+            start = stop
+        return views
+
+    def write_shards(self, objs, directory: str, method: str = 'get_cli_config_add', manifest: str = 'manifest.json'):
+        """ Render every object with a CLI config method into one file per shard and write a manifest of the files
+
+        Objects are sharded by shard(): one shard per vdom, plus the 'global' shard for is_global objects and objects in
+        the global vdom or without vdom.  Each shard is written to '<shard>.conf' in directory, holding the text
+        render_text() gives for the shard's objects, so shards may be pushed to their vdoms independently.  Shards are
+        rendered and written concurrently by the worker processes, largest first, and only each file's size and hash
+        are sent back.  With a cache set, shards are rendered one after the other through the cache instead.
+
+        Every file is written under a temporary name and renamed when complete, and the manifest is written last:
+            {'method': 'get_cli_config_add',
+             'shards': [{'shard': 'global', 'file': 'global.conf', 'objects': 12, 'bytes': 2210, 'sha256': '...'},
+                        {'shard': 'cust1', 'file': 'cust1.conf', 'objects': 840, 'bytes': 151040, 'sha256': '...'}]}
+
+        Args:
+            objs: iterable of FgObject instances
+            directory (str): Directory the shard files and manifest are written to, created if missing
+            method (str): CLI config method to call on each object (default: 'get_cli_config_add')
+            manifest (str): File name of the manifest in directory (default: 'manifest.json')
+
+        Returns:
+            Dictionary, the manifest
+        """
+        if method not in RENDER_METHODS or not method.startswith('get_cli_'):
+            raise ValueError("'method' must be a get_cli_config_* method")
+
+        shards = shard(objs)
+        for name in shards:
+            if name.startswith('.') or os.sep in name or (os.altsep and os.altsep in name):
+                raise ValueError(f"vdom '{name}' can not be used as a shard file name")
+        os.makedirs(directory, exist_ok=True)
+
+        entries = [{'shard': name, 'file': f'{name}.conf', 'objects': len(objs_shard)}
+                   for name, objs_shard in shards.items()]
+        paths = [os.path.join(directory, entry['file']) for entry in entries]
+        results = self._write_shards(list(shards.values()), paths, method)
+        for entry, (size, digest) in zip(entries, results):
+            entry['bytes'] = size
+            entry['sha256'] = digest
+
+        manifest_data = {'method': method, 'shards': entries}
+        _write_text(os.path.join(directory, manifest), json.dumps(manifest_data, indent=2))
+        return manifest_data
+
+    def _write_shards(self, shards, paths, method):
+        """ Render each list of objects in shards into the path at the same position, return list of (size, sha256) """
+        if self.cache is not None:
+            return [_write_text(path, self.render_text(objs_shard, method)) for objs_shard, path in zip(shards, paths)]
+        if self._workers == 1 or len(shards) == 1 or sum(map(len, shards)) <= self._chunk_size:
+            return [_write_text(path, ''.join([getattr(obj, method)() for obj in objs_shard]))
+                    for objs_shard, path in zip(shards, paths)]
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        ordered = [obj for objs_shard in shards for obj in objs_shard]
+        fork_context = _get_fork_context()
+        if fork_context is not None:
+            executor = ProcessPoolExecutor(max_workers=self._workers, mp_context=fork_context,
+                                           initializer=_set_shared_objs, initargs=(ordered,))
+        else:
+            executor = ProcessPoolExecutor(max_workers=self._workers)
+
+        # largest shards first, so a large vdom does not start last and keep one worker busy alone
+        starts = [0]
+        for objs_shard in shards:
+            starts.append(starts[-1] + len(objs_shard))
+        with executor:
+            futures = {}
+            for pos in sorted(range(len(shards)), key=lambda pos: -len(shards[pos])):
+                if fork_context is not None:
+                    futures[pos] = executor.submit(_write_range, method, starts[pos], starts[pos + 1], paths[pos])
+                else:
+                    futures[pos] = executor.submit(_write_chunk, method, [_to_compact(obj) for obj in shards[pos]],
+                                                   paths[pos])
+            return [futures[pos].result() for pos in range(len(shards))]
+
+    def _render_chunks(self, objs, method, join):
+        """ Yield the output of each chunk of the partitioned objects, in order """
+        ordered = [obj for objs_part in partition(objs).values() for obj in objs_part]
+        if self.cache is None:
+            yield from self._render_ordered(ordered, method, join)
+            return
+
+        # Answer unchanged objects from the cache, render the rest and merge them back in place
+        outputs = [None] * len(ordered)
+        missed = []
+        for pos, obj in enumerate(ordered):
+            output, identity, key = self.cache.lookup(obj, method)
+            if identity is None:
+                outputs[pos] = output
+            else:
+                missed.append((pos, identity, key))
+
+        if missed:
+            rendered = []
+            for chunk_output in self._render_ordered([ordered[pos] for pos, _, _ in missed], method, join=False):
+                rendered.extend(chunk_output)
+            for (pos, identity, key), output in zip(missed, rendered):
+                self.cache.store(identity, key, method, output)
+                outputs[pos] = output
+
+        yield ''.join(outputs) if join else outputs
+
+    def _render_ordered(self, ordered, method, join):
+        """ Yield the output of each chunk of the already ordered list of objects """
+        chunk_size = self._chunk_size
+
+        if self._workers == 1 or len(ordered) <= chunk_size:
+            outputs = [getattr(obj, method)() for obj in ordered]
+            yield ''.join(outputs) if join else outputs
+            return
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        fork_context = _get_fork_context()
+        if fork_context is not None:
+            executor = ProcessPoolExecutor(max_workers=self._workers, mp_context=fork_context,
+                                           initializer=_set_shared_objs, initargs=(ordered,))
+            tasks = ((_render_range, method, start, start + chunk_size, join)
+                     for start in range(0, len(ordered), chunk_size))
+        else:
+            executor = ProcessPoolExecutor(max_workers=self._workers)
+            tasks = ((_render_chunk, method, [_to_compact(obj) for obj in ordered[start:start + chunk_size]], join)
+                     for start in range(0, len(ordered), chunk_size))
+
+        with executor:
+            pending = []
+            for task in tasks:
+                pending.append(executor.submit(*task))
+
+                # bound the number of chunks in flight so memory stays flat for very large collections
+                if len(pending) >= self._workers * 2:
+                    yield pending.pop(0).result()
+
+            for future in pending:
+                yield future.result()
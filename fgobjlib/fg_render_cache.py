@@ -0,0 +1,198 @@
+from operator import itemgetter
+
+from fgobjlib.fg_render import RENDER_METHODS
+
+
+# Per-class getter returning the content key of an instance __dict__, see get_content_key()
+_content_getters = {}
+
+
+def get_content_key(obj):
+    """ Return a tuple holding everything an object's config output depends on
+
+    Two objects of the same class with equal content keys render identical config.  The key is made of obj_id,
+    API_MKEY, CLI_PATH and the stored value of every attribute accepted by from_trusted(), in the class' field order.
+    List and dictionary values are held by reference, not copied: setters always store new values, so a key only
+    goes stale if such a value is modified in place.  Member tuples (get_member_tuple()) are immutable and shared, so
+    comparing equal member sets is an identity check.
+
+    Args:
+        obj: FgObject instance
+
+    Returns:
+        Tuple
+    """
+    cls = type(obj)
+    try:
+        getter = _content_getters[cls]
+    except KeyError:
+        getter = _content_getters[cls] = itemgetter('obj_id', 'API_MKEY', 'CLI_PATH',
+                                                    *cls._get_trusted_template()[1].values())
+    return getter(obj.__dict__)
+
+
+def _copy_output(output):
+    """ Return output, copying the outer dictionaries of API config so callers may modify what they get back """
+    if isinstance(output, dict):
+        output = dict(output)
+        for key in ('data', 'parameters'):
+            if key in output:
+                output[key] = dict(output[key])
+    return output
+
+
+class FgRenderCache:
+    """ FgRenderCache keeps the rendered config of objects so unchanged objects are not rendered again
+
+    Entries are held per config method and per object identity (class, vdom, obj_id), together with the content key
+    of the object when it was rendered (see get_content_key()).  A lookup is a hit only if the object's current
+    content key equals the stored one, so changing any attribute through its setter invalidates the object's entries
+    and the next lookup renders and replaces them.  Because identity is not id(obj), objects rebuilt from the same
+    source for every run still hit the entries of the previous run.  List or dictionary values changed in place bypass
+    the setters; assign the attribute again or discard() the object instead.
+
+    Side effects of config methods are preserved on hits: get_api_config_update() still sets API_MKEY to obj_id.
+
+        cache = FgRenderCache()
+        pool = FgRenderPool(cache=cache)
+        text = pool.render_text(objs)
+        print(cache.hit_rate)
+
+    Attributes:
+        hits (int): Lookups answered from the cache
+        misses (int): Lookups that had to render, including invalidations
+        invalidations (int): Misses where a stale entry for the object was replaced
+    """
+
+    def __init__(self):
+        # method -> {(class, vdom, obj_id): (content key, output)}
+        self._entries = {method: {} for method in RENDER_METHODS}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._entries.values())
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get_stats(self):
+        """ Return dictionary of cache statistics
+
+        Returns:
+            Dictionary
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'invalidations': self.invalidations,
+                'hit_rate': self.hit_rate, 'entries': len(self)}
+
+    def reset_stats(self):
+        """ Reset hit, miss and invalidation counters, keeping the cached entries
+
+        Returns:
+            None
+        """
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    # Lookup Methods
+    def render(self, obj, method: str = 'get_cli_config_add'):
+        """ Return the output of obj's config method 'method', rendering only if obj changed since it was cached
+
+        Args:
+            obj: FgObject instance
+            method (str): Config method to call (default: 'get_cli_config_add')
+
+        Returns:
+            Method output
+        """
+        output, identity, key = self.lookup(obj, method)
+        if identity is None:
+            return output
+
+        output = getattr(obj, method)()
+        self.store(identity, key, method, output)
+        return _copy_output(output)
+
+    def render_many(self, objs, method: str = 'get_cli_config_add'):
+        """ Return list of the outputs of config method 'method' for every object of objs, in order
+
+        Args:
+            objs: iterable of FgObject instances
+            method (str): Config method to call (default: 'get_cli_config_add')
+
+        Returns:
+            List
+        """
+        return [self.render(obj, method) for obj in objs]
+
+    def lookup(self, obj, method):
+        """ Look obj up and return (output, None, None) on a hit, or (None, identity, content key) on a miss
+
+        On a miss the caller renders the object and passes the output to store() with the returned identity and key.
+        """
+        entries = self._entries.get(method)
+        if entries is None:
+            raise ValueError(f"'method' must be one of {', '.join(RENDER_METHODS)}")
+
+        if method == 'get_api_config_update':
+            # replicate the side effect of get_api_config_update(), which the output depends on
+            obj.API_MKEY = obj.obj_id
+
+        identity = (type(obj), obj.vdom, obj.obj_id)
+        key = get_content_key(obj)
+        entry = entries.get(identity)
+        if entry is not None:
+            if entry[0] == key:
+                self.hits += 1
+                return _copy_output(entry[1]), None, None
+            self.invalidations += 1
+
+        self.misses += 1
+        return None, identity, key
+
+    def store(self, identity, key, method, output):
+        """ Store output rendered after a miss returned by lookup() """
+        self._entries[method][identity] = (key, _copy_output(output))
+
+    # Maintenance Methods
+    def discard(self, obj):
+        """ Drop every cached entry for obj, such as after it was deleted from the configuration
+
+        Args:
+            obj: FgObject instance
+
+        Returns:
+            None
+        """
+        identity = (type(obj), obj.vdom, obj.obj_id)
+        for entries in self._entries.values():
+            entries.pop(identity, None)
+
+    def retain(self, objs):
+        """ Drop the cached entries of every object whose identity is not in objs
+
+        Call with the full current object collection after a run to forget deleted objects.
+
+        Args:
+            objs: iterable of FgObject instances
+
+        Returns:
+            None
+        """
+        keep = {(type(obj), obj.vdom, obj.obj_id) for obj in objs}
+        for method, entries in self._entries.items():
+            self._entries[method] = {identity: entry for identity, entry in entries.items() if identity in keep}
+
+    def clear(self):
+        """ Drop every cached entry and reset statistics
+
+        Returns:
+            None
+        """
+        for entries in self._entries.values():
+            entries.clear()
+        self.reset_stats()
@@ -0,0 +1,761 @@
+import json
+import struct
+import sys
+from array import array
+
+from fgobjlib.fg_ip_pool import int_to_ipv4
+from fgobjlib.fg_object import get_member_tuple
+
+# File layout (integers little endian, every section and column aligned to 8 bytes):
+#   header    magic, version, object count, atom count, section offsets (_HEADER)
+#   atoms     u32 start[atom count + 1], then every distinct scalar value once, as a tag byte and its payload
+#   schemas   JSON list of [module, class name, rows, [[field, column kind, column offset], ...]], one per class
+#   index     u16 schema number[object count], u32 row number[object count]
+#   columns   per class, one column per field holding that field's value for every object of the class.  The first
+#             column of every class is obj_id.  Column offsets are relative to the start of this section.
+#
+# Column kinds:
+#   'atom'    u32 atom number[rows]
+#   'names'   u32 start[rows + 1], u32 atom number[...]    member tuples such as ('a', 'b')
+#   'value'   u32 start[rows + 1], tagged value bytes      any other value (see _Encoder.encode_value)
+_MAGIC = b'FGSNAP\x00\x00'
+_VERSION = 1
+_HEADER = struct.Struct('<8sIIIQQQ')
+
+# Atom tags
+_T_NONE = 0
+_T_FALSE = 1
+_T_TRUE = 2
+_T_INT = 3           # i64
+_T_STR = 4           # UTF-8 bytes
+_T_IPV4 = 5          # u32 address                       'a.b.c.d'
+_T_IPV4_PREFIX = 6   # u32 address, u8 prefix length     'a.b.c.d/n'
+_T_IPV4_MASK = 7     # u32 address, u32 netmask          'a.b.c.d w.x.y.z'
+_T_PORTS = 8         # (u16 low, u16 high)*              '80 1024-2048'
+_T_FLOAT = 9         # f64
+
+# Value tags, used in 'value' columns
+_V_ATOM = 0          # u32 atom number
+_V_LIST = 1          # u32 count, value*
+_V_DICT = 2          # u32 count, (u32 atom number of key, value)*
+_V_MEMBERS = 3       # u32 count, u32 atom number*          member tuple
+
+# Atoms every snapshot starts with, so their numbers are fixed
+_FIXED_ATOMS = (None, False, True)
+
+_U32 = struct.Struct('<I')
+_I64 = struct.Struct('<q')
+_F64 = struct.Struct('<d')
+_IP = struct.Struct('>I')
+_IP_PREFIX = struct.Struct('>IB')
+_IP_MASK = struct.Struct('>II')
+
+
+def _ipv4_to_int(text):
+    """ Return int value of dotted quad text, or None if text is not a dotted quad in canonical form """
+    parts = text.split('.')
+    if len(parts) != 4:
+        return None
+
+    value = 0
+    for part in parts:
+        if not (part.isdigit() and part.isascii()) or (len(part) > 1 and part[0] == '0'):
+            return None
+        octet = int(part)
+        if octet > 255:
+            return None
+        value = value << 8 | octet
+    return value
+
+
+def _port_to_int(text):
+    """ Return int value of port number text, or None if text is not a canonical port number """
+    if not (text.isdigit() and text.isascii()) or (len(text) > 1 and text[0] == '0'):
+        return None
+    port = int(text)
+    return port if port <= 65535 else None
+
+
+def _get_port_ranges(text):
+    """ Return flat list of low, high port numbers for space separated port ranges, or None if text won't round trip """
+    ports = []
+    for item in text.split(' '):
+        low, sep, high = item.partition('-')
+        low = _port_to_int(low)
+        high = _port_to_int(high) if sep else low
+        if low is None or high is None or (sep and high == low):
+            return None
+        ports += (low, high)
+    return ports
+
+
+def _encode_atom(value):
+    """ Return tagged bytes of scalar value, packing IP addresses and port ranges where they round trip exactly """
+    if value is None:
+        return bytes([_T_NONE])
+    if value is True:
+        return bytes([_T_TRUE])
+    if value is False:
+        return bytes([_T_FALSE])
+    if isinstance(value, int):
+        try:
+            return bytes([_T_INT]) + _I64.pack(value)
+        except struct.error:
+            raise ValueError(f"int value {value} is out of range for a snapshot")
+    if isinstance(value, float):
+        return bytes([_T_FLOAT]) + _F64.pack(value)
+
+    text = value
+    if text and text[0].isdigit():
+        if '.' in text:
+            if '/' in text:
+                address, _, prefix = text.partition('/')
+                ip = _ipv4_to_int(address)
+                length = _port_to_int(prefix)
+                if ip is not None and length is not None and length <= 32:
+                    return bytes([_T_IPV4_PREFIX]) + _IP_PREFIX.pack(ip, length)
+            elif ' ' in text:
+                address, _, netmask = text.partition(' ')
+                ip = _ipv4_to_int(address)
+                mask = _ipv4_to_int(netmask)
+                if ip is not None and mask is not None:
+                    return bytes([_T_IPV4_MASK]) + _IP_MASK.pack(ip, mask)
+            else:
+                ip = _ipv4_to_int(text)
+                if ip is not None:
+                    return bytes([_T_IPV4]) + _IP.pack(ip)
+        else:
+            ports = _get_port_ranges(text)
+            if ports is not None:
+                return bytes([_T_PORTS]) + struct.pack(f'<{len(ports)}H', *ports)
+
+    return bytes([_T_STR]) + text.encode()
+
+
+def _decode_atom(data):
+    """ Return scalar value of tagged bytes data """
+    tag = data[0]
+    if tag == _T_STR:
+        return str(data[1:], 'utf-8')
+    if tag == _T_IPV4_PREFIX:
+        ip, length = _IP_PREFIX.unpack_from(data, 1)
+        return f'{int_to_ipv4(ip)}/{length}'
+    if tag == _T_IPV4:
+        return int_to_ipv4(_IP.unpack_from(data, 1)[0])
+    if tag == _T_IPV4_MASK:
+        ip, mask = _IP_MASK.unpack_from(data, 1)
+        return f'{int_to_ipv4(ip)} {int_to_ipv4(mask)}'
+    if tag == _T_PORTS:
+        ports = struct.unpack_from(f'<{(len(data) - 1) // 2}H', data, 1)
+        return ' '.join(str(low) if low == high else f'{low}-{high}' for low, high in zip(ports[::2], ports[1::2]))
+    if tag == _T_INT:
+        return _I64.unpack_from(data, 1)[0]
+    if tag == _T_NONE:
+        return None
+    if tag == _T_TRUE:
+        return True
+    if tag == _T_FALSE:
+        return False
+    if tag == _T_FLOAT:
+        return _F64.unpack_from(data, 1)[0]
+    raise ValueError(f"corrupt snapshot: unknown atom tag {tag}")
+
+
+def _is_atom(value):
+    return value is None or type(value) in (str, int, bool, float)
+
+
+def _pack_u32(numbers):
+    """ Return u32 array of numbers, padded to a multiple of 8 bytes """
+    data = struct.pack(f'<{len(numbers)}I', *numbers)
+    return data + bytes(-len(data) % 8)
+
+
+class _Encoder:
+    """ Collects distinct scalar values into the atom table and encodes the columns referring to them """
+
+    def __init__(self):
+        # Atoms are keyed by value per type, so that True, 1 and 1.0 stay distinct.  The str table also maps None so
+        # that the most common values of a column are found with a single lookup.
+        self.atoms = {str: {None: _FIXED_ATOMS.index(None)}, int: {}, float: {}}
+        self.atom_values = list(_FIXED_ATOMS)
+
+    def get_atom_number(self, value):
+        """ Return atom number of scalar value, adding it to the table if new.  Raise KeyError for other types. """
+        if value is None or value is True or value is False:
+            return _FIXED_ATOMS.index(value)
+
+        table = self.atoms[type(value)]
+        try:
+            return table[value]
+        except KeyError:
+            number = table[value] = len(self.atom_values)
+            self.atom_values.append(value)
+            return number
+
+    def encode_atom_column(self, values):
+        """ Return atom column bytes, or None if not every value is an atom """
+        try:
+            numbers = [*map(self.atoms[str].get, values)]
+        except TypeError:
+            # unhashable values such as lists
+            return None
+
+        get_atom_number = self.get_atom_number
+        for row, number in enumerate(numbers):
+            if number is None:
+                try:
+                    numbers[row] = get_atom_number(values[row])
+                except KeyError:
+                    return None
+        return _pack_u32(numbers)
+
+    def encode_names_column(self, values):
+        """ Return names column bytes, or None if not every value is None or a member tuple """
+        strs = self.atoms[str]
+        get_atom_number = self.get_atom_number
+        starts = [0]
+        numbers = []
+        for value in values:
+            if value is not None:
+                if type(value) is not tuple or not value:
+                    return None
+                for name in value:
+                    if type(name) is not str:
+                        return None
+                    numbers.append(strs[name] if name in strs else get_atom_number(name))
+            starts.append(len(numbers))
+        return _pack_u32(starts) + _pack_u32(numbers)
+
+    def encode_value(self, value, buf):
+        """ Append value to buf as a value tag followed by its payload """
+        if _is_atom(value):
+            buf.append(_V_ATOM)
+            buf += _U32.pack(self.get_atom_number(value))
+        elif type(value) is tuple and all(type(name) is str for name in value):
+            buf.append(_V_MEMBERS)
+            buf += _U32.pack(len(value))
+            for name in value:
+                buf += _U32.pack(self.get_atom_number(name))
+        elif isinstance(value, list):
+            buf.append(_V_LIST)
+            buf += _U32.pack(len(value))
+            for item in value:
+                self.encode_value(item, buf)
+        elif isinstance(value, dict):
+            buf.append(_V_DICT)
+            buf += _U32.pack(len(value))
+            for key, item in value.items():
+                if type(key) is not str:
+                    raise ValueError("only dicts with str keys can be stored in a snapshot")
+                buf += _U32.pack(self.get_atom_number(key))
+                self.encode_value(item, buf)
+        else:
+            raise ValueError(f"value of type {type(value).__name__} cannot be stored in a snapshot")
+
+    def encode_value_column(self, values):
+        data = bytearray()
+        starts = [0]
+        for value in values:
+            self.encode_value(value, data)
+            starts.append(len(data))
+        return _pack_u32(starts) + bytes(data) + bytes(-len(data) % 8)
+
+    def encode_column(self, values):
+        """ Return (column kind, column bytes) for the values of one field """
+        data = self.encode_atom_column(values)
+        if data is not None:
+            return 'atom', data
+        data = self.encode_names_column(values)
+        if data is not None:
+            return 'names', data
+        return 'value', self.encode_value_column(values)
+
+    def encode_atoms(self):
+        encoded = [_encode_atom(value) for value in self.atom_values]
+        starts = [0]
+        for data in encoded:
+            starts.append(starts[-1] + len(data))
+
+        data = struct.pack(f'<{len(starts)}I', *starts) + b''.join(encoded)
+        return data + bytes(-len(data) % 8)
+
+
+class FgSnapshot:
+    """ FgSnapshot stores FgObject collections in a compact binary file and reads them back, or queries them in place
+
+    A snapshot stores, for each object, only the attribute values from_trusted() accepts, laid out column by column per
+    class with the field names stored once per class.  Every distinct str, int or other scalar value is stored once in
+    an atom table that the columns refer to by number, with IPv4 addresses, prefixes and port ranges packed as
+    integers.  Loading uses from_trusted(), so objects are not re-validated; write snapshots from validated objects.
+
+    Write a snapshot with FgSnapshot.save(path, objs) or FgSnapshot.dumps(objs).  Open one with FgSnapshot(path), which
+    memory maps the file: only the schemas are read up front, single objects or values are decoded on access.
+
+        with FgSnapshot('fw1.snap') as snap:
+            policies = list(snap.iter_objects(class_name='FgFwPolicy', vdom='root'))
+            everything = snap.load()
+
+    Attributes:
+        classes (list): Classes present in the snapshot, indexed by schema number
+        schemas (list): Tuple of field names for each class, indexed by schema number
+    """
+
+    def __init__(self, source, use_mmap: bool = True):
+        """
+        Args:
+            source: Path of a snapshot file, or bytes-like object holding a snapshot
+            use_mmap (bool): Memory map a snapshot file instead of reading it into memory (default: True)
+        """
+        self._file = None
+        self._mmap = None
+        self._views = []
+
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            buf = source
+        else:
+            self._file = open(source, 'rb')
+            if use_mmap:
+                import mmap
+
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                buf = self._mmap
+            else:
+                buf = self._file.read()
+                self._file.close()
+                self._file = None
+
+        # bytes and mmap objects support find(), used to look up values in the atom table without decoding it
+        self._raw = buf if isinstance(buf, (bytes, bytearray)) or self._mmap is not None else bytes(buf)
+        self._buf = self._get_view(memoryview(buf))
+        self._read_sections()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('snapshot index out of range')
+        return self._decode_object(index)
+
+    def __iter__(self):
+        return self.iter_objects()
+
+    def _get_view(self, view):
+        """ Return view, remembering it so that close() can release it before the file is unmapped """
+        self._views.append(view)
+        return view
+
+    def _get_array(self, offset, count, typecode):
+        """ Return sequence of count little endian typecode ('H' or 'I') numbers at offset """
+        view = self._buf[offset:offset + count * array(typecode).itemsize]
+        if sys.byteorder == 'little':
+            return self._get_view(view.cast(typecode))
+
+        # big endian hosts read a byte swapped copy instead of a view in place
+        numbers = array(typecode)
+        numbers.frombytes(view)
+        numbers.byteswap()
+        return numbers
+
+    def _get_u32(self, offset, count):
+        return self._get_array(offset, count, 'I')
+
+    def _read_sections(self):
+        buf = self._buf
+        if len(buf) < _HEADER.size or bytes(buf[:len(_MAGIC)]) != _MAGIC:
+            raise ValueError("not an fgobjlib snapshot")
+
+        _, version, self._count, atom_count, schemas_at, index_at, columns_at = _HEADER.unpack_from(buf)
+        if version != _VERSION:
+            raise ValueError(f"unsupported snapshot version {version}")
+
+        self._atom_starts = self._get_u32(_HEADER.size, atom_count + 1)
+        self._atom_data = _HEADER.size + (atom_count + 1) * 4
+        self._atoms = None
+        self._atom_cache = {}
+
+        count = self._count
+        self._schema_index = self._get_array(index_at, count, 'H')
+        self._row_index = self._get_u32(index_at + count * 2 + (-count * 2 % 8), count)
+
+        self.classes = []
+        self.schemas = []
+        self._storage = []
+        self._columns = []
+        for module, class_name, rows, columns in json.loads(bytes(buf[schemas_at:index_at]).rstrip(b'\0')):
+            cls = getattr(__import__(module, fromlist=[class_name]), class_name)
+            fields = cls._get_trusted_template()[1]
+            self.classes.append(cls)
+            self.schemas.append(tuple(field for field, _, _ in columns[1:]))
+            self._storage.append(tuple(fields[field] for field, _, _ in columns[1:]))
+            self._columns.append([self._get_column(kind, columns_at + offset, rows) for _, kind, offset in columns])
+
+    def _get_column(self, kind, offset, rows):
+        """ Return (kind, row starts or None, data view) for a column """
+        if kind == 'atom':
+            return kind, None, self._get_u32(offset, rows)
+
+        starts = self._get_u32(offset, rows + 1)
+        data_at = offset + (rows + 1) * 4 + (-(rows + 1) * 4 % 8)
+        if kind == 'names':
+            return kind, starts, self._get_u32(data_at, starts[rows])
+        if kind == 'value':
+            return kind, starts, self._get_view(self._buf[data_at:data_at + starts[rows]])
+        raise ValueError(f"corrupt snapshot: unknown column kind {kind}")
+
+    def close(self):
+        """ Release the snapshot buffer and close the file.  Objects already read stay valid.
+
+        Returns:
+            None
+        """
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # Writer Methods
+    @classmethod
+    def dumps(cls, objs):
+        """ Return snapshot of objs as bytes
+
+        Args:
+            objs: iterable of FgObject instances
+
+        Returns:
+            Bytes
+        """
+        # Group objects by class, remembering where each object sits so the original order can be restored
+        by_class = {}
+        schema_index = []
+        row_index = []
+        for obj in objs:
+            obj_cls = type(obj)
+            try:
+                schema_number, dicts = by_class[obj_cls]
+            except KeyError:
+                schema_number, dicts = by_class[obj_cls] = (len(by_class), [])
+            schema_index.append(schema_number)
+            row_index.append(len(dicts))
+            dicts.append(obj.__dict__)
+
+        if len(by_class) > 65535:
+            raise ValueError("a snapshot may hold at most 65535 classes")
+
+        encoder = _Encoder()
+        schemas = []
+        columns = bytearray()
+        for obj_cls, (_, dicts) in by_class.items():
+            column_specs = []
+            for field, key in [('obj_id', 'obj_id')] + list(obj_cls._get_trusted_template()[1].items()):
+                kind, data = encoder.encode_column([obj_dict[key] for obj_dict in dicts])
+                column_specs.append([field, kind, len(columns)])
+                columns += data
+            schemas.append([obj_cls.__module__, obj_cls.__qualname__, len(dicts), column_specs])
+
+        count = len(schema_index)
+        out = bytearray(_HEADER.size)
+        out += encoder.encode_atoms()
+
+        schemas_at = len(out)
+        out += json.dumps(schemas, separators=(',', ':')).encode()
+        out += bytes(-len(out) % 8)
+
+        index_at = len(out)
+        out += struct.pack(f'<{count}H', *schema_index)
+        out += bytes(-len(out) % 8)
+        out += _pack_u32(row_index)
+
+        columns_at = len(out)
+        out += columns
+
+        _HEADER.pack_into(out, 0, _MAGIC, _VERSION, count, len(encoder.atom_values), schemas_at, index_at, columns_at)
+        return bytes(out)
+
+    @classmethod
+    def save(cls, path, objs):
+        """ Write snapshot of objs to file path
+
+        Args:
+            path: File path to write
+            objs: iterable of FgObject instances
+
+        Returns:
+            Int: number of objects written
+        """
+        data = cls.dumps(objs)
+        with open(path, 'wb') as fp:
+            fp.write(data)
+        return _HEADER.unpack_from(data)[2]
+
+    # Reader Methods
+    def _get_atom(self, number):
+        """ Return atom 'number', decoding only that atom unless all atoms were already decoded """
+        if self._atoms is not None:
+            return self._atoms[number]
+        try:
+            return self._atom_cache[number]
+        except KeyError:
+            starts = self._atom_starts
+            value = _decode_atom(self._buf[self._atom_data + starts[number]:self._atom_data + starts[number + 1]])
+            self._atom_cache[number] = value
+            return value
+
+    def _get_atoms(self):
+        """ Return list of all atoms, decoding them on first use """
+        if self._atoms is None:
+            data = bytes(self._buf[self._atom_data:self._atom_data + self._atom_starts[-1]])
+            starts = self._atom_starts.tolist()
+            self._atoms = [_decode_atom(data[start:end]) for start, end in zip(starts, starts[1:])]
+            self._atom_cache = {}
+        return self._atoms
+
+    def _decode_value(self, data, pos):
+        """ Return (value, next position) for the tagged value at data[pos] """
+        tag = data[pos]
+        if tag == _V_ATOM:
+            return self._get_atom(_U32.unpack_from(data, pos + 1)[0]), pos + 5
+
+        count = _U32.unpack_from(data, pos + 1)[0]
+        pos += 5
+        if tag == _V_LIST:
+            items = []
+            for _ in range(count):
+                item, pos = self._decode_value(data, pos)
+                items.append(item)
+            return items, pos
+        if tag == _V_DICT:
+            items = {}
+            for _ in range(count):
+                key = self._get_atom(_U32.unpack_from(data, pos)[0])
+                items[key], pos = self._decode_value(data, pos + 4)
+            return items, pos
+        if tag == _V_MEMBERS:
+            names = [self._get_atom(number) for number in struct.unpack_from(f'<{count}I', data, pos)]
+            return get_member_tuple(names), pos + count * 4
+        raise ValueError(f"corrupt snapshot: unknown value tag {tag}")
+
+    def _decode_cell(self, column, row):
+        """ Return value of a single row of a column """
+        kind, starts, data = column
+        if kind == 'atom':
+            return self._get_atom(data[row])
+        if kind == 'names':
+            return get_member_tuple([self._get_atom(number) for number in data[starts[row]:starts[row + 1]]]) or None
+        return self._decode_value(data, starts[row])[0]
+
+    def _decode_column(self, column):
+        """ Return list of the values of every row of a column """
+        kind, starts, data = column
+        if kind == 'atom':
+            atoms = self._get_atoms()
+            return [atoms[number] for number in data]
+
+        starts = starts.tolist()
+        if kind == 'names':
+            atoms = self._get_atoms()
+            numbers = data.tolist()
+            return [get_member_tuple([atoms[number] for number in numbers[start:end]]) or None
+                    for start, end in zip(starts, starts[1:])]
+        return [self._decode_value(data, start)[0] for start in starts[:-1]]
+
+    def _find_atom(self, value):
+        """ Return atom number of scalar value, or None if the snapshot does not hold value """
+        try:
+            encoded = _encode_atom(value)
+        except (ValueError, TypeError, AttributeError):
+            return None
+
+        import bisect
+
+        starts = self._atom_starts
+        start = self._atom_data
+        end = start + starts[-1]
+        pos = self._raw.find(encoded, start, end)
+        while pos != -1:
+            # A match must start and end on atom boundaries
+            offset = pos - start
+            number = bisect.bisect_left(starts, offset)
+            if number < len(starts) - 1 and starts[number] == offset and starts[number + 1] - offset == len(encoded):
+                return number
+            pos = self._raw.find(encoded, pos + 1, end)
+        return None
+
+    def _decode_object(self, index):
+        return self._decode_row(self._schema_index[index], self._row_index[index])
+
+    def _decode_row(self, schema_number, row):
+        cls = self.classes[schema_number]
+        obj_id, *values = [self._decode_cell(column, row) for column in self._columns[schema_number]]
+
+        obj = cls.__new__(cls)
+        obj_dict = obj.__dict__
+        obj_dict.update(cls._get_trusted_template()[0])
+        obj_dict.update(zip(self._storage[schema_number], values))
+        obj_dict['obj_id'] = obj_id
+        return obj
+
+    def _load_class(self, schema_number):
+        """ Return list of all objects of one class, in row order """
+        cls = self.classes[schema_number]
+        template = cls._get_trusted_template()[0]
+        storage = self._storage[schema_number]
+        columns = [self._decode_column(column) for column in self._columns[schema_number]]
+
+        objs = []
+        new = cls.__new__
+        for obj_id, *values in zip(*columns):
+            obj = new(cls)
+            obj_dict = obj.__dict__
+            obj_dict.update(template)
+            obj_dict.update(zip(storage, values))
+            obj_dict['obj_id'] = obj_id
+            objs.append(obj)
+        return objs
+
+    def load(self):
+        """ Return list of all objects in the snapshot, in the order they were written
+
+        Returns:
+            List
+        """
+        by_class = [self._load_class(schema_number) for schema_number in range(len(self.classes))]
+        return [by_class[schema_number][row] for schema_number, row in zip(self._schema_index, self._row_index)]
+
+    def get_class(self, index):
+        """ Return class of object number 'index' without decoding the object
+
+        Args:
+            index (int): Object number
+
+        Returns:
+            Class
+        """
+        return self.classes[self._schema_index[index]]
+
+    def get_obj_id(self, index):
+        """ Return obj_id of object number 'index' without decoding the rest of the object
+
+        Args:
+            index (int): Object number
+
+        Returns:
+            obj_id value
+        """
+        return self._decode_cell(self._columns[self._schema_index[index]][0], self._row_index[index])
+
+    def get_value(self, index, attr):
+        """ Return value of attribute attr of object number 'index' without decoding the rest of the object
+
+        Args:
+            index (int): Object number
+            attr (str): Attribute name, any field accepted by the object's from_trusted()
+
+        Returns:
+            Attribute value
+        """
+        schema_number = self._schema_index[index]
+        try:
+            position = self.schemas[schema_number].index(attr)
+        except ValueError:
+            raise ValueError(f"'{attr}' is not a field of {self.classes[schema_number].__name__}")
+        return self._decode_cell(self._columns[schema_number][position + 1], self._row_index[index])
+
+    def get_vdom(self, index):
+        """ Return vdom of object number 'index' without decoding the rest of the object
+
+        Args:
+            index (int): Object number
+
+        Returns:
+            String or None
+        """
+        return self.get_value(index, 'vdom')
+
+    def get_indexes(self, class_name: str = None, vdom: str = None):
+        """ Return list of object numbers matching class_name and vdom, without decoding any object
+
+        Args:
+            class_name (str): Class name such as 'FgFwPolicy' (default: None = any class)
+            vdom (str): vdom name (default: None = any vdom)
+
+        Returns:
+            List
+        """
+        matches = {}
+        for schema_number, cls in enumerate(self.classes):
+            if class_name is not None and cls.__name__ != class_name:
+                continue
+            if vdom is None:
+                matches[schema_number] = None
+                continue
+
+            # Compare atom numbers, decoding each distinct vdom value of the class only once
+            kind, _, numbers = self._columns[schema_number][self.schemas[schema_number].index('vdom') + 1]
+            if kind != 'atom':
+                raise ValueError("corrupt snapshot: vdom column must be an atom column")
+            wanted = {number for number in set(numbers) if self._get_atom(number) == vdom}
+            if wanted:
+                matches[schema_number] = {row for row, number in enumerate(numbers) if number in wanted}
+
+        return [index for index, (schema_number, row) in enumerate(zip(self._schema_index, self._row_index))
+                if schema_number in matches and (matches[schema_number] is None or row in matches[schema_number])]
+
+    def iter_objects(self, class_name: str = None, vdom: str = None):
+        """ Yield objects matching class_name and vdom, decoding only the matching objects
+
+        Args:
+            class_name (str): Class name such as 'FgFwPolicy' (default: None = any class)
+            vdom (str): vdom name (default: None = any vdom)
+
+        Returns:
+            Generator of objects
+        """
+        for index in self.get_indexes(class_name, vdom):
+            yield self._decode_object(index)
+
+    def find(self, obj_id, class_name: str = None, vdom: str = None):
+        """ Return first object with obj_id matching class_name and vdom, or None if there is no such object
+
+        Args:
+            obj_id: obj_id to look for
+            class_name (str): Class name such as 'FgFwPolicy' (default: None = any class)
+            vdom (str): vdom name (default: None = any vdom)
+
+        Returns:
+            Class Instance or None
+        """
+        number = self._find_atom(obj_id)
+        for schema_number, cls in enumerate(self.classes):
+            if class_name is not None and cls.__name__ != class_name:
+                continue
+
+            obj_id_column = self._columns[schema_number][0]
+            vdom_column = self._columns[schema_number][self.schemas[schema_number].index('vdom') + 1]
+            if obj_id_column[0] == 'atom':
+                if number is None:
+                    continue
+                numbers = obj_id_column[2].tolist()
+                rows = (row for row, row_number in enumerate(numbers) if row_number == number)
+            else:
+                rows = (row for row in range(len(obj_id_column[1]) - 1)
+                        if self._decode_cell(obj_id_column, row) == obj_id)
+
+            for row in rows:
+                if vdom is None or self._decode_cell(vdom_column, row) == vdom:
+                    return self._decode_row(schema_number, row)
+        return None
@@ -0,0 +1,364 @@
+import json
+import sqlite3
+
+from fgobjlib import FgObject
+from fgobjlib.fg_object import get_member_tuple
+
+# Objects are written in batches of this many, so add_many() on a generator keeps memory flat
+_BATCH_SIZE = 10000
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _to_sql(value):
+    """ Return value in a form SQLite stores without loss: str, int, float and None as is, anything else as JSON """
+    if value is None or type(value) in (str, int, float):
+        return value
+    # bytes are stored as BLOB, which keeps JSON encoded values apart from plain TEXT values
+    return json.dumps(value, separators=(',', ':')).encode()
+
+
+def _from_sql(value):
+    if type(value) is bytes:
+        value = json.loads(value)
+        # member tuples are stored as JSON arrays of names, or of {'name': <name>} dicts by earlier versions
+        if type(value) is list:
+            return get_member_tuple([item['name'] if type(item) is dict else item for item in value])
+    return value
+
+
+class FgStore:
+    """ FgStore persists FgObject child class instances in an SQLite database and queries them without loading all
+
+    Every class gets its own table with a column per from_trusted() field, a unique index on (vdom, obj_id), an index on
+    obj_id and an index on each reference attribute.  References to other objects (FgObject.get_refs()) are also
+    written to a shared table indexed by kind and name, which answers questions such as "all policies referencing
+    address X" or "all routes via device Y" from the index.  Objects returned by queries are built with from_trusted(),
+    so they are regular, fully functional instances, but are not re-validated.
+
+    An object is identified by its class, vdom and obj_id; adding an object that is already stored replaces it.
+
+        with FgStore('configs.db') as store:
+            store.add_many(policies)
+            users = store.get_referencing('addr1', kind='address', vdom='root', cls=FgFwPolicy)
+            routes = store.find(FgRouteIPv4, device='port1')
+
+    Attributes:
+        path (str): Database file path, or ':memory:'
+    """
+
+    def __init__(self, path: str = ':memory:'):
+        """
+        Args:
+            path (str): SQLite database file, created if it does not exist (default: ':memory:')
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        if path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+
+        # class name -> (class, tuple of stored fields)
+        self._tables = {}
+
+        with self._conn:
+            self._conn.execute('CREATE TABLE IF NOT EXISTS fg_classes (name TEXT PRIMARY KEY, module TEXT NOT NULL)')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS fg_refs (class TEXT NOT NULL, vdom TEXT NOT NULL, '
+                               'obj_id NOT NULL, attr TEXT NOT NULL, kind TEXT NOT NULL, name TEXT NOT NULL)')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS fg_refs_target ON fg_refs (kind, name, vdom)')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS fg_refs_source ON fg_refs (class, vdom, obj_id)')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """ Close the database connection
+
+        Returns:
+            None
+        """
+        self._conn.close()
+
+    # Schema Methods
+    def _get_table(self, cls):
+        """ Return tuple of stored fields for cls, creating or extending its table on first use """
+        try:
+            return self._tables[cls.__name__][1]
+        except KeyError:
+            pass
+
+        if not (isinstance(cls, type) and issubclass(cls, FgObject)) or cls is FgObject:
+            raise ValueError(f"'{cls}' is not an FgObject child class")
+
+        fields = tuple(field for field in cls._get_trusted_fields() if field != 'vdom')
+        table = _quote(cls.__name__)
+
+        with self._conn:
+            self._conn.execute('INSERT OR IGNORE INTO fg_classes VALUES (?, ?)', (cls.__name__, cls.__module__))
+            self._conn.execute(f'CREATE TABLE IF NOT EXISTS {table} (vdom TEXT NOT NULL, obj_id NOT NULL)')
+
+            # Add columns for fields not yet in the table, such as fields added to the class since it was stored
+            columns = {row[1] for row in self._conn.execute(f'PRAGMA table_info({table})')}
+            for field in fields:
+                if field not in columns:
+                    self._conn.execute(f'ALTER TABLE {table} ADD COLUMN {_quote(field)}')
+
+            self._conn.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS {_quote(cls.__name__ + "_key")} '
+                               f'ON {table} (vdom, obj_id)')
+            self._conn.execute(f'CREATE INDEX IF NOT EXISTS {_quote(cls.__name__ + "_obj_id")} ON {table} (obj_id)')
+            for attr in cls._ref_attrs:
+                self._conn.execute(f'CREATE INDEX IF NOT EXISTS {_quote(cls.__name__ + "_" + attr)} '
+                                   f'ON {table} ({_quote(attr)})')
+
+        self._tables[cls.__name__] = (cls, fields)
+        return fields
+
+    def _get_class(self, name):
+        """ Return stored class by name, importing its module if needed """
+        try:
+            return self._tables[name][0]
+        except KeyError:
+            pass
+
+        row = self._conn.execute('SELECT module FROM fg_classes WHERE name = ?', (name,)).fetchone()
+        if row is None:
+            raise ValueError(f"no objects of class '{name}' in store")
+        cls = getattr(__import__(row[0], fromlist=[name]), name)
+        self._get_table(cls)
+        return cls
+
+    def get_classes(self):
+        """ Return list of classes that have objects stored
+
+        Returns:
+            List
+        """
+        return [self._get_class(row[0]) for row in self._conn.execute('SELECT name FROM fg_classes ORDER BY name')]
+
+    # Write Methods
+    def add(self, obj):
+        """ Store obj, replacing a stored object of the same class, vdom and obj_id
+
+        Args:
+            obj: FgObject child class instance
+
+        Returns:
+            None
+        """
+        self.add_many([obj])
+
+    def add_many(self, objs):
+        """ Store many objects using one executemany() per class and batch, replacing objects already stored
+
+        Args:
+            objs: iterable of FgObject child class instances, may be of mixed classes
+
+        Returns:
+            Int: number of objects stored
+        """
+        count = 0
+        batch = []
+        for obj in objs:
+            batch.append(obj)
+            if len(batch) >= _BATCH_SIZE:
+                count += self._add_batch(batch)
+                batch = []
+        if batch:
+            count += self._add_batch(batch)
+        return count
+
+    def _add_batch(self, objs):
+        by_class = {}
+        for obj in objs:
+            by_class.setdefault(type(obj), []).append(obj)
+
+        with self._conn:
+            for cls, cls_objs in by_class.items():
+                fields = self._get_table(cls)
+                storage = cls._get_trusted_template()[1]
+                keys = [storage[field] for field in fields]
+
+                rows = []
+                ref_keys = []
+                refs = []
+                for obj in cls_objs:
+                    if obj.obj_id is None:
+                        raise ValueError(f"{cls.__name__} objects must have obj_id set to be stored")
+
+                    vdom = obj.vdom or ''
+                    obj_dict = obj.__dict__
+                    rows.append([vdom, obj.obj_id] + [_to_sql(obj_dict[key]) for key in keys])
+                    ref_keys.append((cls.__name__, vdom, obj.obj_id))
+                    refs.extend((cls.__name__, vdom, obj.obj_id, attr, kind, name)
+                                for attr, kind, name in obj.get_refs())
+
+                columns = ', '.join(['vdom', 'obj_id'] + [_quote(field) for field in fields])
+                updates = ', '.join(f'{_quote(field)} = excluded.{_quote(field)}' for field in fields)
+                self._conn.executemany(f'INSERT INTO {_quote(cls.__name__)} ({columns}) '
+                                       f'VALUES ({", ".join("?" * (len(fields) + 2))}) '
+                                       f'ON CONFLICT (vdom, obj_id) DO UPDATE SET {updates}', rows)
+                self._conn.executemany('DELETE FROM fg_refs WHERE class = ? AND vdom = ? AND obj_id = ?', ref_keys)
+                self._conn.executemany('INSERT INTO fg_refs VALUES (?, ?, ?, ?, ?, ?)', refs)
+
+        return len(objs)
+
+    def delete(self, cls, obj_id, vdom: str = None):
+        """ Delete the stored object of class cls with obj_id in vdom
+
+        Args:
+            cls: FgObject child class
+            obj_id: obj_id of the object
+            vdom (str): vdom of the object (default: None)
+
+        Returns:
+            Bool: True if an object was deleted
+        """
+        self._get_table(cls)
+        with self._conn:
+            cursor = self._conn.execute(f'DELETE FROM {_quote(cls.__name__)} WHERE vdom = ? AND obj_id = ?',
+                                        (vdom or '', obj_id))
+            self._conn.execute('DELETE FROM fg_refs WHERE class = ? AND vdom = ? AND obj_id = ?',
+                               (cls.__name__, vdom or '', obj_id))
+        return cursor.rowcount > 0
+
+    # Query Methods
+    def _select(self, cls, where: str = '', params=()):
+        """ Yield objects of class cls from rows matching SQL condition where """
+        fields = self._get_table(cls)
+        template, storage = cls._get_trusted_template()
+        keys = [storage[field] for field in fields]
+        vdom_key = storage['vdom']
+        columns = ', '.join(['vdom', 'obj_id'] + [_quote(field) for field in fields])
+
+        new = cls.__new__
+        cursor = self._conn.execute(f'SELECT {columns} FROM {_quote(cls.__name__)} {where}', params)
+        for vdom, obj_id, *values in cursor:
+            obj = new(cls)
+            obj_dict = obj.__dict__
+            obj_dict.update(template)
+            obj_dict.update(zip(keys, map(_from_sql, values)))
+            obj_dict[vdom_key] = vdom or None
+            obj_dict['obj_id'] = obj_id
+            yield obj
+
+    def get(self, cls, obj_id, vdom: str = None):
+        """ Return the stored object of class cls with obj_id in vdom, or None if there is none
+
+        Args:
+            cls: FgObject child class
+            obj_id: obj_id of the object
+            vdom (str): vdom of the object (default: None)
+
+        Returns:
+            Class Instance or None
+        """
+        for obj in self._select(cls, 'WHERE vdom = ? AND obj_id = ?', (vdom or '', obj_id)):
+            return obj
+        return None
+
+    def count(self, cls=None):
+        """ Return number of stored objects of class cls, or of all classes
+
+        Args:
+            cls: FgObject child class (default: None = all classes)
+
+        Returns:
+            Int
+        """
+        classes = [cls] if cls is not None else self.get_classes()
+        total = 0
+        for klass in classes:
+            self._get_table(klass)
+            total += self._conn.execute(f'SELECT count(*) FROM {_quote(klass.__name__)}').fetchone()[0]
+        return total
+
+    def iter_objects(self, cls, vdom: str = None):
+        """ Yield every stored object of class cls, optionally only those in vdom, reading rows as they are consumed
+
+        Args:
+            cls: FgObject child class
+            vdom (str): Only objects in this vdom (default: None = all vdoms)
+
+        Returns:
+            Generator of objects
+        """
+        if vdom is None:
+            return self._select(cls, 'ORDER BY rowid')
+        return self._select(cls, 'WHERE vdom = ? ORDER BY rowid', (vdom,))
+
+    def find(self, cls, vdom: str = None, **attrs):
+        """ Return list of stored objects of class cls whose attributes equal the given values
+
+        Reference attributes (cls._ref_attrs) match if any referenced name equals the value, so
+        find(FgFwPolicy, srcaddr='addr1') returns policies with addr1 among their source addresses.
+
+        Args:
+            cls: FgObject child class
+            vdom (str): Only objects in this vdom (default: None = all vdoms)
+            **attrs: attribute names mapped to the value to match; None matches unset attributes
+
+        Returns:
+            List
+        """
+        fields = self._get_table(cls)
+        conditions = []
+        params = []
+        if vdom is not None:
+            conditions.append('vdom = ?')
+            params.append(vdom)
+
+        for attr, value in attrs.items():
+            if attr not in fields:
+                raise ValueError(f"'{attr}' is not an attribute of {cls.__name__}")
+
+            if attr in cls._ref_attrs and value is not None:
+                conditions.append('(vdom, obj_id) IN (SELECT vdom, obj_id FROM fg_refs '
+                                  'WHERE class = ? AND attr = ? AND name = ?)')
+                params += [cls.__name__, attr, value]
+            elif value is None:
+                conditions.append(f'{_quote(attr)} IS NULL')
+            else:
+                conditions.append(f'{_quote(attr)} = ?')
+                params.append(_to_sql(value))
+
+        where = f'WHERE {" AND ".join(conditions)} ' if conditions else ''
+        return list(self._select(cls, where + 'ORDER BY rowid', params))
+
+    def get_referencing(self, name: str, kind: str = None, vdom: str = None, cls=None):
+        """ Return list of stored objects that reference the object called name
+
+        Args:
+            name (str): Name of the referenced object, for example an address or interface name
+            kind (str): Kind of reference, such as 'address', 'interface', 'service' or 'phase1' (default: None = any)
+            vdom (str): Only references from objects in this vdom (default: None = all vdoms)
+            cls: Only objects of this FgObject child class (default: None = all classes)
+
+        Returns:
+            List
+        """
+        conditions = ['name = ?']
+        params = [name]
+        if kind is not None:
+            conditions.append('kind = ?')
+            params.append(kind)
+        if vdom is not None:
+            conditions.append('vdom = ?')
+            params.append(vdom)
+
+        class_names = [row[0] for row in self._conn.execute(
+            f'SELECT DISTINCT class FROM fg_refs WHERE {" AND ".join(conditions)}', params)]
+
+        objs = []
+        for class_name in class_names:
+            klass = self._get_class(class_name)
+            if cls is not None and klass is not cls:
+                continue
+            objs += self._select(klass, 'WHERE (vdom, obj_id) IN (SELECT vdom, obj_id FROM fg_refs '
+                                        f'WHERE class = ? AND {" AND ".join(conditions)}) ORDER BY rowid',
+                                 [class_name] + params)
+        return objs
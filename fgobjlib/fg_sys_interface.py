@@ -1,4 +1,4 @@
-import ipaddress
+import sys
 
 from fgobjlib import FgObject
 
@@ -26,6 +26,10 @@ class FgInterfaceIpv4(FgObject):
         description (str): Interface description
     """
 
+    # Attributes referencing other FG objects, and the kinds of object this class is referenced as
+    _ref_attrs = {'phys_intf': 'interface'}
+    _ref_kinds = ('interface',)
+
     def __init__(self, name: str = None, ip: str = None, mode: str = None, intf_type: str = None, vdom: str = None,
                  vrf: int = None, allowaccess: str = None, role: str = None, vlanid: int = None, phys_intf: str = None,
                  device_ident: str = None, alias: str = None, description: str = None, is_global: bool = None):
@@ -204,6 +208,7 @@ class FgInterfaceIpv4(FgObject):
             self._ip = None
 
         else:
+            import ipaddress
             try:
                 self._ip = str(ipaddress.ip_interface(ip))
             except ValueError:
@@ -377,7 +382,7 @@ class FgInterfaceIpv4(FgObject):
                     raise ValueError("'phys_intf' cannot be an empty string")
 
                 if 1 <= len(phys_intf) <= 31:
-                    self._phys_intf = phys_intf
+                    self._phys_intf = sys.intern(phys_intf)
                 else:
                     raise ValueError("'phys_intf', when set, must be type str() between 1 and 31 chars")
             else:
@@ -424,7 +429,7 @@ class FgInterfaceIpv4(FgObject):
             None
         """
         if device_ident is None:
-            self._device_ident = False
+            self._device_ident = None
 
         else:
             if isinstance(device_ident, str):
@@ -0,0 +1,97 @@
+import ipaddress
+
+from fgobjlib.fg_sys_interface import FgInterfaceIpv4
+from fgobjlib.fg_validate import FgValidationReport
+
+# FortiOS vrf of an interface that does not set one
+DEFAULT_VRF = 0
+
+
+def _parse_ip(ip):
+    """ Return (version, address, first, last) of an interface IP/mask as stored by FgInterfaceIpv4.ip """
+    if ':' in ip:
+        interface = ipaddress.ip_interface(ip)
+        network = interface.network
+        return 6, int(interface.ip), int(network.network_address), int(network.broadcast_address)
+
+    address, _, prefixlen = ip.partition('/')
+    a, b, c, d = address.split('.')
+    address = (int(a) << 24) | (int(b) << 16) | (int(c) << 8) | int(d)
+    hostmask = (1 << (32 - int(prefixlen or 32))) - 1
+    first = address & ~hostmask
+    return 4, address, first, first | hostmask
+
+
+def _add_error(errors, row, device, obj, message, peer):
+    errors.append({'row': row, 'class': obj.__class__.__name__, 'obj_id': obj.obj_id, 'field': 'ip',
+                   'value': obj.ip, 'message': message, 'device': device, 'peer': peer})
+
+
+def _check_domain(errors, entries):
+    """ Report duplicate addresses and overlapping subnets among the entries of one (device, vdom, vrf, version) """
+    # a duplicate address is reported as such, not also as an overlap of its subnet
+    addresses = {}
+    subnets = []
+    for entry in entries:
+        row, device, obj, address, first, last = entry
+        other = addresses.setdefault(address, entry)
+        if other is not entry:
+            _add_error(errors, row, device, obj, f"address {obj.ip.partition('/')[0]} is already used by interface "
+                                                 f"'{other[2].name}'", (other[1], other[2].obj_id))
+        else:
+            subnets.append(entry)
+
+    # sweep in order of first address; an entry starting at or below the highest last address seen overlaps the
+    # entry holding it.  Larger subnets sort first so a subnet inside another is reported, not its container.
+    subnets.sort(key=lambda entry: (entry[4], -entry[5], entry[0]))
+    holder = None
+    for entry in subnets:
+        row, device, obj, _, first, last = entry
+        if holder is not None and first <= holder[5]:
+            _add_error(errors, row, device, obj, f"subnet of {obj.ip} overlaps interface '{holder[2].name}' "
+                                                 f"{holder[2].ip}", (holder[1], holder[2].obj_id))
+        if holder is None or last > holder[5]:
+            holder = entry
+
+
+def check_interface_overlaps(interfaces):
+    """ Check that no two interfaces of the same vdom and vrf have overlapping subnets or the same address
+
+    Interfaces are grouped by (device, vdom, vrf, IP version), an unset vrf being FortiOS' default 0, so IPv4 and IPv6
+    interfaces are checked separately.  Within a group they are sorted by subnet and swept once, so n interfaces are
+    checked in O(n log n) rather than by comparing every pair.  An interface whose address is already used by another
+    is reported as a duplicate address; otherwise an interface whose subnet starts within the subnet of an interface
+    sorted before it is reported as an overlap.  Each interface is reported at most once, naming one interface it
+    conflicts with.  Interfaces without ip, or with a /0 ip, are skipped.
+
+    In addition to the FgValidationReport keys each error holds 'device' and 'peer', the (device, obj_id) of the
+    conflicting interface.
+
+    Args:
+        interfaces: iterable of FgInterfaceIpv4 objects, or of (device, FgInterfaceIpv4) tuples when checking the
+            interfaces of many devices
+
+    Returns:
+        FgValidationReport, the row of an error being the interface's position in interfaces
+    """
+    # (device, vdom, vrf, version) -> [(row, device, interface, address, first, last)]
+    domains = {}
+    rows = 0
+    for row, item in enumerate(interfaces):
+        rows += 1
+        device, obj = item if isinstance(item, tuple) else (None, item)
+        if not isinstance(obj, FgInterfaceIpv4):
+            raise ValueError(f"{obj.__class__.__name__} is not an FgInterfaceIpv4")
+
+        if obj.ip is None or obj.ip.endswith('/0'):
+            continue
+        version, address, first, last = _parse_ip(obj.ip)
+        key = (device, obj.vdom, DEFAULT_VRF if obj.vrf is None else obj.vrf, version)
+        domains.setdefault(key, []).append((row, device, obj, address, first, last))
+
+    errors = []
+    for entries in domains.values():
+        _check_domain(errors, entries)
+
+    errors.sort(key=lambda error: error['row'])
+    return FgValidationReport(rows=rows, errors=errors)
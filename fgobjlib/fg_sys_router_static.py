@@ -1,4 +1,4 @@
-import ipaddress
+import sys
 
 from fgobjlib import FgObject
 
@@ -21,6 +21,12 @@ class FgRouteIPv4(FgObject):
         vdom (str): vdom for this route
     """
 
+    # Attribute that provides obj_id
+    _obj_id_attr = 'routeid'
+
+    # Attributes referencing other FG objects
+    _ref_attrs = {'device': 'interface'}
+
     def __init__(self, routeid: int = None, dst: str = None, device: str = None, gateway: str = None,
                  distance: int = None, priority: int = None, weight: int = None, comment: str = None,
                  blackhole: str = None, vrf: int = None, vdom: str = None):
@@ -142,6 +148,7 @@ class FgRouteIPv4(FgObject):
 
         else:
             if isinstance(dst, str):
+                import ipaddress
                 try:
                     self._dst = str(ipaddress.ip_network(dst))
                 except ValueError:
@@ -168,7 +175,7 @@ class FgRouteIPv4(FgObject):
 
         else:
             if isinstance(device, str) and 1 <= len(device) <= 35:
-                self._device = device
+                self._device = sys.intern(device)
             else:
                 raise ValueError("'device' must be type str() between 1 and 35 chars", device)
 
@@ -191,6 +198,7 @@ class FgRouteIPv4(FgObject):
 
         else:
             if isinstance(gateway, str):
+                import ipaddress
                 try:
                     self._gateway = str(ipaddress.ip_address(gateway))
                 except ValueError:
@@ -223,7 +231,7 @@ class FgRouteIPv4(FgObject):
 
     @property
     def weight(self):
-        return self._distance
+        return self._weight
 
     @weight.setter
     def weight(self, weight):
@@ -319,10 +327,10 @@ class FgRouteIPv4(FgObject):
 
     @blackhole.setter
     def blackhole(self, blackhole):
-        """ Set self.blackhole to True, False if blackhole = True or False, else set to None
+        """ Set self.blackhole to 'enable' or 'disable' if blackhole valid, else set to None
 
         Args:
-            blackhole: Set blackhole True=enable, False=disable, None=inherit
+            blackhole (str): Set blackhole ('enable', 'disable', or None=inherit)
 
         Returns:
             None
@@ -331,11 +339,11 @@ class FgRouteIPv4(FgObject):
             self._blackhole = None
 
         else:
-            if isinstance(blackhole, bool):
+            if isinstance(blackhole, str):
                 if blackhole == 'enable':
                     self._blackhole = 'enable'
                 elif blackhole == 'disable':
-                    self._blackhole = 'diable'
+                    self._blackhole = 'disable'
                 else:
                     raise ValueError("'blackhole', when set, must be type str() with value 'enable' or 'disable'")
             else:
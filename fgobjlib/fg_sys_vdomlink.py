@@ -67,7 +67,7 @@ class FgVdomLink(FgObject):
 
     @property
     def vlink_type(self):
-        return self.vlink_type
+        return self._vlink_type
 
     @vlink_type.setter
     def vlink_type(self, vlink_type):
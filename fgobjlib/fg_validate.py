@@ -0,0 +1,209 @@
+from itertools import islice
+
+
+class FgValidationReport:
+    """ FgValidationReport aggregates the validation errors found by validate_records() or validate_objects()
+
+    Each error is a dictionary describing one invalid field:
+        {'row': 12, 'class': 'FgFwPolicy', 'obj_id': 13, 'field': 'action', 'value': 'permit',
+         'message': "'action', when set, must be type str() with value 'accept' or 'deny'"}
+
+    Attributes:
+        rows (int): Number of records or objects validated
+        errors (list): Error dictionaries, ordered by row, the errors of a row in the order its fields were checked
+    """
+
+    def __init__(self, rows: int = 0, errors: list = None):
+        self.rows = rows
+        self.errors = errors if errors is not None else []
+
+    def __str__(self):
+        return f'{len(self.errors)} error(s) in {len(self.get_error_rows())} of {self.rows} row(s)'
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __len__(self):
+        return len(self.errors)
+
+    def __iter__(self):
+        return iter(self.errors)
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def get_error_rows(self):
+        """ Return sorted list of row numbers that have at least one error
+
+        Returns:
+            List
+        """
+        return sorted({error['row'] for error in self.errors})
+
+    def get_field_counts(self):
+        """ Return dictionary of field name to number of errors for that field
+
+        Returns:
+            Dictionary
+        """
+        counts = {}
+        for error in self.errors:
+            counts[error['field']] = counts.get(error['field'], 0) + 1
+        return counts
+
+    def raise_for_errors(self):
+        """ Raise ValueError listing the first errors if any were found
+
+        Returns:
+            None
+        """
+        if self.errors:
+            detail = '; '.join(f"row {error['row']} {error['field']}: {error['message']}" for error in self.errors[:5])
+            raise ValueError(f'{self}: {detail}')
+
+
+class _FieldValidator:
+    """ Validates single field values for one class, remembering the outcome for each distinct value
+
+    Bulk data repeats the same values heavily (interfaces, schedules, actions, ...), so each distinct value of a
+    field is run through the property setter once and later occurrences are answered from the memo.
+    """
+
+    def __init__(self, cls):
+        self.cls = cls
+        self.fields = cls._get_trusted_template()[1]
+        self.scratch = cls.from_trusted()
+        self.memo = {}
+
+        # Attributes with a property setter; other accepted attributes (such as is_global) are stored unchecked
+        self.setters = {}
+        for attr, storage in self.fields.items():
+            if storage != attr:
+                self.setters[attr] = getattr(cls, attr).fset
+
+    def check(self, field, value):
+        """ Return None if value is valid for field, else the error message """
+        if field not in self.fields:
+            return f"'{field}' is not an attribute of {self.cls.__name__}"
+
+        setter = self.setters.get(field)
+        if setter is None:
+            return None
+
+        try:
+            key = (field, type(value), value)
+            return self.memo[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # unhashable values, such as lists, are memoized by their repr
+            key = (field, type(value), repr(value))
+            if key in self.memo:
+                return self.memo[key]
+
+        try:
+            setter(self.scratch, value)
+            message = None
+        except Exception as e:
+            message = str(e)
+
+        self.memo[key] = message
+        return message
+
+
+def _validate_chunk(cls, rows):
+    """ Validate a chunk of (row number, obj_id, values) for cls and return list of error dictionaries """
+    validators = {}
+    errors = []
+    for row, row_cls, obj_id, values in rows:
+        row_cls = row_cls or cls
+        validator = validators.get(row_cls)
+        if validator is None:
+            validator = validators[row_cls] = _FieldValidator(row_cls)
+
+        if obj_id is None:
+            obj_id = values.get(row_cls._obj_id_attr)
+
+        for field, value in values.items():
+            message = validator.check(field, value)
+            if message is not None:
+                errors.append({'row': row, 'class': row_cls.__name__, 'obj_id': obj_id, 'field': field,
+                               'value': value, 'message': message})
+    return errors
+
+
+def _run(cls, rows, workers, chunk_size):
+    """ Validate rows, an iterable of (row number, class, obj_id, values), in chunks and return FgValidationReport """
+    rows = iter(rows)
+    chunks = iter(lambda: list(islice(rows, chunk_size)), [])
+    report = FgValidationReport()
+
+    def collect(chunk_results):
+        for chunk, errors in chunk_results:
+            report.rows += len(chunk)
+            report.errors.extend(errors)
+
+    if workers is not None and workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = []
+            for chunk in chunks:
+                pending.append((chunk, executor.submit(_validate_chunk, cls, chunk)))
+
+                # bound the number of chunks held in memory
+                if len(pending) >= workers * 2:
+                    chunk, future = pending.pop(0)
+                    collect([(chunk, future.result())])
+            collect((chunk, future.result()) for chunk, future in pending)
+    else:
+        collect((chunk, _validate_chunk(cls, chunk)) for chunk in chunks)
+
+    return report
+
+
+def validate_records(cls, records, first_row: int = 0, workers: int = None, chunk_size: int = 10000):
+    """ Validate many records for an FgObject class in one pass, collecting every error instead of raising
+
+    Each record is a dictionary of constructor argument names to values of the types the constructor takes, such as a
+    record decoded from JSON; int fields must hold int, not str.  All fields of all records are checked, each distinct
+    value of a field only once, and the errors returned in an FgValidationReport.  Records are not turned into objects
+    and their values are not normalized (a str member list stays a str), so build objects of the rows that passed with
+    cls(**record), not from_trusted().
+
+    Args:
+        cls: FgObject child class the records describe, for example FgFwPolicy
+        records: iterable of dictionaries
+        first_row (int): Row number reported for the first record (default: 0)
+        workers (int): Validate chunks in this many worker processes (default: None = in this process)
+        chunk_size (int): Records per chunk (default: 10000)
+
+    Returns:
+        FgValidationReport
+    """
+    rows = ((row, None, None, values) for row, values in enumerate(records, first_row))
+    return _run(cls, rows, workers, chunk_size)
+
+
+def validate_objects(objs, workers: int = None, chunk_size: int = 10000):
+    """ Validate the current attribute values of many objects, such as those created with from_trusted()
+
+    Unlike validate() on each object, all errors are collected and objects are left unchanged.  Objects may be of
+    mixed classes; the row number of an error is the object's position in objs.
+
+    Args:
+        objs: iterable of FgObject instances
+        workers (int): Validate chunks in this many worker processes (default: None = in this process)
+        chunk_size (int): Objects per chunk (default: 10000)
+
+    Returns:
+        FgValidationReport
+    """
+    def rows():
+        for row, obj in enumerate(objs):
+            cls = type(obj)
+            values = {attr: getattr(obj, attr) for attr in cls._get_trusted_fields()}
+            yield row, cls, obj.obj_id, values
+
+    return _run(None, rows(), workers, chunk_size)
@@ -0,0 +1,250 @@
+# Catalogs of the IPsec proposals and DH groups accepted by FgIpsecP1Interface and FgIpsecP2Interface.  Catalogs are
+# immutable and give every proposal and DH group a bit, so a set of them is a single int mask and two tunnels share a
+# proposal if (mask_a & mask_b) is non-zero.  The normalize_*() functions hold the validation done by the proposal and
+# dhgrp property setters, memoized per distinct value as thousands of tunnels typically share a few proposal sets.
+from types import MappingProxyType
+
+# Phase1 proposals, in FortiOS order
+P1_PROPOSALS = ('des-md5', 'des-sha', 'des-sha256', 'des-sha384', 'des-sha512', '3des-md5', '3des-sha1', '3des-sha256',
+                '3des-sha384', '3des-sha512', 'aes128-md5', 'aes128-sha1', 'aes128-sha256', 'aes128-sha384',
+                'aes128-sha512', 'aes192-md5', 'aes192-sha1', 'aes192-sha256', 'aes192-sha384', 'aes192-sha512',
+                'aes256-md5', 'aes256-sha1', 'aes256-sha256', 'aes256-sha384', 'aes256-sha512', 'aria128-md5',
+                'aria128-sha1', 'aria128-sha256', 'aria128-sha384', 'aria128-sha512', 'aria192-md5', 'aria192-sha1',
+                'aria192-sha256', 'aria192-sha384', 'aria192-sha512', 'aria256-md5', 'aria256-sha1', 'aria256-sha256',
+                'aria256-sha384', 'aria256-sha512', 'seed-md5', 'seed-sha1', 'seed-sha256', 'seed-sha384',
+                'seed-sha512')
+
+# Phase2 proposals: all phase1 proposals plus AEAD and null cipher/hash combinations
+P2_PROPOSALS = P1_PROPOSALS + ('chacha20poly1305', 'null-md5', 'null-sha1', 'null-sha256', 'null-sha384',
+                               'null-sha512', 'des-null', '3des-null', 'aes128-null', 'aes192-null', 'aes256-null',
+                               'aria128-null', 'seed-null')
+
+DHGRPS = (1, 2, 5, 14, 15, 16, 17, 18, 19, 20, 21, 27, 28, 30, 31, 32)
+
+# Bit of each proposal, shared by phase1 and phase2 so their masks may be compared
+PROPOSAL_BITS = MappingProxyType({proposal: 1 << bit for bit, proposal in enumerate(P2_PROPOSALS)})
+
+# Bit of each DH group is the group number
+DHGRP_BITS = MappingProxyType({dhgrp: 1 << dhgrp for dhgrp in DHGRPS})
+
+P1_PROPOSAL_SET = frozenset(P1_PROPOSALS)
+P2_PROPOSAL_SET = frozenset(P2_PROPOSALS)
+DHGRP_SET = frozenset(DHGRPS)
+
+# Distinct values remembered per memoized function before its memo is emptied
+_MEMO_SIZE = 4096
+
+
+def _memoize(normalize):
+    """ Return normalize() memoized per distinct argument, including lists, keyed with their item types """
+    memo = {}
+
+    def lookup(value):
+        if isinstance(value, list):
+            key = (list, tuple(value), tuple(map(type, value)))
+        else:
+            key = (type(value), value)
+
+        try:
+            return memo[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # unhashable items, such as dicts in a list, are not memoized
+            return normalize(value)
+
+        result = normalize(value)
+        if len(memo) >= _MEMO_SIZE:
+            memo.clear()
+        memo[key] = result
+        return result
+
+    lookup.__doc__ = normalize.__doc__
+    return lookup
+
+
+@_memoize
+def normalize_p1_proposal(proposal):
+    """ Return phase1 proposal(s) as the space separated str stored by FgIpsecP1Interface, raise ValueError if invalid
+
+    Args:
+        proposal (list): str of one or more space separated proposals, or list of str
+
+    Returns:
+        String
+    """
+    if isinstance(proposal, str):
+        items = proposal.split()
+        if not items or not all(item in P1_PROPOSAL_SET for item in items):
+            raise ValueError("'proposal' provided is not a valid FortiGate phase1 proposal option")
+
+    elif isinstance(proposal, list):
+        items = [item for item in proposal if isinstance(item, str)]
+        if not all(item in P1_PROPOSAL_SET for item in items):
+            raise ValueError("'proposal'(s) provided contain at least one that is not a valid "
+                             "FortiGate phase1 proposal option")
+    else:
+        raise ValueError("'proposal' must be type str() or list() of str()")
+
+    return ''.join([f'{item} ' for item in items])
+
+
+@_memoize
+def normalize_p2_proposal(proposal):
+    """ Return phase2 proposal(s) as the str stored by FgIpsecP2Interface, raise ValueError if invalid
+
+    Args:
+        proposal (list): str of one or more space separated proposals, or list of str
+
+    Returns:
+        String
+    """
+    if isinstance(proposal, str):
+        if proposal in P2_PROPOSAL_SET:
+            return proposal
+
+        items = proposal.split()
+        if not items or not all(item in P2_PROPOSAL_SET for item in items):
+            raise ValueError("'proposal' value provided is not a valid fortigate phase1 proposal option")
+
+    elif isinstance(proposal, list):
+        items = [item for item in proposal if isinstance(item, str)]
+        if not all(item in P2_PROPOSAL_SET for item in items):
+            raise ValueError("'proposal' value provided not a valid fortigate phase1 proposal option")
+    else:
+        raise ValueError("'proposal' must be type str() with single proposal referenced or type list() for "
+                         "multiple proposal references")
+
+    return ''.join([f' {item}' for item in items])
+
+
+def _normalize_dhgrp(dhgrp, invalid, invalid_item, invalid_type):
+    """ Return dhgrp(s) as a space separated str, raising ValueError with the given messages if invalid """
+    if isinstance(dhgrp, int):
+        if dhgrp not in DHGRP_SET:
+            raise ValueError(invalid)
+        return f'{dhgrp} '
+
+    elif isinstance(dhgrp, str):
+        items = dhgrp.split()
+        if not items:
+            raise ValueError(invalid)
+
+        for item in items:
+            if not (item.isdigit() and int(item) in DHGRP_SET):
+                raise ValueError(invalid_item)
+        return ''.join([f'{int(item)} ' for item in items])
+
+    elif isinstance(dhgrp, list):
+        items = [item for item in dhgrp if isinstance(item, int)]
+        if not all(item in DHGRP_SET for item in items):
+            raise ValueError(invalid_item)
+        return ''.join([f'{item} ' for item in items])
+
+    raise ValueError(invalid_type)
+
+
+@_memoize
+def normalize_p1_dhgrp(dhgrp):
+    """ Return phase1 dhgrp(s) as the space separated str stored by FgIpsecP1Interface, raise ValueError if invalid
+
+    Args:
+        dhgrp (list): int, list of int or str of space separated dhgrps
+
+    Returns:
+        String
+    """
+    return _normalize_dhgrp(dhgrp, "'dhgrp' provided is not a valid fortigate dhgrp option",
+                            "At least one 'dhgrp' provided is not a valid fortigate dhgrp option",
+                            "dhgrp must be type int()")
+
+
+@_memoize
+def normalize_p2_dhgrp(dhgrp):
+    """ Return phase2 dhgrp(s) as the space separated str stored by FgIpsecP2Interface, raise ValueError if invalid
+
+    Args:
+        dhgrp (list): int, list of int or str of space separated dhgrps
+
+    Returns:
+        String
+    """
+    return _normalize_dhgrp(dhgrp, "'dhgrp' value provided is not a valid fortigate dhgrp option",
+                            "At least one 'dhgrp' provided is not a valid fortigate phase1 proposal",
+                            "dhgrp must be provided as type int() or list() of int()")
+
+
+@_memoize
+def get_proposal_mask(proposal):
+    """ Return int mask with the bit of every proposal set, for a phase1 or phase2 proposal value
+
+    Args:
+        proposal (list): str of space separated proposals (as stored by the setters), list of str or None
+
+    Returns:
+        Integer, 0 for None
+    """
+    if proposal is None:
+        return 0
+
+    items = proposal.split() if isinstance(proposal, str) else proposal
+    mask = 0
+    for item in items:
+        try:
+            mask |= PROPOSAL_BITS[item]
+        except KeyError:
+            raise ValueError(f"'{item}' is not a valid FortiGate proposal")
+    return mask
+
+
+@_memoize
+def get_dhgrp_mask(dhgrp):
+    """ Return int mask with the bit of every DH group set
+
+    Args:
+        dhgrp (list): str of space separated dhgrps (as stored by the setters), int, list of int or None
+
+    Returns:
+        Integer, 0 for None
+    """
+    if dhgrp is None:
+        return 0
+
+    if isinstance(dhgrp, int):
+        items = [dhgrp]
+    elif isinstance(dhgrp, str):
+        items = [int(item) if item.isdigit() else item for item in dhgrp.split()]
+    else:
+        items = dhgrp
+
+    mask = 0
+    for item in items:
+        try:
+            mask |= DHGRP_BITS[item]
+        except KeyError:
+            raise ValueError(f"'{item}' is not a valid FortiGate dhgrp")
+    return mask
+
+
+def get_proposals(mask: int):
+    """ Return tuple of the proposals whose bit is set in mask, in catalog order
+
+    Args:
+        mask (int): proposal mask
+
+    Returns:
+        Tuple
+    """
+    return tuple(proposal for proposal, bit in PROPOSAL_BITS.items() if mask & bit)
+
+
+def get_dhgrps(mask: int):
+    """ Return tuple of the DH groups whose bit is set in mask, in ascending order
+
+    Args:
+        mask (int): dhgrp mask
+
+    Returns:
+        Tuple
+    """
+    return tuple(dhgrp for dhgrp, bit in DHGRP_BITS.items() if mask & bit)
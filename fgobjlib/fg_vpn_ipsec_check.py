@@ -0,0 +1,170 @@
+import ipaddress
+
+from fgobjlib.fg_validate import FgValidationReport
+from fgobjlib.fg_vpn_ipsec_catalog import get_dhgrp_mask, get_proposal_mask
+from fgobjlib.fg_vpn_ipsec_p1_interface import FgIpsecP1Interface
+from fgobjlib.fg_vpn_ipsec_p2_interface import FgIpsecP2Interface
+
+# FortiOS ike-version of a phase1-interface that does not set one
+DEFAULT_IKE_VERSION = 1
+
+# Selector of a phase2-interface that does not set src_subnet or dst_subnet
+ANY_SUBNET = '0.0.0.0/0'
+
+
+class _Tunnels:
+    """ Phase1 and phase2 interfaces of many devices, indexed for peer lookups """
+
+    def __init__(self, local_addresses):
+        self.local_addresses = {device: str(ipaddress.ip_address(address))
+                                for device, address in (local_addresses or {}).items()}
+        self.rows = 0
+        self.errors = []
+        # [(row, device, p1, local address)]
+        self.p1s = []
+        # (local address, remote_gw) -> [index in p1s]
+        self.by_gateways = {}
+        # (device, vdom, phase1name) -> [(row, p2)]
+        self.p2s = {}
+        self.subnets = {}
+
+    def add(self, device, obj):
+        row = self.rows
+        self.rows += 1
+
+        if isinstance(obj, FgIpsecP2Interface):
+            self.p2s.setdefault((device, obj.vdom, obj.phase1name), []).append((row, obj))
+            return
+        # other objects, such as the routes and policies generated with the tunnels, only take up their row;
+        # dial-up (dynamic) phase1s have no fixed peer
+        if not isinstance(obj, FgIpsecP1Interface) or obj.p1_type == 'dynamic':
+            return
+
+        local = obj.local_gw or self.local_addresses.get(device)
+        if local is None:
+            self.add_error(row, device, obj, 'local_gw', None, 'local address unknown, set local_gw or pass the '
+                                                               'address of the device in local_addresses')
+            return
+        if obj.remote_gw is None:
+            self.add_error(row, device, obj, 'remote_gw', None, 'remote_gw must be set on a static phase1')
+            return
+
+        self.by_gateways.setdefault((local, obj.remote_gw), []).append(len(self.p1s))
+        self.p1s.append((row, device, obj, local))
+
+    def add_error(self, row, device, obj, field, value, message, peer=None):
+        self.errors.append({'row': row, 'class': obj.__class__.__name__, 'obj_id': obj.obj_id, 'field': field,
+                            'value': value, 'message': message, 'device': device, 'peer': peer})
+
+    def get_subnet(self, subnet):
+        """ Return subnet normalized for comparison, ANY_SUBNET for None """
+        try:
+            return self.subnets[subnet]
+        except KeyError:
+            pass
+
+        normalized = ANY_SUBNET if subnet is None else str(ipaddress.ip_network(subnet, strict=False))
+        self.subnets[subnet] = normalized
+        return normalized
+
+    def check(self):
+        for index, (row, device, p1, local) in enumerate(self.p1s):
+            peers = self.by_gateways.get((p1.remote_gw, local), ())
+            if len(peers) != 1:
+                if not peers:
+                    message = f'no peer phase1 with local address {p1.remote_gw} and remote_gw {local}'
+                else:
+                    message = f'{len(peers)} peer phase1s with local address {p1.remote_gw} and remote_gw {local}'
+                self.add_error(row, device, p1, 'remote_gw', p1.remote_gw, message)
+
+            # check each pair once, from the phase1 seen first
+            elif peers[0] > index:
+                self.check_pair(self.p1s[index], self.p1s[peers[0]])
+
+    def check_pair(self, p1_entry, peer_entry):
+        row, device, p1, _ = p1_entry
+        peer_row, peer_device, peer, _ = peer_entry
+        peer_ref = (peer_device, peer.obj_id)
+
+        ike_version = p1.ike_version or DEFAULT_IKE_VERSION
+        peer_ike_version = peer.ike_version or DEFAULT_IKE_VERSION
+        if ike_version != peer_ike_version:
+            self.add_error(row, device, p1, 'ike_version', ike_version,
+                           f'ike_version {ike_version} does not match peer ike_version {peer_ike_version}', peer_ref)
+        self.check_crypto(row, device, p1, peer, peer_ref)
+
+        # phase2 selectors must mirror: src_subnet of one side is dst_subnet of the other
+        p2s = self.p2s.get((device, p1.vdom, p1.name), ())
+        peer_p2s = self.p2s.get((peer_device, peer.vdom, peer.name), ())
+        peer_selectors = {}
+        for peer_p2_row, peer_p2 in peer_p2s:
+            selectors = (self.get_subnet(peer_p2.src_subnet), self.get_subnet(peer_p2.dst_subnet))
+            peer_selectors.setdefault(selectors, (peer_p2_row, peer_p2))
+
+        matched = set()
+        for p2_row, p2 in p2s:
+            src, dst = self.get_subnet(p2.src_subnet), self.get_subnet(p2.dst_subnet)
+            match = peer_selectors.get((dst, src))
+            if match is None:
+                self.add_error(p2_row, device, p2, 'src_subnet', (src, dst),
+                               f'no phase2 of peer {peer.obj_id} has src_subnet {dst} and dst_subnet {src}', peer_ref)
+            else:
+                matched.add(match[0])
+                self.check_crypto(p2_row, device, p2, match[1], (peer_device, match[1].obj_id))
+
+        p1_ref = (device, p1.obj_id)
+        for peer_p2_row, peer_p2 in peer_p2s:
+            if peer_p2_row not in matched:
+                src, dst = self.get_subnet(peer_p2.src_subnet), self.get_subnet(peer_p2.dst_subnet)
+                self.add_error(peer_p2_row, peer_device, peer_p2, 'src_subnet', (src, dst),
+                               f'no phase2 of peer {p1.obj_id} has src_subnet {dst} and dst_subnet {src}', p1_ref)
+
+    def check_crypto(self, row, device, obj, peer, peer_ref):
+        """ Report proposal and dhgrp sets of obj and its peer that have nothing in common, unless either is unset """
+        mask, peer_mask = get_proposal_mask(obj.proposal), get_proposal_mask(peer.proposal)
+        if mask and peer_mask and not mask & peer_mask:
+            self.add_error(row, device, obj, 'proposal', obj.proposal,
+                           f'no proposal in common with peer proposal {peer.proposal.strip()}', peer_ref)
+
+        mask, peer_mask = get_dhgrp_mask(obj.dhgrp), get_dhgrp_mask(peer.dhgrp)
+        if mask and peer_mask and not mask & peer_mask:
+            self.add_error(row, device, obj, 'dhgrp', obj.dhgrp,
+                           f'no dhgrp in common with peer dhgrp {peer.dhgrp.strip()}', peer_ref)
+
+
+def check_ipsec_peers(tunnels, local_addresses: dict = None):
+    """ Check that the phase1 and phase2 interfaces of many tunnel peers agree, in one pass over all tunnels
+
+    Static phase1 interfaces are indexed by (local address, remote_gw), so the peer of each is found with a single
+    lookup of (remote_gw, local address) rather than by comparing every pair.  The local address of a phase1 is its
+    local_gw, or else the address given for its device in local_addresses.  For each pair of peers:
+        - ike_version must be equal (unset is FortiOS' default, 1)
+        - proposal and dhgrp must have at least one value in common (unset is not checked)
+        - every phase2 bound to either phase1 must have a phase2 on the peer with mirrored selectors (src_subnet equal
+          to the peer's dst_subnet and dst_subnet equal to the peer's src_subnet, unset is 0.0.0.0/0), and the two
+          must have a proposal and dhgrp in common
+
+    Dial-up (p1_type 'dynamic') phase1 interfaces are skipped, as are objects of other classes.  Mismatches between two
+    phase1s are reported once, on the one that appears first in tunnels; a phase2 without a mirrored peer phase2 is
+    reported on itself.  In addition to the FgValidationReport keys each error holds 'device' and 'peer', the
+    (device, obj_id) of the peer object.
+
+    Args:
+        tunnels: iterable of FgIpsecP1Interface and FgIpsecP2Interface objects, or of (device, object) tuples such as
+            generated by FgIpsecMesh.iter_objects() when checking tunnels of many devices.  Other objects in it, such
+            as the routes and policies FgIpsecMesh.iter_objects() also generates, are skipped.
+        local_addresses (dict): device mapped to its IPv4 address, for phase1s without local_gw (default: None)
+
+    Returns:
+        FgValidationReport, the row of an error being the object's position in tunnels
+    """
+    index = _Tunnels(local_addresses)
+    for item in tunnels:
+        if isinstance(item, tuple):
+            index.add(*item)
+        else:
+            index.add(None, item)
+
+    index.check()
+    index.errors.sort(key=lambda error: error['row'])
+    return FgValidationReport(rows=index.rows, errors=index.errors)
@@ -1,7 +1,9 @@
-import ipaddress
-from typing import Union
+from __future__ import annotations
+
+import sys
 
 from fgobjlib import FgObject
+from fgobjlib.fg_vpn_ipsec_catalog import normalize_p1_dhgrp, normalize_p1_proposal
 
 
 class FgIpsecP1Interface(FgObject):
@@ -34,7 +36,12 @@ class FgIpsecP1Interface(FgObject):
         exchange_interface_ip (str): exchange-interface-ip ('enable', 'disable', or None=inherit)
     """
 
-    def __init__(self, name: str = None, p1_type: str = None, interface: str = None, proposal: Union[str, list] = None,
+    # Attributes referencing other FG objects, and the kinds of object this class is referenced as.  A phase1-interface
+    # also creates the tunnel interface of the same name.
+    _ref_attrs = {'interface': 'interface'}
+    _ref_kinds = ('phase1', 'interface')
+
+    def __init__(self, name: str = None, p1_type: str = None, interface: str = None, proposal: str | list = None,
                  ike_version: int = None, local_gw: str = None, psksecret: str = None, localid: str = None,
                  remote_gw: str = None, add_route: str = None, add_gw_route: str = None, keepalive: int = None,
                  net_device: str = None, comment: str = None, vdom: str = None, tunnel_search: str = None,
@@ -147,51 +154,16 @@ class FgIpsecP1Interface(FgObject):
         """ Set self.proposal with list of proposals from proposal if items are all acceptable FG proposals
 
         Args:
-            proposal (list): string containing a single p1 proposal or list of strings with one or more p1 propolsals
+            proposal (list): string containing one or more space separated p1 proposals or list of strings with one or
+                more p1 proposals
 
         Returns:
             None
         """
-        valid_proposals = ['des-md5', 'des-sha', 'des-sha256', 'des-sha384', 'des-sha512', '3des-md5', '3des-sha1',
-                           '3des-sha256', '3des-sha384', '3des-sha512', 'aes128-md5', 'aes128-sha1', 'aes128-sha256',
-                           'aes128-sha384', 'aes128-sha512', 'aes192-md5', 'aes192-sha1', 'aes192-sha256',
-                           'aes192-sha384', 'aes192-sha512', 'aes256-md5', 'aes256-sha1', 'aes256-sha256',
-                           'aes256-sha384', 'aes256-sha512', 'aria128-md5', 'aria128-sha1', 'aria128-sha256',
-                           'aria128-sha384', 'aria128-sha512', 'aria192-md5', 'aria192-sha1', 'aria192-sha256',
-                           'aria192-sha384', 'aria192-sha512', 'aria256-md5', 'aria256-sha1', 'aria256-sha256',
-                           'aria256-sha384', 'aria256-sha512', 'seed-md5', 'seed-sha1', 'seed-sha256', 'seed-sha384',
-                           'seed-sha512']
-
         if proposal is None:
             self._proposal = None
-
         else:
-            proposal_items = ''
-
-            # IF a single object was passed as a string, append it to intf_list else iterate the list and pull
-            # out the strings of interfaces and append each to intf_list
-            if isinstance(proposal, str):
-
-                # compare proposal to valid_proposals list
-                if proposal in valid_proposals:
-                    proposal_items += f"{proposal} "
-                else:
-                    raise ValueError("'proposal' provided is not a valid FortiGate phase1 proposal option")
-
-            elif isinstance(proposal, list):
-                for item in proposal:
-                    if isinstance(item, str):
-
-                        # compare proposal to valid proposals list
-                        if item in valid_proposals:
-                            proposal_items += f"{item} "
-                        else:
-                            raise ValueError("'proposal'(s) provided contain at least one that is not a valid "
-                                             "FortiGate phase1 proposal option")
-            else:
-                raise ValueError("'proposal' must be type str() or list() of str()")
-
-            self._proposal = proposal_items
+            self._proposal = normalize_p1_proposal(proposal)
 
     @property
     def dhgrp(self):
@@ -205,40 +177,16 @@ class FgIpsecP1Interface(FgObject):
         of those to a space separated values string and set in self.dhgrp
 
         Args:
-            dhgrp (list): single int representing one dhgrp or a list of ints for one or more dhgrps
+            dhgrp (list): single int representing one dhgrp, a list of ints for one or more dhgrps or a str of space
+                separated dhgrps
 
         Returns:
             None
         """
         if dhgrp is None:
             self._dhgrp = None
-
         else:
-            dhgrp_items = ''
-            valid_dhgrps = [1, 2, 5, 14, 15, 16, 17, 18, 19, 20, 21, 27, 28, 30, 31, 32]
-
-            # IF a single object was passed as a string, append it to list else iterate the list and pull
-            # out the dhgrps and add to list to be set as self object
-            if isinstance(dhgrp, int):
-                # compare proposal to valid_list
-                if dhgrp in valid_dhgrps:
-                    dhgrp_items += "{} ".format(dhgrp)
-                else:
-                    raise ValueError("'dhgrp' provided is not a valid fortigate dhgrp option")
-
-            elif isinstance(dhgrp, list):
-                for item in dhgrp:
-                    if isinstance(item, int):
-
-                        # compare proposal to valid proposals list
-                        if item in valid_dhgrps:
-                            dhgrp_items += "{} ".format(item)
-                        else:
-                            raise ValueError(f"At least one 'dhgrp' provided is not a valid fortigate dhgrp option")
-            else:
-                raise ValueError("dhgrp must be type int()")
-
-            self._dhgrp = dhgrp_items
+            self._dhgrp = normalize_p1_dhgrp(dhgrp)
 
     @property
     def p1_type(self):
@@ -291,7 +239,7 @@ class FgIpsecP1Interface(FgObject):
                 raise ValueError("'interface', cannot be an empty string")
             if isinstance(interface, str):
                 if len(interface) < 35:
-                    self._interface = interface
+                    self._interface = sys.intern(interface)
                 else:
                     raise ValueError("'interface', when set, must be type str() between 1 and 35 chars")
             else:
@@ -341,6 +289,7 @@ class FgIpsecP1Interface(FgObject):
         if local_gw is None:
             self._local_gw = None
         else:
+            import ipaddress
             try:
                 self._local_gw = str(ipaddress.ip_address(local_gw))
             except ValueError:
@@ -363,6 +312,7 @@ class FgIpsecP1Interface(FgObject):
         if remote_gw is None:
             self._remote_gw = None
         else:
+            import ipaddress
             try:
                 self._remote_gw = str(ipaddress.ip_address(remote_gw))
             except ValueError:
@@ -598,7 +548,7 @@ class FgIpsecP1Interface(FgObject):
                     self._dpd = 'disable'
                 elif dpd.lower() == 'on-idle':
                     self._dpd = 'on-idle'
-                elif dpd.lower == 'on-demand':
+                elif dpd.lower() == 'on-demand':
                     self._dpd = 'on-demand'
                 else:
                     raise Exception("'dpd', when set, must be type str() with value 'disable', 'on-idle' or "
@@ -1,7 +1,9 @@
-import ipaddress
-from typing import Union
+from __future__ import annotations
+
+import sys
 
 from fgobjlib import FgObject
+from fgobjlib.fg_vpn_ipsec_catalog import normalize_p2_dhgrp, normalize_p2_proposal
 
 
 class FgIpsecP2Interface(FgObject):
@@ -27,8 +29,11 @@ class FgIpsecP2Interface(FgObject):
         dst_subnet (str): destination selector, for selectors type subnet
     """
 
+    # Attributes referencing other FG objects
+    _ref_attrs = {'phase1name': 'phase1'}
+
     def __init__(self, name: str = None, phase1name: str = None, proposal: list = None, pfs: str = None,
-                 dhgrp: Union[str, list] = None, keepalive: str = None, replay: str = None, comment: str = None,
+                 dhgrp: str | list = None, keepalive: str = None, replay: str = None, comment: str = None,
                  auto_negotiate: str = None, vdom: str = None, src_subnet: str = None, dst_subnet: str = None):
         """
         Args:
@@ -127,7 +132,7 @@ class FgIpsecP2Interface(FgObject):
                 raise ValueError("'phase1name', cannot be an empty string")
             if isinstance(phase1name, str):
                 if len(phase1name) <= 35:
-                    self._phase1name = phase1name
+                    self._phase1name = sys.intern(phase1name)
                 else:
                     raise ValueError("'phase1name', must be type str between 1 and 35 chars")
             else:
@@ -142,53 +147,16 @@ class FgIpsecP2Interface(FgObject):
         """ Set self.proposal to proposal if proposal contains valid FG proposals
 
         Args:
-            proposal: phase2 proposal.  May be string or list of strings.  i.e. 'des-md5' or ['des-md5', '3des-md5']
+            proposal: phase2 proposal.  May be string or list of strings.  i.e. 'des-md5' or ['des-md5', '3des-md5'].
+                A string may also hold several space separated proposals.
 
         Returns:
             None
         """
-        valid_proposals = ['des-md5', 'des-sha', 'des-sha256', 'des-sha384', 'des-sha512', '3des-md5', '3des-sha1',
-                           '3des-sha256', '3des-sha384', '3des-sha512', 'aes128-md5', 'aes128-sha1', 'aes128-sha256',
-                           'aes128-sha384', 'aes128-sha512', 'aes192-md5', 'aes192-sha1', 'aes192-sha256',
-                           'aes192-sha384', 'aes192-sha512', 'aes256-md5', 'aes256-sha1', 'aes256-sha256',
-                           'aes256-sha384', 'aes256-sha512', 'aria128-md5', 'aria128-sha1', 'aria128-sha256',
-                           'aria128-sha384', 'aria128-sha512', 'aria192-md5', 'aria192-sha1', 'aria192-sha256',
-                           'aria192-sha384', 'aria192-sha512', 'aria256-md5', 'aria256-sha1', 'aria256-sha256',
-                           'aria256-sha384', 'aria256-sha512', 'seed-md5', 'seed-sha1', 'seed-sha256', 'seed-sha384',
-                           'seed-sha512', 'chacha20poly1305', 'null-md5', 'null-sha1', 'null-sha256', 'null-sha384',
-                           'null-sha512', 'des-null', '3des-null', 'aes128-null', 'aes192-null', 'aes256-null',
-                           'aria128-null', 'seed-null']
-
         if proposal is None:
             self._proposal = None
-
         else:
-            proposal_items = ''
-
-            # IF a single object was passed as a string, append it to intf_list else iterate the list and pull
-            # out the strings of interfaces and append each to intf_list
-            if isinstance(proposal, str):
-
-                # compare proposal to valid_proposals list
-                if proposal in valid_proposals:
-                    proposal_items += f"{proposal}"
-                else:
-                    raise ValueError("'proposal' value provided is not a valid fortigate phase1 proposal option")
-
-            elif isinstance(proposal, list):
-                for item in proposal:
-                    if isinstance(item, str):
-
-                        # compare proposal to valid proposals list
-                        if item in valid_proposals:
-                            proposal_items += f" {item}"
-                        else:
-                            raise ValueError("'proposal' value provided not a valid fortigate phase1 proposal option")
-            else:
-                raise ValueError("'proposal' must be type str() with single proposal referenced or type list() for "
-                                 "multiple proposal references")
-
-            self._proposal = proposal_items
+            self._proposal = normalize_p2_proposal(proposal)
 
     @property
     def dhgrp(self):
@@ -202,40 +170,15 @@ class FgIpsecP2Interface(FgObject):
         of those to a space separated values string and set in self.dhgrp
 
         Args:
-            dhgrp (list): list of valid fortigate dhgrps
+            dhgrp (list): list of valid fortigate dhgrps, single int or str of space separated dhgrps
 
         Returns:
             None
         """
         if dhgrp is None:
             self._dhgrp = None
-
         else:
-            dhgrp_items = ''
-            valid_dhgrps = [1, 2, 5, 14, 15, 16, 17, 18, 19, 20, 21, 27, 28, 30, 31, 32]
-
-            # IF a single object was passed as a string, append it to list else iterate the list and pull
-            # out the dhgrps and add to list to be set as self object
-            if isinstance(dhgrp, int):
-                # compare proposal to valid_list
-                if dhgrp in valid_dhgrps:
-                    dhgrp_items += f"{dhgrp} "
-                else:
-                    raise ValueError(f"'dhgrp' value provided is not a valid fortigate dhgrp option")
-
-            elif isinstance(dhgrp, list):
-                for item in dhgrp:
-                    if isinstance(item, int):
-
-                        # compare proposal to valid proposals list
-                        if item in valid_dhgrps:
-                            dhgrp_items += f"{item} "
-                        else:
-                            raise ValueError(f"At least one 'dhgrp' provided is not a valid fortigate phase1 proposal")
-            else:
-                raise ValueError("dhgrp must be provided as type int() or list() of int()")
-
-            self._dhgrp = dhgrp_items
+            self._dhgrp = normalize_p2_dhgrp(dhgrp)
 
     @property
     def comment(self):
@@ -346,7 +289,7 @@ class FgIpsecP2Interface(FgObject):
 
     @property
     def auto_negotiate(self):
-        return self.auto_negotiate
+        return self._auto_negotiate
 
     @auto_negotiate.setter
     def auto_negotiate(self, auto_negotiate):
@@ -388,6 +331,7 @@ class FgIpsecP2Interface(FgObject):
         if src_subnet is None:
             self._src_subnet = None
         else:
+            import ipaddress
             try:
                 ipaddress.ip_network(src_subnet)
             except ValueError:
@@ -412,6 +356,7 @@ class FgIpsecP2Interface(FgObject):
         if dst_subnet is None:
             self._dst_subnet = None
         else:
+            import ipaddress
             try:
                 ipaddress.ip_network(dst_subnet)
             except ValueError:
@@ -13,5 +13,5 @@ setuptools.setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: Os Independent"
     ],
-    python_requires='>=3.6'
+    python_requires='>=3.7'
 )